@@ -1,5 +1,6 @@
 """Bot application setup, command registration, and startup hooks."""
 
+import asyncio
 import logging
 import os
 import time
@@ -8,11 +9,22 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 from dotenv import load_dotenv
-from supabase import AsyncClient, create_async_client
-
-from bot.config import EXTENSIONS, GUILD_ID, MY_GUILD
+from supabase import AsyncClient
+
+from bot.config import (
+    DATABASE_BACKEND,
+    DATABASE_POOL_MAX_SIZE,
+    DATABASE_POOL_MIN_SIZE,
+    EXTENSIONS,
+    GUILD_ID,
+    MY_GUILD,
+)
+from bot.services.repository import AsyncpgRepository, PostgrestRepository
+from bot.utils.change_feed import ChangeFeed
 from bot.utils.database import ensure_tables_exist
 from bot.utils.http_monitoring import install_http_monitoring_hook
+from bot.utils.resilience import CircuitBreaker, create_supabase_client
+from bot.utils.snapshot import SnapshotStore
 from discord.ext import tasks
 import requests
 import aiohttp
@@ -33,7 +45,15 @@ class Bot(commands.Bot):
         super().__init__(command_prefix="!", intents=intents, help_command=None)
 
         self.supabase: AsyncClient | None = None
+        self.change_feed: ChangeFeed | None = None
+        self.repository: AsyncpgRepository | PostgrestRepository | None = None
+        # Set once startup migrations are done; caches wait on it before their first sync
+        self.schema_ready: asyncio.Event | None = None
+        self._schema_task = None
+        self.snapshots = SnapshotStore()
         self.meal_cache = []
+        # False while the menu comes only from the snapshot (or is empty)
+        self.meal_cache_synced = False
         self._ready_once = False
         self.last_rate_limit_timestamp: float | None = None
         self.RATE_LIMIT_UNHEALTHY_SECONDS = 300  # 5 minutes
@@ -43,18 +63,42 @@ class Bot(commands.Bot):
         install_http_monitoring_hook(self)
         print("Installed proactive rate limit monitor.")
 
+        # Answer from the last known menu even if the database is slow or down
+        self.meal_cache = self.snapshots.load("meals") or []
+
         db_url = os.environ.get("SUPABASE_DB_URL")
         if db_url:
-            print("Verifying database schema...")
-            await ensure_tables_exist(db_url)
+            # Nothing here waits on the database: migrations and the change feed
+            # connect in the background while commands answer from the snapshots
+            self.schema_ready = asyncio.Event()
+            self._schema_task = asyncio.create_task(self._migrate_schema(db_url))
+
+            self.change_feed = ChangeFeed(db_url)
+            self.change_feed.subscribe("meals", self.apply_meal_change)
+            self.change_feed.add_resync_callback(self.refresh_meal_cache)
+            await self.change_feed.start()
+            print("Change feed started")
         else:
             print("WARNING: SUPABASE_DB_URL not found. Skipping schema creation.")
 
         url = os.environ.get("SUPABASE_URL")
         key = os.environ.get("SUPABASE_SERVICE_KEY")
-        self.supabase = await create_async_client(url, key)
+        self.supabase = await create_supabase_client(url, key)
         print("Async Supabase client initialized")
 
+        # One breaker for every service: they all depend on the same database
+        breaker = CircuitBreaker()
+        if DATABASE_BACKEND == "asyncpg" and db_url:
+            try:
+                self.repository = await AsyncpgRepository.create(
+                    db_url, DATABASE_POOL_MIN_SIZE, DATABASE_POOL_MAX_SIZE, breaker
+                )
+                print("Database pool opened for hot queries")
+            except Exception as e:
+                print(f"Failed to open database pool, using the HTTP API: {e}")
+        if self.repository is None:
+            self.repository = PostgrestRepository(self.supabase, breaker)
+
         for extension in EXTENSIONS:
             try:
                 await self.load_extension(extension)
@@ -65,6 +109,41 @@ class Bot(commands.Bot):
         self.heartbeat_monitor.start()
         self.api_health_prober.start()
 
+    async def _migrate_schema(self, db_url):
+        """Apply pending schema migrations, then let the caches' first syncs start."""
+        try:
+            print("Verifying database schema...")
+            await ensure_tables_exist(db_url)
+        finally:
+            self.schema_ready.set()
+
+    async def close(self):
+        """Stop the change feed before shutting down the Discord connection."""
+        if self.change_feed is not None:
+            await self.change_feed.stop()
+        if self.repository is not None:
+            await self.repository.close()
+        await super().close()
+
+    async def refresh_meal_cache(self):
+        """Load the full meal menu into memory."""
+        try:
+            self.meal_cache = await self.repository.select_all("meals")
+            self.meal_cache_synced = True
+            self.snapshots.save_later("meals", lambda: self.meal_cache)
+            print(f"Cached {len(self.meal_cache)} meals")
+        except Exception as e:
+            print(f"Failed to cache meals: {e}")
+
+    def apply_meal_change(self, _table, op, row):
+        """Apply one row-level change from the database change feed to the meal cache."""
+        self.meal_cache = [
+            meal for meal in self.meal_cache if meal.get("id") != row.get("id")
+        ]
+        if op != "DELETE":
+            self.meal_cache.append(row)
+        self.snapshots.save_later("meals", lambda: self.meal_cache)
+
     @tasks.loop(minutes=3.0)
     async def heartbeat_monitor(self):
         try:
@@ -146,12 +225,7 @@ class Bot(commands.Bot):
             )
         )
 
-        try:
-            response = await self.supabase.table("meals").select("*").execute()
-            self.meal_cache = response.data
-            print(f"Cached {len(self.meal_cache)} meals")
-        except Exception as e:
-            print(f"Failed to cache meals: {e}")
+        await self.refresh_meal_cache()
 
         parking_cog = self.get_cog("Parking")
         if parking_cog:
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from datetime import datetime, time
 
@@ -7,6 +8,8 @@ from discord.ext import commands, tasks
 
 from bot.config import LOCAL_TZ
 from bot.services.lates_service import LatesService
+from bot.utils.database import wait_for_schema
+from bot.utils.snapshot import STALE_NOTICE
 
 logger = logging.getLogger(__name__)
 
@@ -17,8 +20,13 @@ class Lates(commands.Cog):
     def __init__(self, bot):
         """Initialize the cog and start the nightly cleanup loop."""
         self.bot = bot
-        self.service = LatesService(bot.supabase)
+        self.service = LatesService(
+            bot.supabase,
+            getattr(bot, "repository", None),
+            getattr(bot, "snapshots", None),
+        )
         self.meals = ["Lunch", "Dinner"]
+        self._initial_sync_task = None
         self.cleanup_loop.start()
 
     days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
@@ -26,8 +34,26 @@ class Lates(commands.Cog):
 
     async def cog_load(self):
         """Initialize the lates cache when the Cog boots up."""
+        change_feed = getattr(self.bot, "change_feed", None)
+        if change_feed is not None:
+            change_feed.subscribe("lates", self.service.apply_change)
+            change_feed.add_resync_callback(self.service.refresh_lates_cache)
+
+        # Serve the snapshot right away; the first sync never blocks startup
+        self.service.load_snapshot()
+        self._initial_sync_task = asyncio.create_task(self._initial_sync())
+
+    async def _initial_sync(self):
+        """Load the lates cache once the schema is ready."""
+        await wait_for_schema(self.bot)
         await self.service.refresh_lates_cache()
 
+    async def cog_unload(self):
+        """Stop the first sync if it is still running."""
+        if self._initial_sync_task is not None:
+            self._initial_sync_task.cancel()
+            self._initial_sync_task = None
+
     def _get_user_house(self, member: discord.Member):
         """Return the caller's house role slug, if present."""
         return self.service.get_user_house(member)
@@ -99,16 +125,18 @@ class Lates(commands.Cog):
 
         total_count = len(filtered_list)
         if total_count == 0:
-            return await interaction.response.send_message(
-                f"No lates recorded for **{day} {meal}** in your house group.",
-                ephemeral=True,
-            )
+            message = f"No lates recorded for **{day} {meal}** in your house group."
+            if not self.service.synced:
+                message += f"\n{STALE_NOTICE}"
+            return await interaction.response.send_message(message, ephemeral=True)
 
         embed = discord.Embed(
             title=f"🍽️ Lates: {day} {meal} ({total_count} total)",
             description="\n".join(filtered_list),
             color=discord.Color.blue(),
         )
+        if not self.service.synced:
+            embed.set_footer(text=STALE_NOTICE)
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
     @app_commands.command(name="late_me", description="Request food to be set aside")
@@ -1,3 +1,4 @@
+import asyncio
 from datetime import datetime
 
 import discord
@@ -6,6 +7,8 @@ from discord.ext import commands
 
 from bot.config import LOCAL_TZ
 from bot.services.meals_service import MealsService
+from bot.utils.database import wait_for_schema
+from bot.utils.snapshot import STALE_NOTICE
 
 
 class Meals(commands.Cog):
@@ -13,12 +16,31 @@ class Meals(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.meals_service = MealsService(bot, bot.supabase)
+        self.meals_service = MealsService(
+            bot,
+            bot.supabase,
+            getattr(bot, "repository", None),
+            getattr(bot, "snapshots", None),
+        )
+        self._initial_sync_task = None
 
     async def cog_load(self):
         """Fetch the active calendar configuration when the cog loads."""
+        # Serve the snapshot right away; the first sync never blocks startup
+        self.meals_service.load_snapshot()
+        self._initial_sync_task = asyncio.create_task(self._initial_sync())
+
+    async def _initial_sync(self):
+        """Load the calendar configuration once the schema is ready."""
+        await wait_for_schema(self.bot)
         await self.meals_service.refresh_calendar_config()
 
+    async def cog_unload(self):
+        """Stop the first sync if it is still running."""
+        if self._initial_sync_task is not None:
+            self._initial_sync_task.cancel()
+            self._initial_sync_task = None
+
     @app_commands.command(name="today", description="Get today's menu")
     @app_commands.checks.cooldown(1, 5.0, key=lambda interaction: interaction.user.id)
     async def today(self, interaction: discord.Interaction):
@@ -57,6 +79,8 @@ class Meals(commands.Cog):
         )
         embed.add_field(name="☀️ Lunch", value=lunch, inline=False)
         embed.add_field(name="🌙 Dinner", value=dinner, inline=False)
+        if self.meals_service.is_stale():
+            embed.set_footer(text=STALE_NOTICE)
 
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
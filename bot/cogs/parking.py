@@ -1,34 +1,46 @@
 import asyncio
 import logging
-import time
-from collections import Counter
+from collections import Counter, OrderedDict
 from datetime import datetime, timedelta
 
 import discord
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
 
 from bot.config import (
     BOT_NAME,
     CANCEL_SPOT_MAX_AUTOCOMPLETE_CHOICES,
-    DISCORD_EMBED_FIELD_VALUE_LIMIT,
-    TRUNCATION_LIMIT,
+    CLAIM_SPOT_AUTOCOMPLETE_CACHE_SIZE,
     CLAIM_SPOT_MAX_AUTOCOMPLETE_CHOICES,
     LOCAL_TZ,
     MAXIMUM_RESERVATION_DAYS,
     MINIMUM_OFFER_HOURS,
     MINIMUM_RESERVATION_HOURS,
-    PARKING_STATUS_CACHE_TTL_SECONDS,
+    PARKING_BOARD_CHANNEL_ID,
+    PARKING_BOARD_DEBOUNCE_SECONDS,
+    PARKING_CACHE_RECONCILE_MINUTES,
     PERMIT_SPOTS,
-    TRUNCATION_SUFFIX,
     STAFF_PARKING_BLACKOUTS,
     STAFF_SPOTS,
 )
 from bot.services.parking_service import ParkingService
+from bot.utils.parking_status_pages import (
+    ParkingStatusPages,
+    ParkingStatusView,
+    StatusSection,
+    board_embeds,
+    embed_signature,
+    weekdays_touched,
+)
+from bot.utils.resilience import CircuitOpenError
+from bot.utils.snapshot import STALE_NOTICE
 from bot.utils.constants import WEEKDAYS, NOON
+from bot.utils.database import wait_for_schema
 
 logger = logging.getLogger(__name__)
 
+PARKING_STATUS_LEVELS = ("default", "high")
+
 
 class Parking(commands.Cog):
     """Slash commands for offering, claiming, and viewing parking availability."""
@@ -47,36 +59,170 @@ class Parking(commands.Cog):
     def __init__(self, bot):
         """Initialize the parking cog and its shared service layer."""
         self.bot = bot
-        self.service = ParkingService(bot.supabase)
-        self._parking_status_cache = {}
-        self._parking_status_cache_expires_at = {}
-        self._parking_status_lock = asyncio.Lock()
+        self.service = ParkingService(
+            bot.supabase,
+            getattr(bot, "repository", None),
+            getattr(bot, "snapshots", None),
+        )
+        self._parking_status_pages = {}
+        self._parking_status_stale = asyncio.Event()
+        self._parking_status_task = None
+        self._parking_board_stale = asyncio.Event()
+        self._parking_board_task = None
+        self._parking_board_message = None
+        self._parking_board_signature = None
+        self._claim_spot_choices_cache = OrderedDict()
+        self._watch_dm_tasks = set()
+        self._initial_sync_task = None
 
     async def cog_load(self):
         """Called when the cog is loaded."""
+        change_feed = getattr(self.bot, "change_feed", None)
+        if change_feed is not None:
+            change_feed.subscribe("parking_offers", self.service.apply_change)
+            change_feed.subscribe("parking_reservations", self.service.apply_change)
+            change_feed.subscribe("parking_watches", self.service.apply_change)
+            change_feed.add_resync_callback(self.service.refresh_parking_cache)
+
+        # Serve the last known state right away; the first sync never blocks startup
+        self.service.load_snapshot()
+        self._initial_sync_task = asyncio.create_task(self._initial_sync())
+        self.reconcile_parking_cache.start()
+
+        self.service.add_change_listener(self._parking_status_stale.set)
+        self.service.add_watch_listener(self._on_watches_matched)
+        await self.refresh_parking_status_pages()
+        self._parking_status_stale.clear()
+        self._parking_status_task = asyncio.create_task(
+            self._run_parking_status_refresher()
+        )
+        if PARKING_BOARD_CHANNEL_ID:
+            self._parking_board_stale.set()
+            self._parking_board_task = asyncio.create_task(
+                self._run_parking_board_updater()
+            )
+
+    async def _initial_sync(self):
+        """Seed the spot table and load the caches once the schema is ready."""
+        await wait_for_schema(self.bot)
         await self.service.initialize_spots()  # Ensures table is populated
         await self.service.load_cache()  # Populates guest_spots_cache
         await self.service.refresh_parking_cache()  # Populates offers/claims
 
-    @staticmethod
-    def _clone_embed(embed):
-        """Create a detached embed copy safe to reuse across interactions."""
-        return discord.Embed.from_dict(embed.to_dict())
-
-    def _get_cached_parking_status_embed(self, level="default"):
-        """Return the cached parking-status embed while it is still fresh."""
-        expires_at = self._parking_status_cache_expires_at.get(level, 0.0)
-        embed = self._parking_status_cache.get(level)
-        if embed is None or time.monotonic() >= expires_at:
-            return None
-        return self._clone_embed(embed)
+    async def cog_unload(self):
+        """Stop background tasks when the cog is removed."""
+        self.reconcile_parking_cache.cancel()
+        if self._initial_sync_task is not None:
+            self._initial_sync_task.cancel()
+            self._initial_sync_task = None
+        if self._parking_status_task is not None:
+            self._parking_status_task.cancel()
+            self._parking_status_task = None
+        if self._parking_board_task is not None:
+            self._parking_board_task.cancel()
+            self._parking_board_task = None
+
+    @tasks.loop(minutes=PARKING_CACHE_RECONCILE_MINUTES)
+    async def reconcile_parking_cache(self):
+        """Reload the parking cache when no change feed is keeping it fresh."""
+        change_feed = getattr(self.bot, "change_feed", None)
+        if change_feed is not None and change_feed.connected:
+            return
+        await self.service.refresh_parking_cache()
+
+    @reconcile_parking_cache.before_loop
+    async def before_reconcile_parking_cache(self):
+        # cog_load already populated the cache; skip the immediate first run
+        await asyncio.sleep(PARKING_CACHE_RECONCILE_MINUTES * 60)
+
+    async def refresh_parking_status_pages(self):
+        """Rebuild the parking-status pages for every detail level from the cache."""
+        for level in PARKING_STATUS_LEVELS:
+            self._parking_status_pages[level] = await self._build_parking_status_pages(
+                level
+            )
 
-    def _store_cached_parking_status_embed(self, embed, level="default"):
-        """Store a short-lived parking-status embed to absorb burst traffic."""
-        self._parking_status_cache[level] = self._clone_embed(embed)
-        self._parking_status_cache_expires_at[level] = (
-            time.monotonic() + PARKING_STATUS_CACHE_TTL_SECONDS
-        )
+    async def _run_parking_status_refresher(self):
+        """Rebuild status pages whenever the parking cache changes or the hour rolls over.
+
+        Mutations that land while a rebuild is running set the stale flag again, so a
+        burst of changes costs at most one extra rebuild. A failed rebuild keeps the
+        previous pages in place.
+        """
+        while True:
+            now = datetime.now(LOCAL_TZ)
+            next_hour = now.replace(minute=0, second=0, microsecond=0) + timedelta(
+                hours=1
+            )
+            try:
+                await asyncio.wait_for(
+                    self._parking_status_stale.wait(),
+                    # A little slack so the rebuild lands after the boundary, not before
+                    timeout=(next_hour - now).total_seconds() + 1,
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._parking_status_stale.clear()
+
+            try:
+                await self.refresh_parking_status_pages()
+            except Exception:
+                logger.exception("Parking status refresh failed")
+            else:
+                self._parking_board_stale.set()
+
+    async def _run_parking_board_updater(self):
+        """Mirror the default status pages onto the board message, debounced.
+
+        Each wake-up waits out the debounce window first, so a burst of cache changes
+        costs one edit. A rate limit that discord.py won't wait out itself postpones
+        the edit until Discord allows it.
+        """
+        while True:
+            await self._parking_board_stale.wait()
+            await asyncio.sleep(PARKING_BOARD_DEBOUNCE_SECONDS)
+            self._parking_board_stale.clear()
+            try:
+                await self.update_parking_board()
+            except discord.RateLimited as e:
+                self._parking_board_stale.set()
+                await asyncio.sleep(e.retry_after)
+            except Exception:
+                logger.exception("Parking board update failed")
+
+    async def update_parking_board(self):
+        """Edit the board message to match the latest pages, skipping unchanged content."""
+        status = self._parking_status_pages.get("default")
+        channel = self.bot.get_channel(PARKING_BOARD_CHANNEL_ID)
+        if status is None or channel is None:
+            return
+
+        embeds = board_embeds(status.pages())
+        signature = embed_signature(embeds)
+        if signature == self._parking_board_signature:
+            return
+
+        if self._parking_board_message is None:
+            self._parking_board_message = await self._find_parking_board(channel)
+
+        if self._parking_board_message is not None:
+            try:
+                await self._parking_board_message.edit(embeds=embeds)
+                self._parking_board_signature = signature
+                return
+            except discord.NotFound:
+                pass
+        self._parking_board_message = await channel.send(embeds=embeds)
+        self._parking_board_signature = signature
+
+    async def _find_parking_board(self, channel):
+        """Return the board message this bot posted before a restart, if it's still recent."""
+        async for message in channel.history(limit=50):
+            if message.author == self.bot.user and any(
+                embed.title == "Parking Status" for embed in message.embeds
+            ):
+                return message
+        return None
 
     @staticmethod
     def _mark_autocomplete_responded(response):
@@ -126,6 +272,31 @@ class Parking(commands.Cog):
 
         return []
 
+    def _on_watches_matched(self, matches):
+        """Send the watch DMs in the background so the freeing command isn't held up."""
+        task = asyncio.create_task(self._send_watch_dms(matches))
+        self._watch_dm_tasks.add(task)
+        task.add_done_callback(self._watch_dm_tasks.discard)
+
+    async def _send_watch_dms(self, matches):
+        """DM each matched watcher which spot opened up and when."""
+        for watch, spot, start, end in matches:
+            try:
+                user_id = int(watch.user_id)
+                user = self.bot.get_user(user_id) or await self.bot.fetch_user(user_id)
+                await user.send(
+                    f"🚗 **Spot {spot}** just opened up "
+                    f"{self.service._format_datetime_label(start)} - "
+                    f"{self.service._format_datetime_label(end)}, "
+                    "overlapping your watched window.\n"
+                    "Use `/claim_spot` to reserve it."
+                )
+            except Exception:
+                logger.exception(
+                    "Parking watch DM failed",
+                    extra={"user_id": watch.user_id, "spot": spot},
+                )
+
     async def initialize_parking_spots(self):
         """Ensure the configured parking spots exist in the backing database."""
         await self.service.initialize_spots()
@@ -145,10 +316,7 @@ class Parking(commands.Cog):
 
         offer_groups = Counter()
         for off in raw_offers or []:
-            start = datetime.fromisoformat(off["start_time"]).astimezone(LOCAL_TZ)
-            end = datetime.fromisoformat(off["end_time"]).astimezone(LOCAL_TZ)
-            time_key = f"**Spot {off['spot_number']}**: {start.strftime('%a %I%p')} — {end.strftime('%a %I%p')}"
-            offer_groups[time_key] += 1
+            offer_groups[off.ledger_line(now)] += 1
 
         offer_lines = [
             f"{key} (x{count})" if count > 1 else key
@@ -162,15 +330,7 @@ class Parking(commands.Cog):
 
         claim_groups = Counter()
         for claim in raw_claims or []:
-            start = datetime.fromisoformat(claim["start_time"]).astimezone(LOCAL_TZ)
-            end = datetime.fromisoformat(claim["end_time"]).astimezone(LOCAL_TZ)
-            spot_label = (
-                "Staff Spot"
-                if claim["spot_number"] in STAFF_SPOTS
-                else f"Spot {claim['spot_number']}"
-            )
-            time_key = f"**{spot_label}**: {start.strftime('%a %I%p')} — {end.strftime('%a %I%p')}"
-            claim_groups[time_key] += 1
+            claim_groups[claim.ledger_line(now)] += 1
 
         claim_lines = [
             f"{key} (x{count})" if count > 1 else key
@@ -181,6 +341,8 @@ class Parking(commands.Cog):
             value="\n".join(claim_lines) or "No active reservations.",
             inline=False,
         )
+        if not self.service.synced:
+            embed.set_footer(text=STALE_NOTICE)
 
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
@@ -225,7 +387,7 @@ class Parking(commands.Cog):
             await interaction.followup.send(msg)
             return None
 
-        await self.service.save_offer_spot_preference(
+        self.service.queue_offer_spot_preference(
             interaction.user.id, interaction.user.name, spot
         )
         await interaction.channel.send(
@@ -235,6 +397,66 @@ class Parking(commands.Cog):
         await interaction.delete_original_response()
         return None
 
+    async def _get_claimable_spots(self, start_day, start_time, end_day, end_time):
+        """Return sorted (spot, label) pairs claimable for a window, memoized per cache version.
+
+        Autocomplete fires on every keystroke while only the spot filter changes, so the
+        window parsing and overlap checks run once per window, hour and cache version.
+        """
+        current_hour = datetime.now(LOCAL_TZ).replace(minute=0, second=0, microsecond=0)
+        key = (
+            start_day,
+            start_time,
+            end_day,
+            end_time,
+            current_hour,
+            self.service.cache_version,
+        )
+        cached = self._claim_spot_choices_cache.get(key)
+        if cached is not None:
+            self._claim_spot_choices_cache.move_to_end(key)
+            return cached
+
+        available = await self._compute_claimable_spots(
+            start_day, start_time, end_day, end_time
+        )
+        self._claim_spot_choices_cache[key] = available
+        if len(self._claim_spot_choices_cache) > CLAIM_SPOT_AUTOCOMPLETE_CACHE_SIZE:
+            self._claim_spot_choices_cache.popitem(last=False)
+        return available
+
+    async def _compute_claimable_spots(self, start_day, start_time, end_day, end_time):
+        """Return sorted (spot, label) pairs for guest and offered spots free for a window."""
+        start, end, duration = self.service.parse_range(
+            start_day, start_time, end_day, end_time
+        )
+
+        if duration < timedelta(hours=MINIMUM_RESERVATION_HOURS) or duration > timedelta(
+            days=MAXIMUM_RESERVATION_DAYS
+        ):
+            return []
+
+        now = datetime.now(LOCAL_TZ)
+        (
+            guest_spots,
+            offered_spots,
+            claims,
+        ) = await self.service.get_claim_autocomplete_data(start, end, now)
+
+        # Offers already cover the window and claims already overlap it
+        reserved_spots = {claim.spot_number for claim in claims or []}
+
+        available_spots = {}
+        for row in guest_spots or []:
+            if row["spot_number"] not in reserved_spots:
+                available_spots[row["spot_number"]] = "Guest"
+
+        for offer in offered_spots or []:
+            if offer.spot_number not in reserved_spots:
+                available_spots.setdefault(offer.spot_number, "Offered")
+
+        return sorted(available_spots.items())
+
     async def claim_spot_autocomplete(
         self,
         interaction: discord.Interaction,
@@ -261,62 +483,13 @@ class Parking(commands.Cog):
             start_time = getattr(namespace.start_time, "value", namespace.start_time)
             end_day = getattr(namespace.end_day, "value", namespace.end_day)
             end_time = getattr(namespace.end_time, "value", namespace.end_time)
-            start, end, duration = self.service.parse_range(
+
+            available_spots = await self._get_claimable_spots(
                 start_day, start_time, end_day, end_time
             )
 
-            if duration < timedelta(
-                hours=MINIMUM_RESERVATION_HOURS
-            ) or duration > timedelta(days=MAXIMUM_RESERVATION_DAYS):
-                return await self._finalize_autocomplete(
-                    interaction,
-                    [],
-                    handler_name="Parking claim_spot",
-                    log_context=log_context,
-                )
-
-            now = datetime.now(LOCAL_TZ)
-            (
-                guest_spots,
-                offered_spots,
-                claims,
-            ) = await self.service.get_claim_autocomplete_data(now)
-
-            # Pre-process claims into a dictionary for efficient lookups
-            claims_by_spot = {}
-            for row in claims or []:
-                claims_by_spot.setdefault(row["spot_number"], []).append(
-                    (
-                        datetime.fromisoformat(row["start_time"]).astimezone(LOCAL_TZ),
-                        datetime.fromisoformat(row["end_time"]).astimezone(LOCAL_TZ),
-                    )
-                )
-
-            def has_overlapping_claim(spot_num):
-                for claim_start, claim_end in claims_by_spot.get(spot_num, []):
-                    if claim_start < end and claim_end > start:  # Check for overlap
-                        return True
-                return False
-
-            available_spots = {}
-            for row in guest_spots or []:
-                if not has_overlapping_claim(row["spot_number"]):
-                    available_spots[row["spot_number"]] = "Guest"
-
-            for row in offered_spots or []:
-                offer_start = datetime.fromisoformat(row["start_time"]).astimezone(
-                    LOCAL_TZ
-                )
-                offer_end = datetime.fromisoformat(row["end_time"]).astimezone(LOCAL_TZ)
-                if (
-                    offer_start <= start
-                    and offer_end >= end
-                    and not has_overlapping_claim(row["spot_number"])
-                ):
-                    available_spots.setdefault(row["spot_number"], "Offered")
-
             choices = []
-            for spot_num, label in sorted(available_spots.items()):
+            for spot_num, label in available_spots:
                 name = f"Spot {spot_num} ({label})"
                 if current.lower() in name.lower():
                     choices.append(app_commands.Choice(name=name, value=spot_num))
@@ -426,33 +599,67 @@ class Parking(commands.Cog):
         await interaction.delete_original_response()
         return None
 
-    def _build_offers_claims_db(self, raw_offers, raw_claims):
-        """Parse raw offer and claim dictionaries into timezone-aware grouped databases."""
-        offers_db = {}
-        for row in raw_offers:
-            spot_num = row["spot_number"]
-            offers_db.setdefault(spot_num, []).append(
-                {
-                    "start": datetime.fromisoformat(row["start_time"]).astimezone(
-                        LOCAL_TZ
-                    ),
-                    "end": datetime.fromisoformat(row["end_time"]).astimezone(LOCAL_TZ),
-                    "owner": row.get("owner_discord_username", "Unknown"),
-                    "owner_id": row.get("owner_id"),  # NEW: Capture the ID
-                }
+    @app_commands.command(
+        name="watch_parking", description="Get a DM when a spot opens up for a window"
+    )
+    @app_commands.choices(
+        start_day=day_choices,
+        end_day=day_choices,
+        start_time=time_choices,
+        end_time=time_choices,
+    )
+    async def watch_parking(
+        self,
+        interaction: discord.Interaction,
+        start_day: app_commands.Choice[int],
+        start_time: app_commands.Choice[str],
+        end_day: app_commands.Choice[int],
+        end_time: app_commands.Choice[str],
+    ):
+        """Register a window and be messaged once a resident or guest spot frees up in it."""
+        start, end, duration = self.service.parse_range(
+            start_day.value, start_time.value, end_day.value, end_time.value
+        )
+        if duration > timedelta(days=MAXIMUM_RESERVATION_DAYS):
+            return await interaction.response.send_message(
+                f"❌ Watched windows can be at most {MAXIMUM_RESERVATION_DAYS} days.",
+                ephemeral=True,
             )
 
+        await interaction.response.defer(ephemeral=True)
+        _success, msg = await self.service.create_watch(
+            interaction.user.id, interaction.user.name, start, end
+        )
+        await interaction.followup.send(msg)
+        return None
+
+    def _build_offers_claims_db(self, raw_offers, raw_claims, now=None, cutoff=None):
+        """Group cached offer and claim records into per-spot availability windows.
+
+        Recurring offers are expanded into their weekly windows between ``now`` and
+        ``cutoff`` only.
+        """
+        offers_db = {}
+        for offer in raw_offers:
+            spot_windows = offers_db.setdefault(offer.spot_number, [])
+            for start, end in offer.windows(now, cutoff):
+                spot_windows.append(
+                    {
+                        "start": start,
+                        "end": end,
+                        "owner": offer.username,
+                        "owner_id": offer.user_id,
+                    }
+                )
+
         claims_db = {}
-        for row in raw_claims:
-            spot_num = row["spot_number"]
-            claims_db.setdefault(spot_num, []).append(
+        for claim in raw_claims:
+            claims_db.setdefault(claim.spot_number, []).append(
                 {
-                    "start": datetime.fromisoformat(row["start_time"]).astimezone(
-                        LOCAL_TZ
-                    ),
-                    "end": datetime.fromisoformat(row["end_time"]).astimezone(LOCAL_TZ),
-                    "claimer": row.get("claimer_discord_username", "Unknown"),
-                    "claimer_id": row.get("claimer_id"),  # NEW: Capture the ID
+                    "start": claim.start,
+                    "end": claim.end,
+                    "claimer": claim.username,
+                    "claimer_id": claim.user_id,
                 }
             )
         return offers_db, claims_db
@@ -460,31 +667,30 @@ class Parking(commands.Cog):
     def _format_resident_guest_spots(
         self, now, resident_cutoff, all_spots, offers_db, claims_db, guest_spots, level
     ):
-        """Generate the formatted text lines for resident and guest spots."""
-        lines = []
+        """Generate one status section per listed resident or guest spot."""
+        sections = []
+        availability = self.service.get_lot_availability(
+            now, resident_cutoff, all_spots, offers_db, claims_db, guest_spots
+        )
         for spot_num in all_spots:
             spot_offers = offers_db.get(spot_num, [])
             spot_claims = sorted(claims_db.get(spot_num, []), key=lambda x: x["start"])
             is_guest = spot_num in guest_spots
-            is_resident = not (spot_num in STAFF_SPOTS)
 
-            header, blocks = self.service.get_merged_availability(
-                now, resident_cutoff, spot_offers, spot_claims, is_guest, is_resident
-            )
+            header, blocks = availability[spot_num]
 
             if not is_guest and header == "❌ Not Offered":
                 continue
 
+            lines = []
             if level == "default":
-                if not blocks or len(blocks) == 1:
-                    lines.append(f"**Spot {spot_num}**: {header}")
-                    continue
-
                 future_blocks = [
-                    block for block in blocks if not (block[0] <= now < block[1])
+                    block
+                    for block in (blocks or [])
+                    if not (block[0] <= now < block[1])
                 ]
 
-                if not future_blocks:
+                if not blocks or len(blocks) == 1 or not future_blocks:
                     lines.append(f"**Spot {spot_num}**: {header}")
                 else:
                     detail = "\n".join(
@@ -534,41 +740,53 @@ class Parking(commands.Cog):
                         # Removed leading spaces
                         lines.append(f"- {time_str} (Claimed by <@{c['claimer_id']}>)")
                 lines.append("")
-        return lines
+
+            sections.append(
+                StatusSection(
+                    staff=False,
+                    spot=spot_num,
+                    is_guest=is_guest,
+                    weekdays=weekdays_touched(b for b in blocks or [] if b[1] > now),
+                    text="\n".join(lines),
+                )
+            )
+        return sections
 
     def _format_staff_spots(self, now, effective_staff_cutoff, claims_db, level):
-        """Generate the formatted text lines for staff spots."""
-        staff_lines = []
+        """Generate one status section per staff spot."""
+        sections = []
         staff_offers = self.service.get_staff_availability_windows(
             now, effective_staff_cutoff
         )
+        availability = self.service.get_lot_availability(
+            now,
+            effective_staff_cutoff,
+            STAFF_SPOTS,
+            {spot_num: staff_offers for spot_num in STAFF_SPOTS},
+            claims_db,
+            is_resident=False,
+        )
 
         for i, spot_num in enumerate(STAFF_SPOTS):
             spot_claims = sorted(claims_db.get(spot_num, []), key=lambda x: x["start"])
-            header, blocks = self.service.get_merged_availability(
-                now,
-                effective_staff_cutoff,
-                staff_offers,
-                spot_claims,
-                is_resident=False,
-            )
+            header, blocks = availability[spot_num]
 
+            staff_lines = []
             if level == "default":
-                # If there are no claims, the "next" availability is just the standard
-                # window, which is already summarized in the header. Don't show detail.
-                if not spot_claims:
-                    staff_lines.append(f"**Spot {i + 1}**: {header}")
-                    continue
-
-                if not blocks or len(blocks) == 1:
-                    staff_lines.append(f"**Spot {i + 1}**: {header}")
-                    continue
-
                 future_blocks = [
-                    block for block in blocks if not (block[0] <= now < block[1])
+                    block
+                    for block in (blocks or [])
+                    if not (block[0] <= now < block[1])
                 ]
 
-                if not future_blocks:
+                # If there are no claims, the "next" availability is just the standard
+                # window, which is already summarized in the header. Don't show detail.
+                if (
+                    not spot_claims
+                    or not blocks
+                    or len(blocks) == 1
+                    or not future_blocks
+                ):
                     staff_lines.append(f"**Spot {i + 1}**: {header}")
                 else:
                     # Add day to time format to avoid ambiguity across midnight
@@ -607,103 +825,101 @@ class Parking(commands.Cog):
                             f"- {time_str} (Claimed by <@{c['claimer_id']}>)"
                         )
                 staff_lines.append("")
-        return staff_lines
+
+            sections.append(
+                StatusSection(
+                    staff=True,
+                    spot=spot_num,
+                    is_guest=False,
+                    weekdays=weekdays_touched(b for b in blocks or [] if b[1] > now),
+                    text="\n".join(staff_lines),
+                )
+            )
+        return sections
+
+    async def _build_parking_status_pages(self, level):
+        """Render the parking-status sections for one detail level."""
+        now = datetime.now(LOCAL_TZ).replace(minute=0, second=0, microsecond=0)
+        resident_cutoff = now + timedelta(days=7)
+
+        raw_offers, raw_claims, guest_spots = await self.service.get_parking_data(
+            now, resident_cutoff
+        )
+
+        offers_db, claims_db = self._build_offers_claims_db(
+            raw_offers, raw_claims, now, resident_cutoff
+        )
+        all_spots = sorted(set(list(offers_db.keys()) + guest_spots))
+
+        sections = self._format_resident_guest_spots(
+            now,
+            resident_cutoff,
+            all_spots,
+            offers_db,
+            claims_db,
+            guest_spots,
+            level,
+        )
+
+        effective_staff_cutoff = (
+            resident_cutoff if level == "high" else self.service.get_staff_cutoff(now)
+        )
+        sections += self._format_staff_spots(
+            now, effective_staff_cutoff, claims_db, level
+        )
+
+        staff_title_suffix = "(Next 7 Days)" if level == "high" else "(Today)"
+        return ParkingStatusPages(
+            sections,
+            staff_field_name=f"Staff Parking {staff_title_suffix}",
+            timestamp=datetime.now(LOCAL_TZ),
+            stale=not self.service.synced,
+        )
 
     @app_commands.command(
         name="parking_status", description="View available parking spots"
     )
+    @app_commands.describe(
+        spot="Only show this resident or guest spot",
+        day="Only show spots with free time on this day",
+        guest_only="Only show guest spots",
+    )
     @app_commands.choices(
         detail_level=[
             app_commands.Choice(name="Default", value="default"),
             app_commands.Choice(name="High", value="high"),
-        ]
+        ],
+        day=day_choices,
     )
     @app_commands.checks.cooldown(1, 10.0, key=lambda interaction: interaction.user.id)
     async def parking_status(
         self,
         interaction: discord.Interaction,
         detail_level: app_commands.Choice[str] = None,
+        spot: int = None,
+        day: app_commands.Choice[int] = None,
+        guest_only: bool = False,
     ):
-        """Summarize resident, guest, and staff parking availability."""
+        """Summarize resident, guest, and staff parking availability, one page at a time."""
         level = detail_level.value if detail_level else "default"
 
-        cached_embed = self._get_cached_parking_status_embed(level)
-        if cached_embed is not None:
-            await interaction.response.send_message(embed=cached_embed, ephemeral=True)
-            return
-
-        async with self._parking_status_lock:
-            # Double-check cache inside the lock to handle race conditions
-            cached_embed = self._get_cached_parking_status_embed(level)
-            if cached_embed is not None:
-                await interaction.response.send_message(
-                    embed=cached_embed, ephemeral=True
-                )
-                return
-
-            now = datetime.now(LOCAL_TZ).replace(minute=0, second=0, microsecond=0)
-            resident_cutoff = now + timedelta(days=7)
-
-            raw_offers, raw_claims, guest_spots = await self.service.get_parking_data(
-                now, resident_cutoff
-            )
-
-            offers_db, claims_db = self._build_offers_claims_db(raw_offers, raw_claims)
-            all_spots = sorted(set(list(offers_db.keys()) + guest_spots))
-
-            lines = self._format_resident_guest_spots(
-                now,
-                resident_cutoff,
-                all_spots,
-                offers_db,
-                claims_db,
-                guest_spots,
-                level,
-            )
-
-            effective_staff_cutoff = (
-                resident_cutoff
-                if level == "high"
-                else self.service.get_staff_cutoff(now)
-            )
-            staff_lines = self._format_staff_spots(
-                now, effective_staff_cutoff, claims_db, level
-            )
-
-            embed = discord.Embed(
-                title="Parking Status",
-                color=discord.Color.blue(),
-                timestamp=datetime.now(LOCAL_TZ),
-            )
-
-            res_value = (
-                "\n".join(lines).strip() if lines else "No spots currently offered."
-            )
-            if len(res_value) > DISCORD_EMBED_FIELD_VALUE_LIMIT:
-                res_value = res_value[:TRUNCATION_LIMIT] + TRUNCATION_SUFFIX
-
-            staff_value = "\n".join(staff_lines).strip()
-            if not staff_value:
-                staff_value = "No staff spots available."
-            if len(staff_value) > DISCORD_EMBED_FIELD_VALUE_LIMIT:
-                staff_value = staff_value[:TRUNCATION_LIMIT] + TRUNCATION_SUFFIX
-
-            embed.add_field(
-                name="Resident/Guest Spots (Next 7 Days)", value=res_value, inline=False
-            )
-
-            staff_title_suffix = "(Next 7 Days)" if level == "high" else "(Today)"
-            embed.add_field(
-                name=f"Staff Parking {staff_title_suffix}",
-                value=staff_value,
-                inline=False,
+        status = self._parking_status_pages.get(level)
+        if status is None:
+            await interaction.response.send_message(
+                "⏳ Parking status is still loading. Try again in a moment.",
+                ephemeral=True,
             )
-            embed.set_footer(text=f"{BOT_NAME} Parking System - Chicago Time")
+            return
 
-            self._store_cached_parking_status_embed(embed, level)
+        pages = status.pages(
+            spot=spot, weekday=day.value if day else None, guest_only=guest_only
+        )
+        if len(pages) == 1:
+            await interaction.response.send_message(embed=pages[0], ephemeral=True)
+            return
 
         await interaction.response.send_message(
-            embed=self._clone_embed(embed), ephemeral=True
+            embed=pages[0], view=ParkingStatusView(pages), ephemeral=True
         )
 
     async def cancel_spot_autocomplete(
@@ -720,42 +936,28 @@ class Parking(commands.Cog):
             offers, claims = await self.service.get_cancel_autocomplete_data(
                 user_id, now
             )
-            choices = []
-
-            for offer in offers or []:
-                start = datetime.fromisoformat(offer["start_time"]).astimezone(LOCAL_TZ)
-                end = datetime.fromisoformat(offer["end_time"]).astimezone(LOCAL_TZ)
-                label = (
-                    f"Withdraw: Spot {offer['spot_number']} "
-                    f"{start.strftime('%a %b')} {start.day} {start.strftime('%I:%M %p')}"
-                    f" - {end.strftime('%a %b')} {end.day} {end.strftime('%I:%M %p')}"
-                )
-                if current.lower() in label.lower():
-                    choices.append(
-                        app_commands.Choice(
-                            name=label, value=f"sig_offer_{offer['id']}"
-                        )
-                    )
+            query = current.lower()
+            options = [
+                (offer.cancel_label(now), f"sig_offer_{offer.id}")
+                for offer in offers or []
+            ]
+            options.extend(
+                (claim.cancel_label(now), f"sig_claim_{claim.id}")
+                for claim in claims or []
+            )
+            # Recurring offers can also give up a single upcoming week; those go
+            # last so they never crowd whole offers and reservations out
+            options.extend(
+                (label, f"sig_week_{offer.id}_{week}")
+                for offer in offers or []
+                for week, label in offer.occurrence_choices(now)
+            )
 
-            for claim in claims or []:
-                start = datetime.fromisoformat(claim["start_time"]).astimezone(LOCAL_TZ)
-                end = datetime.fromisoformat(claim["end_time"]).astimezone(LOCAL_TZ)
-                spot_label = (
-                    "Staff"
-                    if claim["spot_number"] in STAFF_SPOTS
-                    else f"Spot {claim['spot_number']}"
-                )
-                label = (
-                    f"Cancel: {spot_label} "
-                    f"{start.strftime('%a %b')} {start.day} {start.strftime('%I:%M %p')}"
-                    f" - {end.strftime('%a %b')} {end.day} {end.strftime('%I:%M %p')}"
-                )
-                if current.lower() in label.lower():
-                    choices.append(
-                        app_commands.Choice(
-                            name=label, value=f"sig_claim_{claim['id']}"
-                        )
-                    )
+            choices = [
+                app_commands.Choice(name=label, value=value)
+                for label, value in options
+                if query in label.lower()
+            ][:CANCEL_SPOT_MAX_AUTOCOMPLETE_CHOICES]
         except Exception:
             logger.exception(
                 "Parking cancel autocomplete failed",
@@ -785,8 +987,12 @@ class Parking(commands.Cog):
 
         try:
             _, action_type, record_id = spot.split("_", 2)
+            week = None
+            if action_type == "week":
+                action_type = "offer"
+                record_id, week = record_id.rsplit("_", 1)
             success, msg, pings = await self.service.cancel_action(
-                interaction.user.id, action_type, record_id
+                interaction.user.id, action_type, record_id, week=week
             )
         except asyncio.TimeoutError:
             logger.exception(
@@ -796,6 +1002,11 @@ class Parking(commands.Cog):
             return await interaction.followup.send(
                 "❌ Cancel timed out. Please try again in a moment.", ephemeral=True
             )
+        except CircuitOpenError:
+            return await interaction.followup.send(
+                "❌ Parking is temporarily unavailable. Please try again in a moment.",
+                ephemeral=True,
+            )
         except Exception:
             logger.exception(
                 "Parking cancel failed in command handler",
@@ -885,7 +1096,8 @@ class Parking(commands.Cog):
             value=(
                 "`/parking_status` - View all currently available and reserved spots.\n"
                 "`/my_parking` - View your active offers and reservations.\n"
-                "`/cancel [spot]` - Cancel your reservation or withdraw your offer."
+                "`/watch_parking` - Get a DM when a spot opens up for your window.\n"
+                "`/cancel [spot]` - Cancel your reservation, or withdraw your offer or one week of it."
             ),
             inline=False,
         )
@@ -907,7 +1119,7 @@ class Parking(commands.Cog):
         embed.add_field(
             name="⛪ Staff Parking",
             value=(
-                "`/claim_staff` - Reserve one of the 2 available staff spots.\n"
+                f"`/claim_staff` - Reserve one of the {len(STAFF_SPOTS)} available staff spots.\n"
                 f"**Blackout Rules:** Staff spots cannot be reserved during:\n{blackout_str}"
             ),
             inline=False,
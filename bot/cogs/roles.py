@@ -209,7 +209,7 @@ class Roles(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self.service = RolesService(bot.supabase)
+        self.service = RolesService(bot.supabase, getattr(bot, "repository", None))
 
     async def cog_load(self):
         """Register the persistent view on startup."""
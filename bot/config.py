@@ -25,6 +25,30 @@ EXTENSIONS = [
 ]
 LOCAL_TZ = pytz.timezone("America/Chicago")
 
+# --- Database Settings ---
+# "postgrest" sends hot queries through the Supabase HTTP API; "asyncpg" sends them
+# over a direct connection pool on SUPABASE_DB_URL.
+DATABASE_BACKEND = os.getenv("DATABASE_BACKEND", "postgrest").lower()
+DATABASE_POOL_MIN_SIZE = 1
+DATABASE_POOL_MAX_SIZE = 5
+# Idle asyncpg connections are closed after this long
+DATABASE_POOL_IDLE_SECONDS = 300
+# Supabase HTTP client connection pool and keep-alive
+SUPABASE_HTTP_MAX_CONNECTIONS = 20
+SUPABASE_HTTP_MAX_KEEPALIVE_CONNECTIONS = 10
+SUPABASE_HTTP_KEEPALIVE_SECONDS = 60
+DATABASE_CONNECT_TIMEOUT_SECONDS = 3
+# Each database call gives up after this long, well inside a deferred interaction
+DATABASE_CALL_TIMEOUT_SECONDS = 5
+# Reads are retried this many times on connection errors, with jittered backoff
+DATABASE_READ_RETRIES = 2
+DATABASE_RETRY_BASE_SECONDS = 0.25
+# Consecutive connection failures that open the circuit, and how long it stays open
+DATABASE_BREAKER_FAILURE_THRESHOLD = 5
+DATABASE_BREAKER_RESET_SECONDS = 30
+# Local copy of the service caches, served read-only while the database is unreachable
+SNAPSHOT_PATH = Path(os.getenv("SNAPSHOT_PATH") or BASE_DIR / "cache_snapshot.sqlite3")
+
 # --- Lates System Settings ---
 # Role names should be lowercase. These are used to identify a user's house.
 HOUSE_ROLE_CONFIG = {
@@ -64,8 +88,20 @@ MINIMUM_OFFER_HOURS = 2
 MAXIMUM_OFFER_DAYS = 7
 
 CLAIM_SPOT_MAX_AUTOCOMPLETE_CHOICES = 5
+CLAIM_SPOT_AUTOCOMPLETE_CACHE_SIZE = 64
 CANCEL_SPOT_MAX_AUTOCOMPLETE_CHOICES = 25
-PARKING_STATUS_CACHE_TTL_SECONDS = 15
+# Filtered /parking_status page sets kept per detail level, and how long page buttons work
+PARKING_STATUS_FILTER_CACHE_SIZE = 32
+PARKING_STATUS_VIEW_TIMEOUT_SECONDS = 300
+# Optional channel holding a live /parking_status board; unset disables the board.
+PARKING_BOARD_CHANNEL_ID = int(os.getenv("PARKING_BOARD_CHANNEL_ID") or 0)
+# Board edits wait this long so a burst of cache changes becomes one edit.
+PARKING_BOARD_DEBOUNCE_SECONDS = 10
+# Mutations update the parking cache in place; a full reload only reconciles drift.
+PARKING_CACHE_RECONCILE_MINUTES = 15
+# Offer spot preferences are written in the background and retried with backoff.
+SPOT_PREFERENCE_MAX_ATTEMPTS = 4
+SPOT_PREFERENCE_RETRY_SECONDS = 2
 
 # --- Roles System Settings ---
 KOINONIAN_ROLE_ID = 1402659975045578793
@@ -77,5 +113,7 @@ RA_LOG_CHANNEL_ID = 1501386295140679750
 
 # --- Discord API Settings ---
 DISCORD_EMBED_FIELD_VALUE_LIMIT = 1024
+DISCORD_MESSAGE_EMBED_LIMIT = 10
+DISCORD_MESSAGE_EMBED_TOTAL_CHARACTERS = 6000
 TRUNCATION_SUFFIX = "..."
 TRUNCATION_LIMIT = DISCORD_EMBED_FIELD_VALUE_LIMIT - len(TRUNCATION_SUFFIX)
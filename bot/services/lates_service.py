@@ -2,31 +2,63 @@ import logging
 import os
 
 import aiohttp
+from postgrest.exceptions import APIError
 
 from bot.config import HOUSE_ROLE_CONFIG, LATES_VIEW_GROUPS
+from bot.services.repository import PostgrestRepository
 
 logger = logging.getLogger(__name__)
 
+# Postgres error code raised by the lates_user_day_meal_key unique constraint
+UNIQUE_VIOLATION = "23505"
+
 
 class LatesService:
     """Business logic and data access for late-plate commands."""
 
-    def __init__(self, supabase):
+    def __init__(self, supabase, repository=None, snapshots=None):
         """Store the shared Supabase client and initialize the memory cache."""
         self.supabase = supabase
+        self.repository = repository or PostgrestRepository(supabase)
+        self.snapshots = snapshots
         self.lates_cache = []
+        # False while the cache holds only snapshot data (or nothing) since startup
+        self.synced = False
 
     async def refresh_lates_cache(self):
         """Fetches all active late plates from Supabase and stores them in memory."""
         try:
-            res = await self.supabase.table("lates").select("*").execute()
-            self.lates_cache = res.data or []
+            self.lates_cache = await self.repository.select_all("lates")
+            self.synced = True
+            self._save_snapshot()
             logger.info(
                 f"Lates cache refreshed: {len(self.lates_cache)} total lates loaded."
             )
         except Exception as e:
             logger.error(f"Failed to refresh lates cache: {e}")
 
+    def load_snapshot(self):
+        """Fill the cache from the local snapshot and return whether one existed."""
+        snapshot = self.snapshots.load("lates") if self.snapshots else None
+        if snapshot is None:
+            return False
+        self.lates_cache = snapshot
+        logger.info(f"Lates cache loaded from snapshot: {len(snapshot)} lates.")
+        return True
+
+    def _save_snapshot(self):
+        if self.snapshots is not None:
+            self.snapshots.save_later("lates", lambda: self.lates_cache)
+
+    def apply_change(self, _table, op, row):
+        """Apply one row-level change from the database change feed to the cache."""
+        self.lates_cache = [
+            late for late in self.lates_cache if late.get("id") != row.get("id")
+        ]
+        if op != "DELETE":
+            self.lates_cache.append(row)
+        self._save_snapshot()
+
     @staticmethod
     def get_user_house(member):
         """Return the caller's house role slug, if present."""
@@ -103,7 +135,13 @@ class LatesService:
             "day_of_week": day,
             "is_permanent": is_permanent,
         }
-        await self.supabase.table("lates").insert(payload).execute()
+        try:
+            await self.supabase.table("lates").insert(payload).execute()
+        except APIError as e:
+            # Another request for the same late landed after the cache check
+            if e.code == UNIQUE_VIOLATION:
+                return False, "duplicate"
+            raise
 
         # 3. Synchronize cache
         await self.refresh_lates_cache()
@@ -6,6 +6,7 @@ from pathlib import Path
 from supabase import AsyncClient
 
 from bot.config import LOCAL_TZ
+from bot.services.repository import PostgrestRepository
 from bot.utils.meal_calendar import AcademicBreak, MealCalendarConfig
 
 logger = logging.getLogger(__name__)
@@ -14,11 +15,15 @@ logger = logging.getLogger(__name__)
 class MealsService:
     """Handles data fetching, caching, and business logic for the meal system."""
 
-    def __init__(self, bot, supabase: AsyncClient):
+    def __init__(self, bot, supabase: AsyncClient, repository=None, snapshots=None):
         """Initialize the service with the bot reference and a shared Supabase client."""
         self.bot = bot
         self.supabase = supabase
+        self.repository = repository or PostgrestRepository(supabase)
+        self.snapshots = snapshots
         self.calendar_config = None
+        # False while the calendar comes only from a snapshot (or is missing)
+        self.synced = False
 
     async def initialize_meals(self):
         """Initialize the meal calendar, academic breaks, and parse the CSV menu."""
@@ -133,37 +138,16 @@ class MealsService:
     async def refresh_calendar_config(self) -> bool:
         """Queries Supabase for the active meal calendar and caches it."""
         try:
-            # Now using the injected client via self.supabase
-            response = (
-                await self.supabase.table("meal_calendars")
-                .select("*, academic_breaks(*)")
-                .eq("is_active", True)
-                .execute()
-            )
+            active_cal = await self.repository.active_meal_calendar()
 
-            if not response.data:
+            if not active_cal:
                 print("Warning: No active meal calendar found in database.")
                 return False
 
-            active_cal = response.data[0]
-
-            breaks = [
-                AcademicBreak(
-                    name=b["name"],
-                    start=datetime.fromisoformat(b["start_date"]).astimezone(LOCAL_TZ),
-                    end=datetime.fromisoformat(b["end_date"]).astimezone(LOCAL_TZ),
-                    rotation_skip_days=b["rotation_skip_days"],
-                )
-                for b in active_cal.get("academic_breaks", [])
-            ]
-
-            self.calendar_config = MealCalendarConfig(
-                semester_start=datetime.fromisoformat(
-                    active_cal["semester_start"]
-                ).astimezone(LOCAL_TZ),
-                rotation_length_weeks=active_cal["rotation_length_weeks"],
-                breaks=breaks,
-            )
+            self._apply_calendar(active_cal)
+            self.synced = True
+            if self.snapshots is not None:
+                self.snapshots.save_later("meal_calendar", lambda: active_cal)
             print("Successfully loaded Meal Calendar config from Supabase.")
             return True
 
@@ -171,6 +155,38 @@ class MealsService:
             print(f"Error fetching calendar config: {e}")
             return False
 
+    def load_snapshot(self):
+        """Load the calendar from the local snapshot and return whether one existed."""
+        snapshot = self.snapshots.load("meal_calendar") if self.snapshots else None
+        if snapshot is None:
+            return False
+        self._apply_calendar(snapshot)
+        return True
+
+    def is_stale(self):
+        """Return whether the calendar or menu may be out of date since startup."""
+        return not self.synced or not getattr(self.bot, "meal_cache_synced", True)
+
+    def _apply_calendar(self, active_cal):
+        """Build and cache the calendar config from a ``meal_calendars`` row."""
+        breaks = [
+            AcademicBreak(
+                name=b["name"],
+                start=datetime.fromisoformat(b["start_date"]).astimezone(LOCAL_TZ),
+                end=datetime.fromisoformat(b["end_date"]).astimezone(LOCAL_TZ),
+                rotation_skip_days=b["rotation_skip_days"],
+            )
+            for b in active_cal.get("academic_breaks", [])
+        ]
+
+        self.calendar_config = MealCalendarConfig(
+            semester_start=datetime.fromisoformat(
+                active_cal["semester_start"]
+            ).astimezone(LOCAL_TZ),
+            rotation_length_weeks=active_cal["rotation_length_weeks"],
+            breaks=breaks,
+        )
+
     def get_meal_from_cache(self, week: int, day: str, meal_type: str) -> str:
         """Filters the cached menu data for the specific meal."""
         meal_type = meal_type.lower()
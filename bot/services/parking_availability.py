@@ -0,0 +1,103 @@
+"""Vectorized hour-resolution availability for every parking spot at once."""
+
+from datetime import datetime
+
+import numpy as np
+
+from bot.config import LOCAL_TZ, MINIMUM_RESERVATION_HOURS
+
+SLOT_SECONDS = 3600
+
+
+class AvailabilityMatrix:
+    """Offered, claimed and free hour slots for many spots over one horizon.
+
+    Row ``i`` of each boolean matrix is ``spots[i]``; column ``j`` is the hour
+    starting ``j`` hours after ``now``. All intervals are painted in one pass with a
+    difference array, and free blocks come from run-lengths of the free matrix.
+    Offers are rounded inward and claims outward, so a partial hour is never
+    reported free.
+    """
+
+    def __init__(
+        self, now, cutoff, spots, offers_by_spot, claims_by_spot, always_offered=()
+    ):
+        """Build the matrices from ``{spot: [{"start": dt, "end": dt}, ...]}`` mappings."""
+        self.now = now
+        self.cutoff = cutoff
+        self.spots = list(spots)
+        self._rows = {spot: row for row, spot in enumerate(self.spots)}
+        self._now_ts = now.timestamp()
+        self.slots = max(
+            0, int(np.ceil((cutoff.timestamp() - self._now_ts) / SLOT_SECONDS))
+        )
+
+        self.offered = self._paint(offers_by_spot, inward=True)
+        for spot in always_offered:
+            if spot in self._rows:
+                self.offered[self._rows[spot], :] = True
+        self.claimed = self._paint(claims_by_spot, inward=False)
+        self.free = self.offered & ~self.claimed
+        self._blocks = self._free_runs()
+
+    def _paint(self, windows_by_spot, inward):
+        """Return a spots x slots matrix marking every slot touched by a window."""
+        rows, starts, ends = [], [], []
+        for spot, windows in windows_by_spot.items():
+            row = self._rows.get(spot)
+            if row is None:
+                continue
+            for window in windows:
+                rows.append(row)
+                starts.append(window["start"].timestamp())
+                ends.append(window["end"].timestamp())
+
+        diff = np.zeros((len(self.spots), self.slots + 1), dtype=np.int32)
+        if rows:
+            start_offsets = (np.array(starts) - self._now_ts) / SLOT_SECONDS
+            end_offsets = (np.array(ends) - self._now_ts) / SLOT_SECONDS
+            round_start, round_end = (
+                (np.ceil, np.floor) if inward else (np.floor, np.ceil)
+            )
+            first = np.clip(round_start(start_offsets), 0, self.slots).astype(np.int64)
+            last = np.clip(round_end(end_offsets), 0, self.slots).astype(np.int64)
+            keep = first < last
+            row_index = np.array(rows)[keep]
+            np.add.at(diff, (row_index, first[keep]), 1)
+            np.add.at(diff, (row_index, last[keep]), -1)
+
+        return np.cumsum(diff, axis=1)[:, : self.slots] > 0
+
+    def _free_runs(self):
+        """Return ``{spot: [(first_slot, end_slot), ...]}`` for runs long enough to claim."""
+        padded = np.zeros((len(self.spots), self.slots + 2), dtype=np.int8)
+        padded[:, 1:-1] = self.free
+        edges = np.diff(padded, axis=1)
+        run_rows, run_starts = np.nonzero(edges == 1)
+        _, run_ends = np.nonzero(edges == -1)
+
+        long_enough = (run_ends - run_starts) >= MINIMUM_RESERVATION_HOURS
+        runs = {spot: [] for spot in self.spots}
+        for row, first, last in zip(
+            run_rows[long_enough], run_starts[long_enough], run_ends[long_enough]
+        ):
+            runs[self.spots[row]].append((int(first), int(last)))
+        return runs
+
+    def _slot_time(self, slot):
+        """Return the datetime where a slot boundary falls, clamping the last one to cutoff."""
+        if slot >= self.slots:
+            return self.cutoff
+        return datetime.fromtimestamp(self._now_ts + slot * SLOT_SECONDS, LOCAL_TZ)
+
+    def blocks(self, spot):
+        """Return the free ``(start, end)`` datetime blocks for one spot."""
+        return [
+            (self._slot_time(first), self._slot_time(last))
+            for first, last in self._blocks.get(spot, [])
+        ]
+
+    def is_claimed_now(self, spot):
+        """Return whether the spot's first slot is covered by a claim."""
+        row = self._rows.get(spot)
+        return row is not None and self.slots > 0 and bool(self.claimed[row, 0])
@@ -0,0 +1,561 @@
+"""In-memory interval indexes for cached parking offers and reservations."""
+
+import heapq
+import math
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+
+from bot.config import LOCAL_TZ, STAFF_SPOTS
+
+
+def to_timestamp(value):
+    """Return POSIX seconds for a datetime or a Supabase ISO timestamp string."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.timestamp()
+
+
+def to_local(value):
+    """Return a LOCAL_TZ datetime for a datetime or a Supabase ISO timestamp string."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.astimezone(LOCAL_TZ)
+
+
+WEEK_SECONDS = 7 * 24 * 3600
+
+
+def _choice_window(start, end):
+    """Format a window the way autocomplete choices show it."""
+    return (
+        f"{start.strftime('%a %b')} {start.day} {start.strftime('%I:%M %p')}"
+        f" - {end.strftime('%a %b')} {end.day} {end.strftime('%I:%M %p')}"
+    )
+
+
+def _ledger_window(start, end):
+    """Format a window the way /my_parking lists it."""
+    return f"{start.strftime('%a %I%p')} — {end.strftime('%a %I%p')}"
+
+
+class CachedParkingRow:
+    """One cached parking row with its timestamps parsed once at ingest.
+
+    Subclasses name the Supabase columns holding the Discord user id and username.
+
+    ``start``/``end`` is the row's first window and ``until`` the end of its last
+    one; they differ only for recurring offers.
+    """
+
+    __slots__ = (
+        "id",
+        "spot_number",
+        "user_id",
+        "username",
+        "start",
+        "end",
+        "until",
+    )
+
+    _fields = ("id", "spot_number", "user_id", "username", "start", "end")
+
+    user_field = None
+    username_field = None
+
+    def __init__(self, row_id, spot_number, user_id, username, start, end):
+        """Store already-normalized values."""
+        self.id = row_id
+        self.spot_number = spot_number
+        self.user_id = user_id
+        self.username = username
+        self.start = start
+        self.end = end
+        self.until = end
+
+    @classmethod
+    def from_row(cls, row):
+        """Build a record from a Supabase row dictionary."""
+        user_id = row.get(cls.user_field)
+        spot_number = row.get("spot_number")
+        return cls(
+            str(row["id"]),
+            int(spot_number) if spot_number is not None else None,
+            str(user_id) if user_id is not None else None,
+            row.get(cls.username_field) or "Unknown",
+            to_local(row["start_time"]),
+            to_local(row["end_time"]),
+            **cls._extra_fields(row),
+        )
+
+    @classmethod
+    def _extra_fields(cls, row):
+        """Return subclass-specific constructor arguments read from a row."""
+        return {}
+
+    def to_row(self):
+        """Return a row dictionary that ``from_row`` turns back into this record."""
+        return {
+            "id": self.id,
+            "spot_number": self.spot_number,
+            self.user_field: self.user_id,
+            self.username_field: self.username,
+            "start_time": self.start.isoformat(),
+            "end_time": self.end.isoformat(),
+        }
+
+    def windows(self, start=None, end=None):
+        """Yield each ``(start, end)`` window of this row overlapping [start, end)."""
+        if (start is None or self.end > start) and (end is None or self.start < end):
+            yield self.start, self.end
+
+    def overlaps(self, start, end):
+        """Return whether any window of this row overlaps [start, end)."""
+        return next(self.windows(start, end), None) is not None
+
+    def covers(self, start, end):
+        """Return whether one window of this row fully contains [start, end]."""
+        return any(
+            window_start <= start and window_end >= end
+            for window_start, window_end in self.windows(start, end)
+        )
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(
+            getattr(self, name) == getattr(other, name) for name in self._fields
+        )
+
+    def __repr__(self):
+        return (
+            f"{type(self).__name__}(id={self.id!r}, spot_number={self.spot_number}, "
+            f"user_id={self.user_id!r}, start={self.start.isoformat()}, "
+            f"end={self.end.isoformat()})"
+        )
+
+
+class CachedLedgerRow(CachedParkingRow):
+    """A cached row its user can see in ``/my_parking`` and pick in ``/cancel``.
+
+    Subclasses render the user-facing labels in ``_render_cancel_label`` and
+    ``_render_ledger_line`` from ``_label_key(now)``, whatever part of the row is
+    current at ``now``. Labels are kept on the record until that key changes; a
+    changed row is replaced by a new record, so they never go stale.
+    """
+
+    __slots__ = ("_cancel_label", "_ledger_line")
+
+    def __init__(self, *args, **kwargs):
+        """Store the row; labels are rendered on first use."""
+        super().__init__(*args, **kwargs)
+        self._cancel_label = None
+        self._ledger_line = None
+
+    def _label_key(self, now):
+        """Return what the labels depend on at ``now``; one window never changes."""
+        return None
+
+    def cancel_label(self, now):
+        """Return the ``/cancel`` autocomplete label for this row at ``now``."""
+        key = self._label_key(now)
+        if self._cancel_label is None or self._cancel_label[0] != key:
+            self._cancel_label = (key, self._render_cancel_label(key))
+        return self._cancel_label[1]
+
+    def ledger_line(self, now):
+        """Return the ``/my_parking`` line for this row at ``now``."""
+        key = self._label_key(now)
+        if self._ledger_line is None or self._ledger_line[0] != key:
+            self._ledger_line = (key, self._render_ledger_line(key))
+        return self._ledger_line[1]
+
+
+class CachedOffer(CachedLedgerRow):
+    """A cached row from ``parking_offers``.
+
+    One row is a weekly recurrence rule: the first window repeats every week for
+    ``weeks`` weeks, except the zero-based weeks in ``skipped_weeks``. Occurrences
+    are only expanded for the window a caller asks about.
+    """
+
+    __slots__ = ("weeks", "skipped_weeks")
+
+    _fields = CachedParkingRow._fields + ("weeks", "skipped_weeks")
+
+    user_field = "owner_id"
+    username_field = "owner_discord_username"
+
+    def __init__(self, *args, weeks=1, skipped_weeks=()):
+        """Store the first window plus the recurrence."""
+        super().__init__(*args)
+        self.weeks = weeks
+        self.skipped_weeks = frozenset(skipped_weeks)
+        last_week = max(
+            (week for week in range(weeks) if week not in self.skipped_weeks),
+            default=0,
+        )
+        self.until = self._shift(self.end, last_week)
+
+    @classmethod
+    def _extra_fields(cls, row):
+        return {
+            "weeks": int(row.get("weeks") or 1),
+            "skipped_weeks": row.get("skipped_weeks") or (),
+        }
+
+    def to_row(self):
+        return {
+            **super().to_row(),
+            "weeks": self.weeks,
+            "skipped_weeks": sorted(self.skipped_weeks),
+        }
+
+    @staticmethod
+    def _shift(moment, weeks):
+        """Return ``moment`` moved by whole weeks, with the local UTC offset fixed up."""
+        return LOCAL_TZ.normalize(moment + timedelta(weeks=weeks))
+
+    def windows(self, start=None, end=None):
+        """Yield each weekly occurrence overlapping [start, end), in order."""
+        first_week, last_week = 0, self.weeks - 1
+        if start is not None:
+            behind = (start.timestamp() - self.end.timestamp()) / WEEK_SECONDS
+            first_week = max(first_week, math.floor(behind) + 1)
+        if end is not None:
+            ahead = (end.timestamp() - self.start.timestamp()) / WEEK_SECONDS
+            last_week = min(last_week, math.ceil(ahead) - 1)
+
+        for week in range(first_week, last_week + 1):
+            if week not in self.skipped_weeks:
+                yield self._shift(self.start, week), self._shift(self.end, week)
+
+    def upcoming_weeks(self, now):
+        """Return the non-skipped weeks whose occurrence hasn't ended by ``now``."""
+        behind = (now.timestamp() - self.end.timestamp()) / WEEK_SECONDS
+        return [
+            week
+            for week in range(max(0, math.floor(behind)), self.weeks)
+            if week not in self.skipped_weeks and self._shift(self.end, week) > now
+        ]
+
+    def occurrence(self, week):
+        """Return the ``(start, end)`` window of one zero-based week."""
+        return self._shift(self.start, week), self._shift(self.end, week)
+
+    def occurrence_choices(self, now):
+        """Return ``(week, label)`` for each upcoming week that can be withdrawn alone.
+
+        Empty unless more than one week remains; withdrawing the last one is the
+        same as withdrawing the whole rule.
+        """
+        weeks = self.upcoming_weeks(now)
+        if len(weeks) <= 1:
+            return []
+        return [
+            (
+                week,
+                f"Withdraw one week: Spot {self.spot_number} "
+                f"{_choice_window(*self.occurrence(week))}",
+            )
+            for week in weeks
+        ]
+
+    def _label_key(self, now):
+        """Return the next upcoming week and how many remain.
+
+        Once every week has ended the last one stands in until the row is evicted.
+        """
+        weeks = self.upcoming_weeks(now)
+        if weeks:
+            return weeks[0], len(weeks)
+        last_week = max(
+            (week for week in range(self.weeks) if week not in self.skipped_weeks),
+            default=0,
+        )
+        return last_week, 1
+
+    @staticmethod
+    def _recurrence_suffix(remaining):
+        if remaining == 1:
+            return ""
+        return f" (weekly ×{remaining})"
+
+    def _render_cancel_label(self, key):
+        week, remaining = key
+        action = "Withdraw all weeks" if remaining > 1 else "Withdraw"
+        return (
+            f"{action}: Spot {self.spot_number} "
+            f"{_choice_window(*self.occurrence(week))}"
+            f"{self._recurrence_suffix(remaining)}"
+        )
+
+    def _render_ledger_line(self, key):
+        week, remaining = key
+        return (
+            f"**Spot {self.spot_number}**: {_ledger_window(*self.occurrence(week))}"
+            f"{self._recurrence_suffix(remaining)}"
+        )
+
+
+class CachedClaim(CachedLedgerRow):
+    """A cached row from ``parking_reservations``."""
+
+    __slots__ = ()
+
+    user_field = "claimer_id"
+    username_field = "claimer_discord_username"
+
+    def _render_cancel_label(self, _key):
+        spot_label = (
+            "Staff" if self.spot_number in STAFF_SPOTS else f"Spot {self.spot_number}"
+        )
+        return f"Cancel: {spot_label} {_choice_window(self.start, self.end)}"
+
+    def _render_ledger_line(self, _key):
+        spot_label = (
+            "Staff Spot"
+            if self.spot_number in STAFF_SPOTS
+            else f"Spot {self.spot_number}"
+        )
+        return f"**{spot_label}**: {_ledger_window(self.start, self.end)}"
+
+
+class CachedWatch(CachedParkingRow):
+    """A cached row from ``parking_watches``: a window a resident wants any spot for.
+
+    Watches are not tied to a spot, so a ``ParkingIndex`` of them keeps every
+    watch in the single ``None`` spot bucket.
+    """
+
+    __slots__ = ()
+
+    user_field = "watcher_id"
+    username_field = "watcher_discord_username"
+
+
+class SpotIntervals:
+    """Intervals for one spot kept sorted by start time.
+
+    A running maximum of end times lets overlap queries skip every interval
+    that finishes before the query window with a binary search.
+    """
+
+    __slots__ = ("_entries", "_starts", "_max_ends")
+
+    def __init__(self):
+        """Start with no intervals."""
+        self._entries = []
+        self._starts = []
+        self._max_ends = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, start, end, row_id):
+        """Insert one interval, keeping the start-time order."""
+        entry = (start, end, str(row_id))
+        index = bisect_right(self._entries, entry)
+        self._entries.insert(index, entry)
+        self._starts.insert(index, start)
+        self._max_ends = None
+
+    def remove(self, start, end, row_id):
+        """Drop one interval previously added with the same bounds and id."""
+        entry = (start, end, str(row_id))
+        index = bisect_left(self._entries, entry)
+        if index < len(self._entries) and self._entries[index] == entry:
+            del self._entries[index]
+            del self._starts[index]
+            self._max_ends = None
+
+    def _prefix_max_ends(self):
+        """Return the running maximum of end times, rebuilding it after edits."""
+        if self._max_ends is None:
+            running = float("-inf")
+            max_ends = []
+            for _start, end, _row_id in self._entries:
+                running = max(running, end)
+                max_ends.append(running)
+            self._max_ends = max_ends
+        return self._max_ends
+
+    def overlapping(self, start, end):
+        """Yield ids of intervals with start < end and end > start (either bound may be None)."""
+        hi = len(self._entries) if end is None else bisect_left(self._starts, end)
+        lo = 0 if start is None else bisect_right(self._prefix_max_ends(), start)
+        for _entry_start, entry_end, row_id in self._entries[lo:hi]:
+            if start is None or entry_end > start:
+                yield row_id
+
+    def covering(self, start, end):
+        """Yield ids of intervals that fully contain the window [start, end]."""
+        hi = bisect_right(self._starts, start)
+        lo = bisect_left(self._prefix_max_ends(), end)
+        for _entry_start, entry_end, row_id in self._entries[lo:hi]:
+            if entry_end >= end:
+                yield row_id
+
+
+class ParkingIndex:
+    """Cached rows of one parking table indexed by spot, row id and Discord user.
+
+    Supabase row dictionaries are converted to ``record_type`` on insert, so window
+    queries and every consumer read parsed datetimes instead of ISO strings.
+
+    Each row is indexed by its whole span, first start to ``until``; recurring
+    offers are then checked occurrence by occurrence. A min-heap of
+    ``(until_ts, row_id)`` orders rows by expiry. Removed or replaced
+    rows leave stale heap entries behind; they are skipped when they reach the top
+    and the heap is compacted once they outnumber live rows.
+    """
+
+    def __init__(self, record_type):
+        """Index rows as ``record_type`` (``CachedOffer`` or ``CachedClaim``)."""
+        self.record_type = record_type
+        self._rows = {}
+        self._by_spot = {}
+        self._by_user = {}
+        self._expiry = []
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __iter__(self):
+        return iter(list(self._rows.values()))
+
+    def __contains__(self, row_id):
+        return str(row_id) in self._rows
+
+    def get(self, row_id):
+        """Return the cached record for an id, if present."""
+        return self._rows.get(str(row_id))
+
+    def spots(self):
+        """Return the spot numbers that currently have indexed rows."""
+        return [spot for spot, intervals in self._by_spot.items() if len(intervals)]
+
+    def clear(self):
+        """Forget every indexed row."""
+        self._rows.clear()
+        self._by_spot.clear()
+        self._by_user.clear()
+        self._expiry.clear()
+
+    def load(self, rows):
+        """Replace the index contents with a fresh set of rows."""
+        self.clear()
+        for row in rows or []:
+            self.add(row)
+
+    def add(self, row):
+        """Insert or replace one row, given as a Supabase dictionary or a record."""
+        record = (
+            row if isinstance(row, self.record_type) else self.record_type.from_row(row)
+        )
+        if record.id in self._rows:
+            self.remove(record.id)
+
+        self._rows[record.id] = record
+        self._by_spot.setdefault(record.spot_number, SpotIntervals()).add(
+            record.start.timestamp(), record.until.timestamp(), record.id
+        )
+        if record.user_id is not None:
+            self._by_user.setdefault(record.user_id, {})[record.id] = record
+        heapq.heappush(self._expiry, (record.until.timestamp(), record.id))
+        return record
+
+    def remove(self, row_id):
+        """Remove one row by id and return its record, or None when it was not cached."""
+        record = self._rows.pop(str(row_id), None)
+        if record is None:
+            return None
+
+        self._by_spot[record.spot_number].remove(
+            record.start.timestamp(), record.until.timestamp(), record.id
+        )
+        if record.user_id is not None:
+            user_rows = self._by_user.get(record.user_id, {})
+            user_rows.pop(record.id, None)
+            if not user_rows:
+                self._by_user.pop(record.user_id, None)
+
+        if len(self._expiry) > 2 * len(self._rows) + 64:
+            self._expiry = [
+                (live.until.timestamp(), live.id) for live in self._rows.values()
+            ]
+            heapq.heapify(self._expiry)
+        return record
+
+    def _is_live(self, entry):
+        """Return whether a heap entry still describes a cached row."""
+        end_ts, row_id = entry
+        record = self._rows.get(row_id)
+        return record is not None and record.until.timestamp() == end_ts
+
+    def next_expiry(self):
+        """Return the earliest end time (POSIX seconds) of any cached row, or None."""
+        while self._expiry and not self._is_live(self._expiry[0]):
+            heapq.heappop(self._expiry)
+        return self._expiry[0][0] if self._expiry else None
+
+    def evict_expired(self, now):
+        """Remove and return every record whose last window ends at or before ``now``."""
+        now_ts = to_timestamp(now)
+        evicted = []
+        while self._expiry and self._expiry[0][0] <= now_ts:
+            entry = heapq.heappop(self._expiry)
+            if self._is_live(entry):
+                evicted.append(self.remove(entry[1]))
+        return evicted
+
+    def overlapping(self, start, end, spot=None):
+        """Return records with a window overlapping [start, end), ordered by spot then start.
+
+        ``start`` and ``end`` are datetimes; ``None`` leaves that side unbounded.
+        """
+        start_ts, end_ts = to_timestamp(start), to_timestamp(end)
+        spots = [int(spot)] if spot is not None else sorted(self._by_spot)
+        rows = []
+        for spot_number in spots:
+            intervals = self._by_spot.get(spot_number)
+            if intervals:
+                rows.extend(
+                    record
+                    for record in map(
+                        self._rows.__getitem__,
+                        intervals.overlapping(start_ts, end_ts),
+                    )
+                    if record.overlaps(start, end)
+                )
+        return rows
+
+    def covering(self, start, end, spot):
+        """Return records on one spot with one window fully containing [start, end]."""
+        intervals = self._by_spot.get(int(spot))
+        if not intervals:
+            return []
+        return [
+            record
+            for record in map(
+                self._rows.__getitem__,
+                intervals.covering(to_timestamp(start), to_timestamp(end)),
+            )
+            if record.covers(start, end)
+        ]
+
+    def for_user(self, user_id, after=None):
+        """Return one user's records ordered by start, optionally only those lasting past ``after``."""
+        user_rows = self._by_user.get(str(user_id))
+        if not user_rows:
+            return []
+
+        return sorted(
+            (
+                record
+                for record in user_rows.values()
+                if after is None or record.until > after
+            ),
+            key=lambda record: record.start,
+        )
@@ -1,15 +1,29 @@
 import asyncio
 import logging
+import time
 from datetime import datetime, timedelta
 
 from dateutil.relativedelta import FR, MO, SA, SU, TH, TU, WE, relativedelta
 from supabase import AsyncClient
+from bot.services.parking_availability import AvailabilityMatrix
+from bot.services.parking_index import (
+    CachedClaim,
+    CachedOffer,
+    CachedWatch,
+    ParkingIndex,
+    to_local,
+    to_timestamp,
+)
+from bot.services.repository import PostgrestRepository
 from bot.utils.constants import NOON
+from bot.utils.resilience import UNAVAILABLE_ERRORS
 
 from bot.config import (
     LOCAL_TZ,
     MINIMUM_RESERVATION_HOURS,
     PERMIT_SPOTS,
+    SPOT_PREFERENCE_MAX_ATTEMPTS,
+    SPOT_PREFERENCE_RETRY_SECONDS,
     STAFF_PARKING_BLACKOUTS,
     STAFF_SPOTS,
     WEEKEND_GUEST_HOURS_END,
@@ -17,13 +31,62 @@ from bot.config import (
 
 logger = logging.getLogger(__name__)
 
+HOURS_PER_DAY = 24
+HOURS_PER_WEEK = 7 * HOURS_PER_DAY
+_FULL_WEEK_MASK = (1 << HOURS_PER_WEEK) - 1
+
+
+def _compile_weekly_blackouts(blackouts):
+    """Compile (weekday, start_hour, end_hour) rules into a 168-bit hour-of-week mask."""
+    mask = 0
+    for day, start_hour, end_hour in blackouts:
+        for hour in range(start_hour, end_hour):
+            mask |= 1 << (day * HOURS_PER_DAY + hour)
+    return mask
+
+
+def _mask_runs(mask):
+    """Return the contiguous (start, end) hour-of-week runs set in a weekly mask."""
+    runs = []
+    run_start = None
+    for hour in range(HOURS_PER_WEEK + 1):
+        is_set = hour < HOURS_PER_WEEK and (mask >> hour) & 1
+        if is_set and run_start is None:
+            run_start = hour
+        elif not is_set and run_start is not None:
+            runs.append((run_start, hour))
+            run_start = None
+    return runs
+
+
+# Staff blackout rules compiled once: bit n is hour n of the week (Monday 12 AM = 0)
+STAFF_BLACKOUT_MASK = _compile_weekly_blackouts(STAFF_PARKING_BLACKOUTS)
+STAFF_BLACKOUT_RUNS = _mask_runs(STAFF_BLACKOUT_MASK)
+
+# Conflict reasons returned by the claim_parking_spot database function
+CLAIM_CONFLICT_MESSAGES = {
+    "already_reserved": "❌ Spot {spot} is already reserved.",
+    "not_offered": "❌ Spot {spot} isn't offered for that window.",
+}
+DATABASE_UNAVAILABLE_MESSAGE = (
+    "❌ Parking is temporarily unavailable. Please try again in a moment."
+)
+
 
 class ParkingService:
     """Database-backed business logic for the parking system."""
 
-    def __init__(self, supabase: AsyncClient):
-        """Use the shared async Supabase client."""
+    def __init__(self, supabase: AsyncClient, repository=None, snapshots=None):
+        """Use the shared async Supabase client, and ``repository`` for hot queries.
+
+        With a ``SnapshotStore``, every cache change is also saved locally so a
+        restart can serve the last known state before the database answers.
+        """
         self.supabase = supabase
+        self.repository = repository or PostgrestRepository(supabase)
+        self.snapshots = snapshots
+        # False while the caches hold only snapshot data (or nothing) since startup
+        self.synced = False
 
         self._spot_mutation_locks = {}
         self._staff_mutation_lock = asyncio.Lock()
@@ -31,36 +94,273 @@ class ParkingService:
 
         # In-memory cache for guest spots loaded on startup
         self.guest_spots_cache = set()
-        self.active_offers_cache = []
-        self.active_claims_cache = []
+        # Active offers/claims indexed by spot (sorted by start time) and by user
+        self.offers_index = ParkingIndex(CachedOffer)
+        self.claims_index = ParkingIndex(CachedClaim)
+        # Incremented on every cache change so derived views know when to rebuild
+        self.cache_version = 0
+        self._change_listeners = []
+        self._eviction_timer = None
+        # POSIX deadline the eviction timer is armed for
+        self._eviction_deadline = None
+        # Latest offered spot per user, written to parking_spots in the background
+        self._pending_spot_preferences = {}
+        self._spot_preference_writer = None
+        # Backoff timers for failed preference writes, one per user
+        self._spot_preference_retries = {}
+        # Open /watch_parking windows, matched whenever capacity frees up
+        self.watches_index = ParkingIndex(CachedWatch)
+        self._watch_listeners = []
+        # Matched watch ids, deleted from the database in the background
+        self._pending_watch_deletes = set()
+        self._watch_delete_writer = None
 
     async def refresh_parking_cache(self):
-        """Fetches active offers/claims from Supabase and stores them in memory."""
+        """Fetches active offers/claims from Supabase and replaces the in-memory indexes.
+
+        Mutations apply their own rows to the cache, so this full reload only runs at
+        startup and as a periodic reconciliation.
+        """
         try:
             now_iso = datetime.now(LOCAL_TZ).isoformat()
 
             # Run sequentially instead of using asyncio.gather to satisfy strict lock testing
-            offers = await (
-                self.supabase.table("parking_offers")
-                .select("*")
-                .gt("end_time", now_iso)
-                .execute()
+            offers = await self.repository.select_active(
+                "parking_offers", "repeat_until", now_iso
+            )
+            claims = await self.repository.select_active(
+                "parking_reservations", "end_time", now_iso
             )
-            claims = await (
-                self.supabase.table("parking_reservations")
-                .select("*")
-                .gt("end_time", now_iso)
-                .execute()
+            watches = await self.repository.select_active(
+                "parking_watches", "end_time", now_iso
             )
 
-            self.active_offers_cache = offers.data
-            self.active_claims_cache = claims.data
+            self.offers_index.load(offers)
+            self.claims_index.load(claims)
+            self.watches_index.load(watches)
+            self.synced = True
+            self._bump_cache_version()
             logger.info(
-                f"Parking cache refreshed: {len(self.active_offers_cache)} offers, {len(self.active_claims_cache)} claims."
+                f"Parking cache refreshed: {len(self.offers_index)} offers, {len(self.claims_index)} claims, "
+                f"{len(self.watches_index)} watches."
             )
         except Exception as e:
             logger.error(f"Failed to refresh parking cache: {e}")
 
+    def add_change_listener(self, callback):
+        """Register a no-argument callable to run after every parking cache change."""
+        self._change_listeners.append(callback)
+
+    def _bump_cache_version(self, snapshot=True):
+        """Mark the parking cache as changed, snapshot it and notify listeners.
+
+        ``snapshot=False`` skips the snapshot write, for changes that came from it.
+        """
+        self.cache_version += 1
+        self._schedule_eviction()
+        if snapshot and self.snapshots is not None:
+            self.snapshots.save_later("parking", self._snapshot)
+        for callback in self._change_listeners:
+            try:
+                callback()
+            except Exception:
+                logger.exception("Parking cache change listener failed")
+
+    def _snapshot(self):
+        """Return the parking caches as a JSON-ready document."""
+        return {
+            "guest_spots": sorted(self.guest_spots_cache),
+            "offers": [offer.to_row() for offer in self.offers_index],
+            "claims": [claim.to_row() for claim in self.claims_index],
+            "watches": [watch.to_row() for watch in self.watches_index],
+        }
+
+    def load_snapshot(self):
+        """Fill the caches from the local snapshot and return whether one existed.
+
+        The caches stay marked unsynced until ``refresh_parking_cache`` succeeds.
+        Rows that ended while the bot was down are evicted on the next loop pass.
+        """
+        snapshot = self.snapshots.load("parking") if self.snapshots else None
+        if snapshot is None:
+            return False
+
+        self.guest_spots_cache = set(snapshot["guest_spots"])
+        self.offers_index.load(snapshot["offers"])
+        self.claims_index.load(snapshot["claims"])
+        self.watches_index.load(snapshot["watches"])
+        self._bump_cache_version(snapshot=False)
+        logger.info(
+            f"Parking cache loaded from snapshot: {len(self.offers_index)} offers, "
+            f"{len(self.claims_index)} claims."
+        )
+        return True
+
+    def evict_expired(self, now=None):
+        """Drop cached offers and claims whose end time has passed and return how many."""
+        now = now or datetime.now(LOCAL_TZ)
+        evicted = len(self.offers_index.evict_expired(now)) + len(
+            self.claims_index.evict_expired(now)
+        )
+        if evicted:
+            self._bump_cache_version()
+        else:
+            self._schedule_eviction()
+        return evicted
+
+    def _schedule_eviction(self):
+        """Make sure one timer is armed for the next cached row to expire.
+
+        The armed timer is kept while it fires no later than the earliest expiry, so
+        readers calling this on every request don't churn timers. If the earliest
+        row went away, the timer fires early, evicts nothing and re-arms. Outside a
+        running event loop (e.g. synchronous tests) nothing is scheduled and expired
+        rows are still evicted by the readers.
+        """
+        expiries = [
+            expiry
+            for expiry in (
+                self.offers_index.next_expiry(),
+                self.claims_index.next_expiry(),
+            )
+            if expiry is not None
+        ]
+        if not expiries:
+            return
+        deadline = min(expiries)
+        if self._eviction_timer is not None and self._eviction_deadline <= deadline:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        if self._eviction_timer is not None:
+            self._eviction_timer.cancel()
+        self._eviction_deadline = deadline
+        self._eviction_timer = loop.call_later(
+            max(0.0, deadline - time.time()), self._on_eviction_timer
+        )
+
+    def _on_eviction_timer(self):
+        """Evict the rows that just expired and arm the timer for the next ones."""
+        self._eviction_timer = None
+        self._eviction_deadline = None
+        self.evict_expired()
+
+    def _apply_cache_delta(self, index, added=None, removed=None):
+        """Apply rows just written or deleted by this process to an in-memory index."""
+        for row in removed or []:
+            index.remove(row["id"])
+        for row in added or []:
+            index.add(row)
+        if added or removed:
+            self._bump_cache_version()
+
+    def apply_change(self, table, op, row):
+        """Apply one row-level change from the database change feed to the cache."""
+        index = {
+            "parking_offers": self.offers_index,
+            "parking_reservations": self.claims_index,
+            "parking_watches": self.watches_index,
+        }.get(table)
+        if index is None:
+            return
+
+        last_end = row.get("repeat_until") or row["end_time"]
+        expired = to_timestamp(last_end) <= datetime.now(LOCAL_TZ).timestamp()
+        if op == "DELETE" or expired:
+            index.remove(row["id"])
+        else:
+            index.add(row)
+        # Watches never show up in parking views, so they don't invalidate them
+        if index is not self.watches_index:
+            self._bump_cache_version()
+
+    def add_watch_listener(self, callback):
+        """Register a callable that receives ``[(watch, spot, start, end), ...]`` on matches."""
+        self._watch_listeners.append(callback)
+
+    async def create_watch(self, user_id, username, start, end):
+        """Register a window the user wants any resident or guest spot for."""
+        try:
+            inserted = await self.repository.insert(
+                "parking_watches",
+                {
+                    "watcher_id": str(user_id),
+                    "watcher_discord_username": username,
+                    "start_time": start.isoformat(),
+                    "end_time": end.isoformat(),
+                },
+            )
+        except UNAVAILABLE_ERRORS:
+            return False, DATABASE_UNAVAILABLE_MESSAGE
+        except Exception as e:
+            return False, f"❌ Database error: {e}"
+
+        for row in inserted:
+            self.watches_index.add(row)
+        return True, (
+            "👀 Watching for a spot\n"
+            f"Start: {self._format_datetime_label(start)}\n"
+            f"End: {self._format_datetime_label(end)}\n"
+            "You'll get one DM when a spot opens up in that window."
+        )
+
+    def _release_capacity(self, spot, windows, actor_id):
+        """Notify every watch overlapping windows that just became claimable on ``spot``.
+
+        Watches are looked up in their interval index, so each freed window costs a
+        binary search plus the matches rather than a scan of every watch. A watch
+        fires once: it leaves the cache immediately and is queued for one background
+        delete, so callers holding a spot lock never wait on that round trip. Staff
+        spots and windows too short to claim are skipped.
+        """
+        if spot in STAFF_SPOTS:
+            return []
+
+        now = datetime.now(LOCAL_TZ)
+        self.watches_index.evict_expired(now)
+        matches = []
+        for start, end in windows:
+            start = max(start, now)
+            if end - start < timedelta(hours=MINIMUM_RESERVATION_HOURS):
+                continue
+            for watch in self.watches_index.overlapping(start, end):
+                # The user freeing the capacity doesn't need to hear about it
+                if watch.user_id == str(actor_id):
+                    continue
+                self.watches_index.remove(watch.id)
+                matches.append((watch, spot, start, end))
+        if not matches:
+            return matches
+
+        self._pending_watch_deletes.update(watch.id for watch, *_ in matches)
+        if self._watch_delete_writer is None or self._watch_delete_writer.done():
+            self._watch_delete_writer = asyncio.create_task(
+                self._delete_matched_watches()
+            )
+
+        for callback in self._watch_listeners:
+            try:
+                callback(matches)
+            except Exception:
+                logger.exception("Parking watch listener failed")
+        return matches
+
+    async def _delete_matched_watches(self):
+        """Delete queued matched watches, batching ids that queue up meanwhile."""
+        while self._pending_watch_deletes:
+            watch_ids = sorted(self._pending_watch_deletes)
+            self._pending_watch_deletes.clear()
+            try:
+                await self.repository.delete_in("parking_watches", "id", watch_ids)
+            except Exception:
+                logger.exception(
+                    "Failed to delete matched parking watches",
+                    extra={"matches": len(watch_ids)},
+                )
+
     def _get_mutation_lock_for_spot(self, spot):
         """Return the shared mutation lock for one parking spot or the staff pool."""
         if spot in STAFF_SPOTS:
@@ -70,32 +370,14 @@ class ParkingService:
     async def save_offer_spot_preference(self, user_id, username, spot):
         """Persist the caller's last successful offer spot without failing the command."""
         try:
-            # Clear any existing spot ownership for this user
-            await (
-                self.supabase.table("parking_spots")
-                .update(
-                    {
-                        "discord_userid": None,
-                        "discord_nickname": None,
-                    }
-                )
-                .eq("discord_userid", str(user_id))
-                .execute()
-            )
-
-            # Set ownership on the newly offered spot
-            await (
-                self.supabase.table("parking_spots")
-                .update(
-                    {
-                        "discord_userid": str(user_id),
-                        "discord_nickname": username,
-                    }
-                )
-                .eq("spot_number", int(spot))
-                .execute()
+            await self.repository.call(
+                "set_parking_spot_owner",
+                {
+                    "p_spot_number": int(spot),
+                    "p_discord_userid": str(user_id),
+                    "p_discord_nickname": username,
+                },
             )
-
             return True
         except Exception:
             logger.exception(
@@ -104,6 +386,69 @@ class ParkingService:
             )
             return False
 
+    def queue_offer_spot_preference(self, user_id, username, spot):
+        """Queue the caller's last offered spot for the background preference writer.
+
+        Repeated offers by one user before the writer gets to them collapse into the
+        latest spot, so each user costs at most one write per drain.
+        """
+        user_id = str(user_id)
+        # A newer offer supersedes a failed write still waiting to be retried
+        retry = self._spot_preference_retries.pop(user_id, None)
+        if retry is not None:
+            retry.cancel()
+        self._queue_spot_preference(user_id, username, int(spot), 0)
+
+    def _queue_spot_preference(self, user_id, username, spot, attempts):
+        """Add one preference write to the queue and make sure the writer is running."""
+        self._pending_spot_preferences[user_id] = (username, spot, attempts)
+        if (
+            self._spot_preference_writer is None
+            or self._spot_preference_writer.done()
+        ):
+            self._spot_preference_writer = asyncio.create_task(
+                self._write_spot_preferences()
+            )
+
+    def _retry_spot_preference(self, user_id, username, spot, attempts):
+        """Re-queue a failed preference write once its backoff has passed."""
+        self._spot_preference_retries.pop(user_id, None)
+        if user_id not in self._pending_spot_preferences:
+            self._queue_spot_preference(user_id, username, spot, attempts)
+
+    async def _write_spot_preferences(self):
+        """Drain queued spot preferences, scheduling failed writes for a later retry.
+
+        Each retry waits on its own timer with a growing delay, so one failing user
+        never holds up the writes queued for everyone else.
+        """
+        while self._pending_spot_preferences:
+            user_id = next(iter(self._pending_spot_preferences))
+            username, spot, attempts = self._pending_spot_preferences.pop(user_id)
+            if await self.save_offer_spot_preference(user_id, username, spot):
+                continue
+
+            attempts += 1
+            if attempts >= SPOT_PREFERENCE_MAX_ATTEMPTS:
+                logger.error(
+                    "Giving up on parking spot preference",
+                    extra={"user_id": user_id, "spot": spot},
+                )
+                continue
+
+            # A newer offer queued in the meantime supersedes the failed write
+            if user_id in self._pending_spot_preferences:
+                continue
+            loop = asyncio.get_running_loop()
+            self._spot_preference_retries[user_id] = loop.call_later(
+                SPOT_PREFERENCE_RETRY_SECONDS * 2 ** (attempts - 1),
+                self._retry_spot_preference,
+                user_id,
+                username,
+                spot,
+                attempts,
+            )
+
     def parse_range(self, s_day_int, s_time_str, e_day_int, e_time_str):
         """Convert weekday and hour choices into the next matching start/end datetimes."""
         now = datetime.now(LOCAL_TZ).replace(minute=0, second=0, microsecond=0)
@@ -142,29 +487,41 @@ class ParkingService:
     async def load_cache(self):
         """Load mostly-static data into memory to reduce database hits."""
         try:
-            response = await (
-                self.supabase.table("parking_spots")
-                .select("spot_number")
-                .eq("is_guest", True)
-                .execute()
-            )
-            self.guest_spots_cache = {int(row["spot_number"]) for row in response.data}
+            spots = await self.repository.select_all("parking_spots")
+            self.guest_spots_cache = {
+                int(row["spot_number"]) for row in spots if row.get("is_guest")
+            }
+            self._bump_cache_version()
             logger.info(f"Loaded {len(self.guest_spots_cache)} guest spots into cache.")
         except Exception:
             logger.exception("Failed to load parking spot cache.")
 
     async def initialize_spots(self):
-        """Synchronize the database parking spot table ONLY if it is completely empty."""
+        """Make sure every configured staff spot has a row, and seed an empty table.
+
+        Staff spots are inserted-or-ignored on every start, so a spot added to
+        ``STAFF_SPOTS`` later becomes claimable. Resident spots are only seeded when
+        the table is completely empty, so dashboard edits are never overwritten.
+        """
         try:
-            # 1. Fast check to see if ANY row exists
-            check_response = await (
-                self.supabase.table("parking_spots")
-                .select("spot_number")
-                .limit(1)
-                .execute()
-            )
+            # 1. Check whether ANY row exists (the table holds one row per spot)
+            existing_spots = await self.repository.select_all("parking_spots")
+
+            # 2. Insert any staff spots that don't have a row yet
+            staff_configs = [
+                {
+                    "spot_number": spot,
+                    "spot_type": "staff",
+                    "is_guest": False,
+                }
+                for spot in STAFF_SPOTS
+            ]
+            if staff_configs:
+                await self.repository.insert(
+                    "parking_spots", staff_configs, ignore_duplicates=True
+                )
 
-            if check_response.data:
+            if existing_spots:
                 logger.info(
                     "parking_spots table is already populated. Skipping initialization."
                 )
@@ -172,122 +529,144 @@ class ParkingService:
 
             logger.info("parking_spots table is empty. Initializing default spots...")
 
-            all_configs = []
-
-            # 2. Format standard spots
-            for spot in PERMIT_SPOTS:
-                all_configs.append(
-                    {
-                        "spot_number": spot,
-                        "spot_type": "resident",
-                        "is_guest": False,
-                    }
-                )
-
-            # 3. Format staff spots
-            for spot in STAFF_SPOTS:
-                all_configs.append(
-                    {
-                        "spot_number": spot,
-                        "spot_type": "staff",
-                        "is_guest": False,
-                    }
-                )
+            # 3. Format standard spots
+            all_configs = [
+                {
+                    "spot_number": spot,
+                    "spot_type": "resident",
+                    "is_guest": False,
+                }
+                for spot in PERMIT_SPOTS
+            ]
 
             # 4. Batch insert all new spots
-            await self.supabase.table("parking_spots").insert(all_configs).execute()
-            logger.info(f"Successfully initialized {len(all_configs)} parking spots!")
+            await self.repository.insert("parking_spots", all_configs)
+            logger.info(
+                f"Successfully initialized {len(all_configs) + len(staff_configs)} "
+                "parking spots!"
+            )
 
         except Exception:
             logger.exception("Parking spot initialization failed")
 
+    @staticmethod
+    def _hour_steps(start, end):
+        """Return how many hourly steps from ``start`` it takes to reach ``end``."""
+        return max(0, -((start - end) // timedelta(hours=1)))
+
     def is_blackout(self, start, end):
         """Return whether any hour in the requested window falls inside staff blackout time."""
-        curr = start
-        while curr < end:
-            d, h = curr.weekday(), curr.hour
-            for blackout_day, blackout_start, blackout_end in STAFF_PARKING_BLACKOUTS:
-                if d == blackout_day and blackout_start <= h < blackout_end:
-                    return True
-            curr += timedelta(hours=1)
-        return False
+        steps = self._hour_steps(start, end)
+        if steps == 0:
+            return False
+        if steps >= HOURS_PER_WEEK:
+            return bool(STAFF_BLACKOUT_MASK)
+
+        # Rotate the requested hours onto the weekly bitmap and intersect
+        offset = start.weekday() * HOURS_PER_DAY + start.hour
+        requested = (1 << steps) - 1
+        rotated = (requested << offset) | (requested >> (HOURS_PER_WEEK - offset))
+        return bool(rotated & STAFF_BLACKOUT_MASK & _FULL_WEEK_MASK)
 
     def get_staff_availability_windows(self, start_time: datetime, end_time: datetime):
         """Return a list of non-blackout time windows for the specified range."""
+        steps = self._hour_steps(start_time, end_time)
+        offset = start_time.weekday() * HOURS_PER_DAY + start_time.hour
+
+        # Project each weekly blackout run onto hour steps counted from start_time
+        blocked = []
+        for week in range((offset + steps) // HOURS_PER_WEEK + 1):
+            shift = week * HOURS_PER_WEEK - offset
+            for run_start, run_end in STAFF_BLACKOUT_RUNS:
+                lo, hi = max(run_start + shift, 0), min(run_end + shift, steps)
+                if lo < hi:
+                    blocked.append((lo, hi))
+        blocked.sort()
+
         windows = []
-        current_window_start = None
+        pointer = 0
+        for lo, hi in blocked:
+            if lo > pointer:
+                windows.append(
+                    {
+                        "start": start_time + timedelta(hours=pointer),
+                        "end": start_time + timedelta(hours=lo),
+                    }
+                )
+            pointer = max(pointer, hi)
 
-        hour_iterator = start_time
-        while hour_iterator < end_time:
-            is_in_blackout = self.is_blackout(
-                hour_iterator, hour_iterator + timedelta(hours=1)
+        if pointer < steps:
+            windows.append(
+                {"start": start_time + timedelta(hours=pointer), "end": end_time}
             )
 
-            if not is_in_blackout and current_window_start is None:
-                current_window_start = hour_iterator
-            elif is_in_blackout and current_window_start is not None:
-                windows.append({"start": current_window_start, "end": hour_iterator})
-                current_window_start = None
-
-            hour_iterator += timedelta(hours=1)
-
-        if current_window_start is not None:
-            windows.append({"start": current_window_start, "end": end_time})
-
         return windows
 
     async def get_parking_data(self, now, cutoff):
         """Fetch all raw parking data from the IN-MEMORY cache (0ms latency)."""
-        now_iso = now.isoformat()
-        cutoff_iso = cutoff.isoformat()
-
-        # Filter the local memory exactly like Supabase would
-        valid_offers = [
-            o
-            for o in self.active_offers_cache
-            if o["end_time"] > now_iso and o["start_time"] < cutoff_iso
-        ]
-        valid_claims = [
-            c
-            for c in self.active_claims_cache
-            if c["end_time"] > now_iso and c["start_time"] < cutoff_iso
-        ]
+        self.evict_expired()
+        valid_offers = self.offers_index.overlapping(now, cutoff)
+        valid_claims = self.claims_index.overlapping(now, cutoff)
 
         return valid_offers, valid_claims, list(self.guest_spots_cache)
 
     async def create_offers(self, user_id, username, spot, base_start, base_end, weeks):
-        """Create one or more weekly parking offers and return a user-facing confirmation."""
+        """Offer a spot for one window, repeated weekly, and return a user-facing confirmation.
+
+        The whole series is stored as a single recurrence row (see ``CachedOffer``).
+        Existing offers on the spot are fetched in one query; weeks that overlap one
+        are recorded in ``skipped_weeks`` and listed in the confirmation.
+        """
         async with self._get_mutation_lock_for_spot(spot):
             try:
-                all_offers = []
-                for i in range(weeks):
-                    start = base_start + timedelta(weeks=i)
-                    end = base_end + timedelta(weeks=i)
-
-                    existing = await (
-                        self.supabase.table("parking_offers")
-                        .select("*")
-                        .eq("spot_number", int(spot))
-                        .lt("start_time", end.isoformat())
-                        .gt("end_time", start.isoformat())
-                        .execute()
-                    )
-
-                    if not existing.data:
-                        all_offers.append(
-                            {
-                                "spot_number": int(spot),
-                                "owner_id": str(user_id),
-                                "owner_discord_username": username,
-                                "start_time": start.isoformat(),
-                                "end_time": end.isoformat(),
-                            }
-                        )
+                rule = CachedOffer(
+                    None,
+                    int(spot),
+                    str(user_id),
+                    username,
+                    to_local(base_start),
+                    to_local(base_end),
+                    weeks=weeks,
+                )
 
-                if not all_offers:
+                existing = await self.repository.offers_overlapping(
+                    int(spot), rule.start.isoformat(), rule.until.isoformat()
+                )
+                taken = [CachedOffer.from_row(row) for row in existing]
+
+                skipped = [
+                    week
+                    for week, (start, end) in enumerate(rule.windows())
+                    if any(offer.overlaps(start, end) for offer in taken)
+                ]
+                if len(skipped) == weeks:
                     return False, "❌ This spot is already offered for those times."
 
-                await self.supabase.table("parking_offers").insert(all_offers).execute()
+                rule = CachedOffer(
+                    None,
+                    rule.spot_number,
+                    rule.user_id,
+                    username,
+                    rule.start,
+                    rule.end,
+                    weeks=weeks,
+                    skipped_weeks=skipped,
+                )
+                inserted = await self.repository.insert(
+                    "parking_offers",
+                    {
+                        "spot_number": rule.spot_number,
+                        "owner_id": rule.user_id,
+                        "owner_discord_username": username,
+                        "start_time": rule.start.isoformat(),
+                        "end_time": rule.end.isoformat(),
+                        "weeks": weeks,
+                        "skipped_weeks": skipped,
+                        "repeat_until": rule.until.isoformat(),
+                    },
+                )
+                self._apply_cache_delta(self.offers_index, added=inserted)
+                self._release_capacity(rule.spot_number, rule.windows(), user_id)
 
                 start_label = self._format_datetime_label(base_start)
                 end_label = self._format_datetime_label(base_end)
@@ -297,200 +676,249 @@ class ParkingService:
                     f"Start: {start_label}\n"
                     f"End: {end_label}"
                 )
-
-                await self.refresh_parking_cache()
+                if skipped:
+                    skipped_dates = ", ".join(
+                        f"{start.strftime('%a %b')} {start.day}"
+                        for start in (
+                            base_start + timedelta(weeks=week) for week in skipped
+                        )
+                    )
+                    success_msg += f"\nSkipped (already offered): {skipped_dates}"
 
                 return True, success_msg
+            except UNAVAILABLE_ERRORS:
+                return False, DATABASE_UNAVAILABLE_MESSAGE
             except Exception as e:
                 return False, f"❌ Database error: {e}"
 
     async def claim_resident_spot(self, user_id, username, spot, start, end):
-        """Reserve a guest spot or a resident spot covered by an existing offer."""
-        async with self._get_mutation_lock_for_spot(spot):
-            conflict = await (
-                self.supabase.table("parking_reservations")
-                .select("*")
-                .eq("spot_number", int(spot))
-                .lt("start_time", end.isoformat())
-                .gt("end_time", start.isoformat())
-                .execute()
-            )
-
-            if conflict.data:
-                return False, f"❌ Spot {spot} is already reserved."
-
-            offer_id = None
-            if int(spot) not in self.guest_spots_cache:
-                offer = await (
-                    self.supabase.table("parking_offers")
-                    .select("id")
-                    .eq("spot_number", int(spot))
-                    .lte("start_time", start.isoformat())
-                    .gte("end_time", end.isoformat())
-                    .execute()
-                )
+        """Reserve a guest spot or a resident spot covered by an existing offer.
 
-                if not offer.data:
-                    return False, f"❌ Spot {spot} isn't offered for that window."
-                offer_id = offer.data[0]["id"]
+        The check and insert happen in one ``claim_parking_spot`` database call, and an
+        exclusion constraint on parking_reservations rules out double booking even
+        across several bot processes. Conflicts the cache can already see are
+        rejected before touching the database.
+        """
+        reason = self._cached_claim_conflict(spot, start, end)
+        if reason is not None:
+            return False, CLAIM_CONFLICT_MESSAGES[reason].format(spot=spot)
 
-            (
-                await self.supabase.table("parking_reservations")
-                .insert(
-                    {
-                        "spot_number": int(spot),
-                        "claimer_id": str(user_id),
-                        "claimer_discord_username": username,
-                        "start_time": start.isoformat(),
-                        "end_time": end.isoformat(),
-                        "offer_id": offer_id,
-                    }
+        async with self._get_mutation_lock_for_spot(spot):
+            try:
+                result = (
+                    await self.repository.call(
+                        "claim_parking_spot",
+                        {
+                            "p_spot_number": int(spot),
+                            "p_claimer_id": str(user_id),
+                            "p_claimer_username": username,
+                            "p_start": start.isoformat(),
+                            "p_end": end.isoformat(),
+                        },
+                    )
+                    or {}
                 )
-                .execute()
-            )
+            except UNAVAILABLE_ERRORS:
+                logger.warning("Parking claim failed: database unavailable")
+                return False, DATABASE_UNAVAILABLE_MESSAGE
+            if result.get("status") != "reserved":
+                message = CLAIM_CONFLICT_MESSAGES.get(
+                    result.get("reason"), "❌ Spot {spot} could not be reserved."
+                )
+                return False, message.format(spot=spot)
+
+            self._apply_cache_delta(self.claims_index, added=[result["reservation"]])
 
             start_label = self._format_datetime_label(start)
             end_label = self._format_datetime_label(end)
 
-            await self.refresh_parking_cache()
-
             return (
                 True,
                 f"✅ **Spot {spot}** reserved!\nStart: {start_label}\nEnd: {end_label}",
             )
 
-    async def claim_staff_spot(self, user_id, username, start, end):
-        """Assign the first available staff spot for a requested window."""
-        async with self._staff_mutation_lock:
-            if self.is_blackout(start, end):
-                return False, "❌ Blackout hours active."
-
-            conflicts = await (
-                self.supabase.table("parking_reservations")
-                .select("spot_number")
-                .in_("spot_number", STAFF_SPOTS)
-                .lt("start_time", end.isoformat())
-                .gt("end_time", start.isoformat())
-                .execute()
-            )
+    def _cached_claim_conflict(self, spot, start, end):
+        """Return the conflict reason the cache already shows for a claim, if any.
+
+        Mirrors the checks in ``claim_parking_spot``. The cache may lag the database,
+        so a clean result here is not a guarantee; the database stays authoritative.
+        Until the first sync the cache may only hold a snapshot, so nothing is
+        rejected from it and every claim goes to the database.
+        """
+        if not self.synced:
+            return None
+        if self.claims_index.overlapping(start, end, spot=spot):
+            return "already_reserved"
+        needs_offer = spot not in self.guest_spots_cache and spot not in STAFF_SPOTS
+        if needs_offer and not self.offers_index.covering(start, end, spot):
+            return "not_offered"
+        return None
 
-            occupied = [int(row["spot_number"]) for row in conflicts.data]
+    async def claim_staff_spot(self, user_id, username, start, end):
+        """Assign the best-fitting free staff spot for a requested window.
+
+        Spots are tried in best-fit order through ``claim_parking_spot``; if another
+        process books one first, the next candidate is tried.
+        """
+        if self.is_blackout(start, end):
+            return False, "❌ Blackout hours active."
+        if self.synced and all(
+            self.claims_index.overlapping(start, end, spot=staff_spot)
+            for staff_spot in STAFF_SPOTS
+        ):
+            return False, "❌ Staff spots are full."
 
-            if len(occupied) >= len(STAFF_SPOTS):
+        async with self._staff_mutation_lock:
+            for spot in self._rank_staff_spots(start, end):
+                try:
+                    result = (
+                        await self.repository.call(
+                            "claim_parking_spot",
+                            {
+                                "p_spot_number": int(spot),
+                                "p_claimer_id": str(user_id),
+                                "p_claimer_username": username,
+                                "p_start": start.isoformat(),
+                                "p_end": end.isoformat(),
+                            },
+                        )
+                        or {}
+                    )
+                except UNAVAILABLE_ERRORS:
+                    logger.warning("Staff parking claim failed: database unavailable")
+                    return False, DATABASE_UNAVAILABLE_MESSAGE
+                if result.get("status") == "reserved":
+                    self._apply_cache_delta(
+                        self.claims_index, added=[result["reservation"]]
+                    )
+                    break
+                # Another process booked this spot first; try the next best fit
+            else:
                 return False, "❌ Staff spots are full."
 
-            assigned = (
-                STAFF_SPOTS[0] if STAFF_SPOTS[0] not in occupied else STAFF_SPOTS[1]
-            )
-            await (
-                self.supabase.table("parking_reservations")
-                .insert(
-                    {
-                        "spot_number": assigned,
-                        "claimer_id": str(user_id),
-                        "claimer_discord_username": username,
-                        "start_time": start.isoformat(),
-                        "end_time": end.isoformat(),
-                    }
-                )
-                .execute()
-            )
-
             start_label = self._format_datetime_label(start)
             end_label = self._format_datetime_label(end)
 
-            await self.refresh_parking_cache()
-
             return (
                 True,
                 f"✅ Staff Spot reserved!\nStart: {start_label}\nEnd: {end_label}",
             )
 
-    async def cancel_action(self, user_id, action_type, record_id):
-        """Cancel one selected offer or reservation and return any affected user mentions."""
-        try:
-            table_name = (
-                "parking_offers" if action_type == "offer" else "parking_reservations"
-            )
-            response = await (
-                self.supabase.table(table_name)
-                .select("spot_number")
-                .eq("id", str(record_id))
-                .execute()
-            )
-
-            spot = int(response.data[0]["spot_number"]) if response.data else None
-        except Exception:
-            spot = None
+    def _rank_staff_spots(self, start, end):
+        """Return the staff spots free for a window, best fit first.
+
+        A spot's fit is the idle time left around the window between its nearest
+        cached reservations. Filling the tightest gap keeps long free stretches
+        intact for later requests. Spots with no reservation on a side count as
+        unbounded there and rank after bounded ones; ties keep STAFF_SPOTS order.
+        """
+        start_ts, end_ts = start.timestamp(), end.timestamp()
+        ranked = []
+        for order, spot in enumerate(STAFF_SPOTS):
+            if self.claims_index.overlapping(start, end, spot=spot):
+                continue
 
+            before = self.claims_index.overlapping(None, start, spot=spot)
+            after = self.claims_index.overlapping(end, None, spot=spot)
+            slack = [
+                (
+                    start_ts - max(claim.end.timestamp() for claim in before)
+                    if before
+                    else None
+                ),
+                (
+                    min(claim.start.timestamp() for claim in after) - end_ts
+                    if after
+                    else None
+                ),
+            ]
+            unbounded_sides = slack.count(None)
+            bounded_slack = sum(value for value in slack if value is not None)
+            ranked.append((unbounded_sides, bounded_slack, order, spot))
+
+        return [spot for *_key, spot in sorted(ranked)]
+
+    async def cancel_action(self, user_id, action_type, record_id, week=None):
+        """Cancel one selected offer or reservation and return any affected user mentions.
+
+        Each branch is a single database call. Withdrawing an offer runs the
+        ``withdraw_parking_offer`` function (``docs/sql/07_parking_cancellations.sql``),
+        which deletes the offer and its upcoming reservations together and returns
+        both, so the cache and the claimer pings come from the same response. With
+        ``week`` set, ``skip_parking_offer_week`` withdraws only that zero-based week
+        of a recurring offer.
+        """
+        index = self.offers_index if action_type == "offer" else self.claims_index
+        cached = index.get(record_id)
         lock = (
-            self._get_mutation_lock_for_spot(spot)
-            if spot is not None
+            self._get_mutation_lock_for_spot(cached.spot_number)
+            if cached is not None
             else self._fallback_mutation_lock
         )
 
         async with lock:
-            now_iso = datetime.now(LOCAL_TZ).isoformat()
-
             if action_type == "offer":
-                target = await (
-                    self.supabase.table("parking_offers")
-                    .select("*")
-                    .eq("owner_id", str(user_id))
-                    .eq("id", str(record_id))
-                    .gt("end_time", now_iso)
-                    .execute()
+                if week is None:
+                    function, args = "withdraw_parking_offer", {}
+                else:
+                    function, args = "skip_parking_offer_week", {"p_week": int(week)}
+                result = (
+                    await self.repository.call(
+                        function,
+                        {
+                            "p_offer_id": str(record_id),
+                            "p_owner_id": str(user_id),
+                            **args,
+                        },
+                    )
+                    or {}
                 )
 
-                if not target.data:
+                status = result.get("status")
+                if status not in ("withdrawn", "skipped"):
                     return False, "No matching offers.", None
 
-                offer = target.data[0]
-                claims = await (
-                    self.supabase.table("parking_reservations")
-                    .select("claimer_id")
-                    .eq("offer_id", str(record_id))
-                    .execute()
-                )
-                await (
-                    self.supabase.table("parking_reservations")
-                    .delete()
-                    .eq("offer_id", str(record_id))
-                    .execute()
-                )
-                await (
-                    self.supabase.table("parking_offers")
-                    .delete()
-                    .eq("id", str(record_id))
-                    .execute()
-                )
-                pings = list({f"<@{c['claimer_id']}>" for c in claims.data})
+                offer = result["offer"]
+                reservations = result.get("reservations") or []
+                self._apply_cache_delta(self.claims_index, removed=reservations)
+                if status == "skipped":
+                    self._apply_cache_delta(self.offers_index, added=[offer])
+                else:
+                    self._apply_cache_delta(self.offers_index, removed=[offer])
+                pings = list({f"<@{c['claimer_id']}>" for c in reservations})
 
                 spot_label = (
                     "Staff Spot"
                     if offer["spot_number"] in STAFF_SPOTS
                     else f"Spot {offer['spot_number']}"
                 )
+                if status == "skipped":
+                    start = CachedOffer.from_row(offer).occurrence(int(week))[0]
+                    return (
+                        True,
+                        f"🔄 {spot_label} offer withdrawn for "
+                        f"{start.strftime('%a %b')} {start.day}.",
+                        pings,
+                    )
                 return True, f"🔄 {spot_label} offer withdrawn.", pings
 
-            target = await (
-                self.supabase.table("parking_reservations")
-                .select("*")
-                .eq("claimer_id", str(user_id))
-                .eq("id", str(record_id))
-                .gt("end_time", now_iso)
-                .execute()
+            result = (
+                await self.repository.call(
+                    "cancel_parking_reservation",
+                    {"p_reservation_id": str(record_id), "p_claimer_id": str(user_id)},
+                )
+                or {}
             )
 
-            if not target.data:
+            if result.get("status") != "cancelled":
                 return False, "No matching claims.", None
 
-            reservation = target.data[0]
-            await (
-                self.supabase.table("parking_reservations")
-                .delete()
-                .eq("id", str(record_id))
-                .execute()
+            reservation = result["reservation"]
+            self._apply_cache_delta(self.claims_index, removed=[reservation])
+            self._release_capacity(
+                int(reservation["spot_number"]),
+                CachedClaim.from_row(reservation).windows(),
+                user_id,
             )
             spot_label = (
                 "Staff Spot"
@@ -498,62 +926,33 @@ class ParkingService:
                 else f"Spot {reservation['spot_number']}"
             )
 
-            await self.refresh_parking_cache()
-
             return True, f"🔄 Reservation for {spot_label} cancelled.", None
 
     async def get_user_activity(self, user_id):
         """Fetch active offers and reservations for a specific user instantly from memory."""
-        now_iso = datetime.now(LOCAL_TZ).isoformat()
-        user_str = str(user_id)
-
-        # Filter the global cache instead of querying Supabase
-        user_offers = [
-            offer
-            for offer in self.active_offers_cache
-            if offer["owner_id"] == user_str and offer["end_time"] > now_iso
-        ]
-
-        user_claims = [
-            claim
-            for claim in self.active_claims_cache
-            if claim["claimer_id"] == user_str and claim["end_time"] > now_iso
-        ]
-
-        return user_offers, user_claims
+        return await self.get_cancel_autocomplete_data(user_id, datetime.now(LOCAL_TZ))
 
     async def get_cancel_autocomplete_data(self, user_id, now):
         """Fetch active offers and reservations for cancel autocomplete instantly from memory."""
-        now_iso = now.isoformat()
-        user_str = str(user_id)
-
-        # Filter the global cache instead of querying Supabase
-        user_offers = [
-            offer
-            for offer in self.active_offers_cache
-            if offer["owner_id"] == user_str and offer["end_time"] > now_iso
-        ]
-
-        user_claims = [
-            claim
-            for claim in self.active_claims_cache
-            if claim["claimer_id"] == user_str and claim["end_time"] > now_iso
-        ]
+        self.evict_expired(now)
+        user_offers = self.offers_index.for_user(user_id)
+        user_claims = self.claims_index.for_user(user_id)
 
         return user_offers, user_claims
 
-    async def get_claim_autocomplete_data(self, now):
-        """Fetch guest spots, active offers, and active claims for claim autocomplete instantly from memory."""
-        now_iso = now.isoformat()
+    async def get_claim_autocomplete_data(self, start, end, now):
+        """Return guest spots, offers covering [start, end] and claims overlapping it.
 
-        # Filter the global cache
+        Both lists come straight from the interval indexes, so only rows near the
+        window are looked at.
+        """
+        self.evict_expired(now)
         valid_offers = [
-            offer for offer in self.active_offers_cache if offer["end_time"] > now_iso
-        ]
-
-        valid_claims = [
-            claim for claim in self.active_claims_cache if claim["end_time"] > now_iso
+            offer
+            for spot in self.offers_index.spots()
+            for offer in self.offers_index.covering(start, end, spot)
         ]
+        valid_claims = self.claims_index.overlapping(start, end)
 
         guest_spots = [{"spot_number": spot} for spot in self.guest_spots_cache]
 
@@ -622,6 +1021,54 @@ class ParkingService:
             (claim for claim in raw_claims if claim["start"] <= now < claim["end"]),
             None,
         )
+        header = self._availability_header(
+            now, cutoff, blocks, current_claim, is_resident
+        )
+
+        return header, blocks
+
+    def get_lot_availability(
+        self,
+        now,
+        cutoff,
+        spots,
+        offers_db,
+        claims_db,
+        guest_spots=(),
+        is_resident=True,
+    ):
+        """Return ``{spot: (header, blocks)}`` for many spots from one vectorized pass.
+
+        Equivalent to calling get_merged_availability per spot at hour resolution,
+        which is what every offer, claim and status render uses.
+        """
+        matrix = AvailabilityMatrix(
+            now, cutoff, spots, offers_db, claims_db, always_offered=guest_spots
+        )
+
+        availability = {}
+        for spot in matrix.spots:
+            blocks = matrix.blocks(spot)
+            current_claim = None
+            if matrix.is_claimed_now(spot):
+                current_claim = next(
+                    (
+                        claim
+                        for claim in claims_db.get(spot, [])
+                        if claim["start"] <= now < claim["end"]
+                    ),
+                    None,
+                )
+            availability[spot] = (
+                self._availability_header(
+                    now, cutoff, blocks, current_claim, is_resident
+                ),
+                blocks,
+            )
+        return availability
+
+    def _availability_header(self, now, cutoff, blocks, current_claim, is_resident):
+        """Summarize one spot's free blocks and current claim as a status header."""
         active_block = next(
             (block for block in blocks if block[0] <= now < block[1]), None
         )
@@ -643,24 +1090,16 @@ class ParkingService:
                         )
                         else "12 AM"
                     )
-                    header = f"🟢 Available Now (until {reset_time_string})"
-                else:
-                    header = "🟢 Available Now (All Week)"
-            else:
-                header = (
-                    f"🟢 Available Now (until {active_block[1].strftime('%a %I%p')})"
-                )
-        elif current_claim:
+                    return f"🟢 Available Now (until {reset_time_string})"
+                return "🟢 Available Now (All Week)"
+            return f"🟢 Available Now (until {active_block[1].strftime('%a %I%p')})"
+        if current_claim:
             if next_block:
-                header = f"🔴 Busy (Next: {next_block[0].strftime('%a %I%p')})"
-            else:
-                header = f"🔴 Busy until {current_claim['end'].strftime('%a %I%p')}"
-        elif next_block:
-            header = f"🕒 Unavailable (Next: {next_block[0].strftime('%a %I%p')})"
-        else:
-            header = "❌ Not Offered"
-
-        return header, blocks
+                return f"🔴 Busy (Next: {next_block[0].strftime('%a %I%p')})"
+            return f"🔴 Busy until {current_claim['end'].strftime('%a %I%p')}"
+        if next_block:
+            return f"🕒 Unavailable (Next: {next_block[0].strftime('%a %I%p')})"
+        return "❌ Not Offered"
 
     def get_staff_cutoff(self, now: datetime) -> datetime:
         """Calculate the actual cutoff datetime for the current staff parking window."""
@@ -0,0 +1,381 @@
+"""Data-access backends for the hot service queries.
+
+Services talk to a repository instead of building PostgREST queries for the calls
+they make on every command or cache load. Two backends implement the same methods
+and return the same JSON-shaped rows (ISO timestamp strings, string UUIDs):
+
+- ``PostgrestRepository`` goes through the Supabase HTTP client, as before.
+- ``AsyncpgRepository`` uses a direct asyncpg connection pool on ``SUPABASE_DB_URL``.
+  asyncpg prepares and caches every statement per connection, so hot queries skip
+  the HTTP hop and re-planning.
+
+Every call runs through a ``CircuitBreaker``: it has a deadline, reads are retried
+on connection errors, and while the database is down calls fail fast with
+``CircuitOpenError`` so callers keep serving their caches.
+
+Lates writes, meal seeding and scheduled cleanup still use the Supabase client.
+"""
+
+import json
+import logging
+from datetime import date, datetime
+from uuid import UUID
+
+import asyncpg
+
+from bot.config import (
+    DATABASE_CALL_TIMEOUT_SECONDS,
+    DATABASE_CONNECT_TIMEOUT_SECONDS,
+    DATABASE_POOL_IDLE_SECONDS,
+)
+from bot.utils.resilience import CircuitBreaker
+
+logger = logging.getLogger(__name__)
+
+
+class PostgrestRepository:
+    """Repository backed by the Supabase PostgREST client."""
+
+    def __init__(self, supabase, breaker=None):
+        """Use the shared async Supabase client, guarded by ``breaker``."""
+        self.supabase = supabase
+        self.breaker = breaker or CircuitBreaker()
+
+    async def select_all(self, table):
+        """Return every row of a table."""
+        response = await self.breaker.call(
+            lambda: self.supabase.table(table).select("*").execute(), idempotent=True
+        )
+        return response.data or []
+
+    async def select_active(self, table, column, after):
+        """Return rows whose ``column`` is later than the ISO timestamp ``after``."""
+        response = await self.breaker.call(
+            lambda: self.supabase.table(table).select("*").gt(column, after).execute(),
+            idempotent=True,
+        )
+        return response.data or []
+
+    async def select_one(self, table, key_column, key_value, columns="*"):
+        """Return the first row matching ``key_column = key_value``, or None."""
+        response = await self.breaker.call(
+            lambda: self.supabase.table(table)
+            .select(columns)
+            .eq(key_column, key_value)
+            .execute(),
+            idempotent=True,
+        )
+        return response.data[0] if response.data else None
+
+    async def upsert(self, table, row):
+        """Insert or update one row by primary key and return the stored rows."""
+        response = await self.breaker.call(
+            lambda: self.supabase.table(table).upsert(row).execute()
+        )
+        return response.data or []
+
+    async def insert(self, table, rows, ignore_duplicates=False):
+        """Insert rows and return the stored ones.
+
+        With ``ignore_duplicates``, rows whose primary key already exists are skipped.
+        """
+
+        def execute():
+            if ignore_duplicates:
+                query = self.supabase.table(table).upsert(rows, ignore_duplicates=True)
+            else:
+                query = self.supabase.table(table).insert(rows)
+            return query.execute()
+
+        response = await self.breaker.call(execute)
+        return response.data or []
+
+    async def delete_in(self, table, column, values):
+        """Delete rows whose ``column`` is one of ``values`` and return them."""
+        response = await self.breaker.call(
+            lambda: self.supabase.table(table).delete().in_(column, values).execute()
+        )
+        return response.data or []
+
+    async def call(self, function, params):
+        """Run a database function and return its result."""
+        response = await self.breaker.call(
+            lambda: self.supabase.rpc(function, params).execute()
+        )
+        return response.data
+
+    async def offers_overlapping(self, spot_number, start, end):
+        """Return the offer rules on a spot whose span overlaps [start, end)."""
+        response = await self.breaker.call(
+            lambda: self.supabase.table("parking_offers")
+            .select("*")
+            .eq("spot_number", spot_number)
+            .lt("start_time", end)
+            .gt("repeat_until", start)
+            .execute(),
+            idempotent=True,
+        )
+        return response.data or []
+
+    async def active_meal_calendar(self):
+        """Return the active meal calendar with its ``academic_breaks`` list, or None."""
+        response = await self.breaker.call(
+            lambda: self.supabase.table("meal_calendars")
+            .select("*, academic_breaks(*)")
+            .eq("is_active", True)
+            .execute(),
+            idempotent=True,
+        )
+        return response.data[0] if response.data else None
+
+    async def close(self):
+        """Nothing to release; the Supabase client is shared."""
+
+
+def _json_value(value):
+    """Convert an asyncpg value into what PostgREST would have returned for it."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _json_row(record):
+    """Convert an asyncpg record into a PostgREST-shaped dictionary."""
+    return {key: _json_value(value) for key, value in record.items()}
+
+
+def _quote(identifier):
+    """Quote a table, column or function name for interpolation into SQL."""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+class AsyncpgRepository:
+    """Repository backed by a direct asyncpg connection pool."""
+
+    def __init__(self, pool, breaker=None):
+        """Use an open ``asyncpg.Pool``, guarded by ``breaker``; see ``create``."""
+        self.pool = pool
+        self.breaker = breaker or CircuitBreaker()
+        self._signatures = {}
+
+    @classmethod
+    async def create(cls, db_url, min_size, max_size, breaker=None):
+        """Open a connection pool and return a repository using it."""
+        pool = await asyncpg.create_pool(
+            db_url,
+            min_size=min_size,
+            max_size=max_size,
+            timeout=DATABASE_CONNECT_TIMEOUT_SECONDS,
+            command_timeout=DATABASE_CALL_TIMEOUT_SECONDS,
+            max_inactive_connection_lifetime=DATABASE_POOL_IDLE_SECONDS,
+        )
+        return cls(pool, breaker)
+
+    async def select_all(self, table):
+        """Return every row of a table."""
+        rows = await self.breaker.call(
+            lambda: self.pool.fetch(f"SELECT * FROM {_quote(table)}"), idempotent=True
+        )
+        return [_json_row(row) for row in rows]
+
+    async def select_active(self, table, column, after):
+        """Return rows whose ``column`` is later than the ISO timestamp ``after``."""
+        rows = await self.breaker.call(
+            lambda: self.pool.fetch(
+                f"SELECT * FROM {_quote(table)} "
+                f"WHERE {_quote(column)} > $1::text::timestamptz",
+                after,
+            ),
+            idempotent=True,
+        )
+        return [_json_row(row) for row in rows]
+
+    async def select_one(self, table, key_column, key_value, columns="*"):
+        """Return the first row matching ``key_column = key_value``, or None."""
+        selected = (
+            "*"
+            if columns == "*"
+            else ", ".join(_quote(column.strip()) for column in columns.split(","))
+        )
+        row = await self.breaker.call(
+            lambda: self.pool.fetchrow(
+                f"SELECT {selected} FROM {_quote(table)} "
+                f"WHERE {_quote(key_column)}::text = $1 LIMIT 1",
+                str(key_value),
+            ),
+            idempotent=True,
+        )
+        return _json_row(row) if row is not None else None
+
+    async def upsert(self, table, row):
+        """Insert or update one row by primary key and return the stored rows."""
+        return await self.breaker.call(lambda: self._upsert(table, row))
+
+    async def _upsert(self, table, row):
+        async with self.pool.acquire() as conn:
+            key_columns = await conn.fetchval(
+                """
+                SELECT array_agg(a.attname::text ORDER BY a.attnum)
+                FROM pg_index i
+                JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+                WHERE i.indrelid = $1::regclass AND i.indisprimary
+                """,
+                table,
+            )
+            if not key_columns:
+                raise ValueError(f"Cannot upsert into {table}: it has no primary key")
+            # Select exactly the inserted columns, in the same order, so omitted
+            # columns keep their defaults and values land in the right place
+            columns = ", ".join(map(_quote, row))
+            # A key-only row still "updates" its key so RETURNING yields the row,
+            # as PostgREST does
+            updates = [
+                column for column in row if column not in key_columns
+            ] or key_columns
+            action = "DO UPDATE SET " + ", ".join(
+                f"{_quote(c)} = EXCLUDED.{_quote(c)}" for c in updates
+            )
+            stored = await conn.fetch(
+                f"INSERT INTO {_quote(table)} ({columns}) "
+                f"SELECT {columns} "
+                f"FROM json_populate_record(NULL::{_quote(table)}, $1::json) "
+                f"ON CONFLICT ({', '.join(map(_quote, key_columns))}) {action} "
+                "RETURNING *",
+                json.dumps(row),
+            )
+        return [_json_row(record) for record in stored]
+
+    async def insert(self, table, rows, ignore_duplicates=False):
+        """Insert rows and return the stored ones.
+
+        With ``ignore_duplicates``, rows whose primary key already exists are skipped.
+        """
+        rows = [rows] if isinstance(rows, dict) else list(rows)
+        columns = ", ".join(
+            _quote(column)
+            for column in dict.fromkeys(column for row in rows for column in row)
+        )
+        conflict = " ON CONFLICT DO NOTHING" if ignore_duplicates else ""
+        stored = await self.breaker.call(
+            lambda: self.pool.fetch(
+                f"INSERT INTO {_quote(table)} ({columns}) SELECT {columns} "
+                f"FROM json_populate_recordset(NULL::{_quote(table)}, $1::json)"
+                f"{conflict} RETURNING *",
+                json.dumps(rows),
+            )
+        )
+        return [_json_row(record) for record in stored]
+
+    async def delete_in(self, table, column, values):
+        """Delete rows whose ``column`` is one of ``values`` and return them."""
+        deleted = await self.breaker.call(
+            lambda: self.pool.fetch(
+                f"DELETE FROM {_quote(table)} "
+                f"WHERE {_quote(column)}::text = ANY($1::text[]) RETURNING *",
+                [str(value) for value in values],
+            )
+        )
+        return [_json_row(record) for record in deleted]
+
+    async def _signature(self, function):
+        """Return ``({arg: type}, returns_json)`` for a database function, cached.
+
+        Only functions in the ``public`` schema are considered, as with PostgREST,
+        and an overloaded name is rejected rather than guessing which one is meant.
+        """
+        if function not in self._signatures:
+            row = await self.pool.fetchrow(
+                """
+                SELECT
+                    (
+                        SELECT count(*)
+                        FROM pg_proc
+                        WHERE proname = $1 AND pronamespace = 'public'::regnamespace
+                    ) AS overloads,
+                    array_agg(name ORDER BY position) AS names,
+                    array_agg(type ORDER BY position) AS types,
+                    bool_or(returns_json) AS returns_json
+                FROM (
+                    SELECT
+                        unnest(p.proargnames) AS name,
+                        unnest(p.proargtypes::regtype[]::text[]) AS type,
+                        generate_subscripts(p.proargtypes::oid[], 1) AS position,
+                        p.prorettype IN ('json'::regtype, 'jsonb'::regtype) AS returns_json
+                    FROM pg_proc p
+                    WHERE p.proname = $1 AND p.pronamespace = 'public'::regnamespace
+                ) args
+                """,
+                function,
+            )
+            if row["overloads"] > 1:
+                raise ValueError(
+                    f"public.{function} is overloaded; cannot pick its arguments"
+                )
+            self._signatures[function] = (
+                dict(zip(row["names"] or [], row["types"] or [])),
+                bool(row["returns_json"]),
+            )
+        return self._signatures[function]
+
+    async def call(self, function, params):
+        """Run a database function and return its result.
+
+        Arguments are passed as text and cast to the function's own parameter types,
+        so callers send the same ISO strings and ids they send through PostgREST.
+        """
+        return await self.breaker.call(lambda: self._call(function, params))
+
+    async def _call(self, function, params):
+        arg_types, returns_json = await self._signature(function)
+        names = list(params)
+        arguments = ", ".join(
+            f"{_quote(name)} => ${position}::text::{arg_types[name]}"
+            for position, name in enumerate(names, start=1)
+        )
+        result = await self.pool.fetchval(
+            f"SELECT {_quote(function)}({arguments})",
+            *(None if params[name] is None else str(params[name]) for name in names),
+        )
+        if returns_json and isinstance(result, str):
+            return json.loads(result)
+        return result
+
+    async def offers_overlapping(self, spot_number, start, end):
+        """Return the offer rules on a spot whose span overlaps [start, end)."""
+        rows = await self.breaker.call(
+            lambda: self.pool.fetch(
+                "SELECT * FROM parking_offers WHERE spot_number = $1 "
+                "AND start_time < $2::text::timestamptz "
+                "AND repeat_until > $3::text::timestamptz",
+                spot_number,
+                end,
+                start,
+            ),
+            idempotent=True,
+        )
+        return [_json_row(row) for row in rows]
+
+    async def active_meal_calendar(self):
+        """Return the active meal calendar with its ``academic_breaks`` list, or None."""
+        return await self.breaker.call(self._active_meal_calendar, idempotent=True)
+
+    async def _active_meal_calendar(self):
+        async with self.pool.acquire() as conn:
+            calendar = await conn.fetchrow(
+                "SELECT * FROM meal_calendars WHERE is_active LIMIT 1"
+            )
+            if calendar is None:
+                return None
+            breaks = await conn.fetch(
+                "SELECT * FROM academic_breaks WHERE calendar_id = $1", calendar["id"]
+            )
+        return {
+            **_json_row(calendar),
+            "academic_breaks": [_json_row(b) for b in breaks],
+        }
+
+    async def close(self):
+        """Close every pooled connection."""
+        await self.pool.close()
@@ -1,27 +1,27 @@
 import logging
 from datetime import datetime, timezone
 
+from bot.services.repository import PostgrestRepository
+
 logger = logging.getLogger(__name__)
 
 
 class RolesService:
     """Business logic and data access for role selection and directory updates."""
 
-    def __init__(self, supabase):
-        """Store the shared Supabase client."""
+    def __init__(self, supabase, repository=None):
+        """Store the shared Supabase client and the repository for its queries."""
         self.supabase = supabase
+        self.repository = repository or PostgrestRepository(supabase)
 
     async def get_last_update(self, discord_id: int) -> str | None:
         """Fetches the ISO string of the user's last role update."""
         try:
-            res = (
-                await self.supabase.table("residents")
-                .select("last_role_update")
-                .eq("discord_id", str(discord_id))
-                .execute()
+            resident = await self.repository.select_one(
+                "residents", "discord_id", str(discord_id), "last_role_update"
             )
-            if res.data and res.data[0].get("last_role_update"):
-                return res.data[0]["last_role_update"]
+            if resident and resident.get("last_role_update"):
+                return resident["last_role_update"]
             return None
         except Exception as e:
             logger.exception(f"Failed to fetch last role update for {discord_id}: {e}")
@@ -48,9 +48,9 @@ class RolesService:
             payload["email"] = email
 
         try:
-            res = await self.supabase.table("residents").upsert(payload).execute()
+            stored = await self.repository.upsert("residents", payload)
             # If the data list is returned, the upsert was successful
-            return bool(res.data)
+            return bool(stored)
         except Exception as e:
             logger.exception(f"Failed to update resident status for {username}: {e}")
-            return False
\ No newline at end of file
+            return False
@@ -0,0 +1,127 @@
+"""Postgres LISTEN/NOTIFY subscriber that streams row changes into in-memory caches."""
+
+import asyncio
+import json
+import logging
+
+import asyncpg
+
+from bot.config import DATABASE_CONNECT_TIMEOUT_SECONDS
+
+logger = logging.getLogger(__name__)
+
+CHANGE_FEED_CHANNEL = "felipe_changes"
+
+
+class ChangeFeed:
+    """Listen for row-level change notifications and dispatch them per table.
+
+    The triggers in ``docs/sql/05_change_feed.sql`` publish every insert, update and
+    delete on the cached tables. Handlers are plain callables taking
+    ``(table, op, row)``. Notifications sent while the listener was disconnected are
+    lost, so resync callbacks run after every reconnect to reload caches in full.
+    """
+
+    def __init__(self, db_url: str, reconnect_delay: float = 5.0):
+        """Store connection settings; nothing connects until ``start`` is awaited."""
+        self.db_url = db_url
+        self.reconnect_delay = reconnect_delay
+        self._handlers = {}
+        self._resync_callbacks = []
+        self._conn = None
+        self._task = None
+        self._disconnected = None
+
+    @property
+    def connected(self) -> bool:
+        """Return whether notifications are currently being received."""
+        return self._conn is not None and not self._conn.is_closed()
+
+    def subscribe(self, table: str, handler):
+        """Register a handler for changes to one table."""
+        self._handlers.setdefault(table, []).append(handler)
+
+    def add_resync_callback(self, callback):
+        """Register a coroutine function that reloads a cache after a reconnect."""
+        self._resync_callbacks.append(callback)
+
+    def dispatch(self, payload: str):
+        """Decode one notification payload and hand it to the table's handlers."""
+        try:
+            change = json.loads(payload)
+            table, op, row = change["table"], change["op"], change["row"]
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed change notification: %s", payload)
+            return
+
+        for handler in self._handlers.get(table, []):
+            try:
+                handler(table, op, row)
+            except Exception:
+                logger.exception(
+                    "Change feed handler failed", extra={"table": table, "op": op}
+                )
+
+    def _on_notification(self, _conn, _pid, _channel, payload):
+        self.dispatch(payload)
+
+    def _on_termination(self, _conn):
+        if self._disconnected is not None:
+            self._disconnected.set()
+
+    async def _connect(self):
+        """Open the listening connection."""
+        self._disconnected = asyncio.Event()
+        conn = await asyncpg.connect(
+            self.db_url, timeout=DATABASE_CONNECT_TIMEOUT_SECONDS
+        )
+        conn.add_termination_listener(self._on_termination)
+        await conn.add_listener(CHANGE_FEED_CHANNEL, self._on_notification)
+        self._conn = conn
+        logger.info("Change feed listening on %s", CHANGE_FEED_CHANNEL)
+
+    async def _resync(self):
+        """Reload every subscribed cache after notifications may have been missed."""
+        for callback in self._resync_callbacks:
+            try:
+                await callback()
+            except Exception:
+                logger.exception("Change feed resync callback failed")
+
+    async def start(self):
+        """Connect and keep the listener alive in the background.
+
+        Startup never waits on the database: the first connect happens in the same
+        background loop as every reconnect. Caches may load before it succeeds, so
+        the resync callbacks run after the first connect too, and no change falls
+        between the initial load and the first notification.
+        """
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        """Connect, wait for the connection to drop, then reconnect and resync."""
+        first_attempt = True
+        while True:
+            if self.connected:
+                await self._disconnected.wait()
+                logger.warning("Change feed connection lost")
+                self._conn = None
+
+            if not first_attempt:
+                await asyncio.sleep(self.reconnect_delay)
+            first_attempt = False
+            try:
+                await self._connect()
+            except Exception as e:
+                logger.error(f"Change feed connect failed: {e}")
+                continue
+            await self._resync()
+
+    async def stop(self):
+        """Stop listening and close the connection."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._conn is not None and not self._conn.is_closed():
+            await self._conn.close()
+        self._conn = None
@@ -1,57 +1,121 @@
+"""Versioned schema migrations applied from ``docs/sql`` at startup."""
+
+import hashlib
 import logging
 from pathlib import Path
 
 import asyncpg
 
+from bot.config import DATABASE_CONNECT_TIMEOUT_SECONDS
+
 logger = logging.getLogger(__name__)
 
+# This file is in /bot/utils, so the project root is three levels up.
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent.parent / "docs" / "sql"
 
-async def ensure_tables_exist(db_url: str):
-    """
-    Connects directly to PostgreSQL to run schema setup scripts.
-    Reads all .sql files from the docs/sql directory and executes them in order.
-    """
-    # 1. Dynamically find the project root.
-    # This file is in /bot/utils, so we need to go up three levels to get to the root.
-    base_dir = Path(__file__).resolve().parent.parent.parent
-    sql_dir = base_dir / "docs" / "sql"
+# Any fixed key works, as long as every bot instance uses the same one
+MIGRATION_LOCK_KEY = 7_104_233_901
 
-    if not sql_dir.exists():
-        logger.error(f"SQL directory not found at {sql_dir}")
-        return
+CREATE_MIGRATIONS_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    filename TEXT PRIMARY KEY,
+    checksum TEXT NOT NULL,
+    applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+)
+"""
 
-    # 2. Get all .sql files and sort them alphabetically
-    # Sorting is critical so 01_parking.sql runs before 02_meals.sql (prevents foreign key errors)
-    sql_files = sorted(sql_dir.glob("*.sql"))
+SELECT_APPLIED = """
+SELECT filename, checksum FROM schema_migrations WHERE filename = ANY($1::text[])
+"""
 
-    if not sql_files:
-        logger.warning(f"No .sql files found in {sql_dir}")
-        return
+RECORD_APPLIED = """
+INSERT INTO schema_migrations (filename, checksum) VALUES ($1, $2)
+ON CONFLICT (filename) DO UPDATE SET checksum = EXCLUDED.checksum, applied_at = NOW()
+"""
 
+
+def load_migrations(sql_dir=MIGRATIONS_DIR):
+    """Return ``[(filename, checksum, sql_text), ...]`` for every file, in apply order.
+
+    Files are applied in name order, so ``01_parking.sql`` runs before
+    ``02_meals.sql`` and foreign keys resolve.
+    """
+    migrations = []
+    for file_path in sorted(Path(sql_dir).glob("*.sql")):
+        sql_text = file_path.read_text(encoding="utf-8")
+        checksum = hashlib.sha256(sql_text.encode("utf-8")).hexdigest()
+        migrations.append((file_path.name, checksum, sql_text))
+    return migrations
+
+
+async def pending_migrations(conn, migrations):
+    """Return the migrations that are new or whose file changed since it was applied.
+
+    This is a single primary-key lookup. A missing ``schema_migrations`` table means
+    nothing has been recorded yet.
+    """
     try:
-        # Establish a direct, temporary connection to Postgres
-        conn = await asyncpg.connect(db_url)
+        rows = await conn.fetch(SELECT_APPLIED, [name for name, _, _ in migrations])
+    except asyncpg.UndefinedTableError:
+        rows = []
+    applied = {row["filename"]: row["checksum"] for row in rows}
+    return [
+        migration
+        for migration in migrations
+        if applied.get(migration[0]) != migration[1]
+    ]
 
-        # 3. Loop through and execute each file
-        for file_path in sql_files:
-            try:
-                # Read the raw text from the SQL file
-                sql_text = file_path.read_text(encoding="utf-8")
 
-                # Execute the script
+async def apply_migrations(conn, migrations):
+    """Apply migrations one transaction each, recording each file's checksum.
+
+    Schema files are idempotent, so an edited file is simply re-applied. An advisory
+    lock keeps two bot instances booting together from applying the same file twice.
+    Returns the names of the files that were applied.
+    """
+    await conn.execute(CREATE_MIGRATIONS_TABLE)
+    await conn.execute("SELECT pg_advisory_lock($1)", MIGRATION_LOCK_KEY)
+    try:
+        # Another instance may have finished them while this one waited for the lock
+        pending = await pending_migrations(conn, migrations)
+        for filename, checksum, sql_text in pending:
+            async with conn.transaction():
                 await conn.execute(sql_text)
-                logger.info(f"Successfully executed schema file: {file_path.name}")
+                await conn.execute(RECORD_APPLIED, filename, checksum)
+            logger.info(f"Applied schema migration: {filename}")
+        return [filename for filename, _, _ in pending]
+    finally:
+        await conn.execute("SELECT pg_advisory_unlock($1)", MIGRATION_LOCK_KEY)
 
-            except Exception as file_err:
-                logger.error(f"Error executing {file_path.name}: {file_err}")
-                # You might want to 'break' or 'raise' here if a failed file should stop the rest
-                raise
 
-        logger.info("All database schemas verified successfully.")
+async def wait_for_schema(bot):
+    """Wait until the bot's background schema migration has finished, if it runs one."""
+    schema_ready = getattr(bot, "schema_ready", None)
+    if schema_ready is not None:
+        await schema_ready.wait()
 
-    except Exception as e:
-        logger.error(f"Failed to connect and verify database tables: {e}")
 
+async def ensure_tables_exist(db_url: str):
+    """Bring the database schema up to date with the files in ``docs/sql``.
+
+    When nothing changed, startup costs one lookup in ``schema_migrations``.
+    """
+    migrations = load_migrations()
+    if not migrations:
+        logger.warning(f"No .sql files found in {MIGRATIONS_DIR}")
+        return
+
+    conn = None
+    try:
+        conn = await asyncpg.connect(db_url, timeout=DATABASE_CONNECT_TIMEOUT_SECONDS)
+        if not await pending_migrations(conn, migrations):
+            logger.info("Database schema is up to date.")
+            return
+
+        applied = await apply_migrations(conn, migrations)
+        logger.info(f"Database schema migrated ({len(applied)} files applied).")
+    except Exception as e:
+        logger.error(f"Failed to migrate the database schema: {e}")
     finally:
-        if 'conn' in locals():
+        if conn is not None:
             await conn.close()
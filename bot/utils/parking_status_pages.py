@@ -0,0 +1,211 @@
+"""Prebuilt, filterable pages for the ``/parking_status`` embed."""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import timedelta
+
+import discord
+
+from bot.config import (
+    BOT_NAME,
+    DISCORD_EMBED_FIELD_VALUE_LIMIT,
+    DISCORD_MESSAGE_EMBED_LIMIT,
+    DISCORD_MESSAGE_EMBED_TOTAL_CHARACTERS,
+    PARKING_STATUS_FILTER_CACHE_SIZE,
+    PARKING_STATUS_VIEW_TIMEOUT_SECONDS,
+    TRUNCATION_LIMIT,
+    TRUNCATION_SUFFIX,
+)
+from bot.utils.constants import WEEKDAYS
+from bot.utils.snapshot import STALE_NOTICE
+
+RESIDENT_FIELD_NAME = "Resident/Guest Spots (Next 7 Days)"
+BOARD_OVERFLOW_NOTE = " · More spots in /parking_status"
+
+
+def weekdays_touched(windows):
+    """Return the weekdays (Monday=0) that any ``(start, end)`` window falls on."""
+    weekdays = set()
+    for start, end in windows:
+        day = start.date()
+        last_day = (end - timedelta(microseconds=1)).date()
+        while day <= last_day and len(weekdays) < len(WEEKDAYS):
+            weekdays.add(day.weekday())
+            day += timedelta(days=1)
+    return frozenset(weekdays)
+
+
+@dataclass(frozen=True)
+class StatusSection:
+    """One spot's block of status text and the attributes the filters match on.
+
+    Staff sections ignore the spot and guest filters, since residents never pick
+    staff spots by number. ``weekdays`` are the days the spot has free time on.
+    """
+
+    staff: bool
+    spot: int
+    is_guest: bool
+    weekdays: frozenset
+    text: str
+
+
+def _pack(texts):
+    """Join section texts into as few embed field values as fit, never splitting a line."""
+    chunks, current = [], ""
+    for line in "\n".join(texts).strip().split("\n"):
+        if len(line) > DISCORD_EMBED_FIELD_VALUE_LIMIT:
+            line = line[:TRUNCATION_LIMIT] + TRUNCATION_SUFFIX
+        candidate = f"{current}\n{line}" if current else line
+        if len(candidate) > DISCORD_EMBED_FIELD_VALUE_LIMIT:
+            chunks.append(current.strip())
+            candidate = line
+        current = candidate
+    if current.strip():
+        chunks.append(current.strip())
+    return chunks
+
+
+class ParkingStatusPages:
+    """Every ``/parking_status`` page for one detail level and one cache version.
+
+    Sections are rendered once by the cog; unfiltered and filtered page sets are
+    only packed from those sections, and the filtered ones are memoized, so no
+    command ever re-queries or re-renders the lot.
+    """
+
+    def __init__(self, sections, staff_field_name, timestamp, stale=False):
+        """Keep the rendered sections for every spot.
+
+        ``stale`` pages were built from a snapshot and say so in their footer.
+        """
+        self.sections = list(sections)
+        self.staff_field_name = staff_field_name
+        self.timestamp = timestamp
+        self.stale = stale
+        self._pages = OrderedDict()
+
+    def pages(self, spot=None, weekday=None, guest_only=False):
+        """Return the embeds for the sections matching every given filter."""
+        key = (spot, weekday, guest_only)
+        if key in self._pages:
+            self._pages.move_to_end(key)
+            return self._pages[key]
+
+        filtered = key != (None, None, False)
+        resident, staff = [], []
+        for section in self.sections:
+            if weekday is not None and weekday not in section.weekdays:
+                continue
+            if section.staff:
+                # Staff spots have no resident number and are never guest spots
+                if spot is None and not guest_only:
+                    staff.append(section.text)
+            elif (spot is None or section.spot == spot) and (
+                section.is_guest or not guest_only
+            ):
+                resident.append(section.text)
+
+        pages = self._render(_pack(resident), _pack(staff), filtered)
+        self._pages[key] = pages
+        if len(self._pages) > PARKING_STATUS_FILTER_CACHE_SIZE:
+            self._pages.popitem(last=False)
+        return pages
+
+    def _render(self, resident_chunks, staff_chunks, filtered):
+        """Lay field chunks out side by side, one embed per page."""
+        empty_resident = (
+            "No spots match those filters."
+            if filtered
+            else "No spots currently offered."
+        )
+        empty_staff = (
+            "No staff spots match those filters."
+            if filtered
+            else "No staff spots available."
+        )
+        resident_chunks = resident_chunks or [empty_resident]
+        staff_chunks = staff_chunks or [empty_staff]
+        page_count = max(len(resident_chunks), len(staff_chunks))
+
+        embeds = []
+        for page in range(page_count):
+            embed = discord.Embed(
+                title="Parking Status",
+                color=discord.Color.blue(),
+                timestamp=self.timestamp,
+            )
+            if page < len(resident_chunks):
+                embed.add_field(
+                    name=RESIDENT_FIELD_NAME, value=resident_chunks[page], inline=False
+                )
+            if page < len(staff_chunks):
+                embed.add_field(
+                    name=self.staff_field_name, value=staff_chunks[page], inline=False
+                )
+            footer = f"{BOT_NAME} Parking System - Chicago Time"
+            if page_count > 1:
+                footer += f" · Page {page + 1}/{page_count}"
+            if self.stale:
+                footer += f"\n{STALE_NOTICE}"
+            embed.set_footer(text=footer)
+            embeds.append(embed)
+        return embeds
+
+
+def board_embeds(pages):
+    """Return the leading pages that fit in one message, noting any that were left out."""
+    # Leave room for the overflow note on the last embed
+    budget = DISCORD_MESSAGE_EMBED_TOTAL_CHARACTERS - len(BOARD_OVERFLOW_NOTE)
+    embeds, total = [], 0
+    for page in pages[:DISCORD_MESSAGE_EMBED_LIMIT]:
+        total += len(page)
+        if embeds and total > budget:
+            break
+        embeds.append(page)
+
+    if len(embeds) < len(pages):
+        embeds[-1] = embeds[-1].copy()
+        embeds[-1].set_footer(text=embeds[-1].footer.text + BOARD_OVERFLOW_NOTE)
+    return embeds
+
+
+def embed_signature(embeds):
+    """Return comparable content of embeds, ignoring their render timestamps."""
+    signature = []
+    for embed in embeds:
+        data = embed.to_dict()
+        data.pop("timestamp", None)
+        signature.append(data)
+    return signature
+
+
+class ParkingStatusView(discord.ui.View):
+    """Previous/next buttons that flip through prebuilt status pages."""
+
+    def __init__(self, pages):
+        super().__init__(timeout=PARKING_STATUS_VIEW_TIMEOUT_SECONDS)
+        self.pages = pages
+        self.page = 0
+        self._sync_buttons()
+
+    def _sync_buttons(self):
+        self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = self.page == len(self.pages) - 1
+
+    async def _show(self, interaction: discord.Interaction, page):
+        self.page = page
+        self._sync_buttons()
+        await interaction.response.edit_message(embed=self.pages[page], view=self)
+
+    @discord.ui.button(label="◀ Previous", style=discord.ButtonStyle.secondary)
+    async def previous_page(
+        self, interaction: discord.Interaction, _button: discord.ui.Button
+    ):
+        await self._show(interaction, self.page - 1)
+
+    @discord.ui.button(label="Next ▶", style=discord.ButtonStyle.secondary)
+    async def next_page(
+        self, interaction: discord.Interaction, _button: discord.ui.Button
+    ):
+        await self._show(interaction, self.page + 1)
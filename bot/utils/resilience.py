@@ -0,0 +1,155 @@
+"""Supabase client factory, per-call timeouts, retries and a database circuit breaker."""
+
+import asyncio
+import logging
+import random
+import time
+
+import asyncpg
+import httpx
+from supabase import AsyncClient, create_async_client
+from supabase.lib.client_options import AsyncClientOptions
+
+from bot.config import (
+    DATABASE_BREAKER_FAILURE_THRESHOLD,
+    DATABASE_BREAKER_RESET_SECONDS,
+    DATABASE_CALL_TIMEOUT_SECONDS,
+    DATABASE_CONNECT_TIMEOUT_SECONDS,
+    DATABASE_READ_RETRIES,
+    DATABASE_RETRY_BASE_SECONDS,
+    SUPABASE_HTTP_KEEPALIVE_SECONDS,
+    SUPABASE_HTTP_MAX_CONNECTIONS,
+    SUPABASE_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Errors meaning the database could not be reached, as opposed to rejecting a query
+TRANSIENT_ERRORS = (
+    asyncio.TimeoutError,
+    OSError,
+    httpx.TransportError,
+    asyncpg.PostgresConnectionError,
+    asyncpg.InterfaceError,
+)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the database while the circuit breaker is open."""
+
+
+# Everything a guarded call raises when the database is down or too slow
+UNAVAILABLE_ERRORS = (CircuitOpenError, *TRANSIENT_ERRORS)
+
+
+async def create_supabase_client(url, key) -> AsyncClient:
+    """Create the shared Supabase client on a pooled, keep-alive HTTP client.
+
+    The HTTP timeouts are a backstop; ``CircuitBreaker`` enforces the per-call deadline.
+    """
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=SUPABASE_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=SUPABASE_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=SUPABASE_HTTP_KEEPALIVE_SECONDS,
+        ),
+        timeout=httpx.Timeout(
+            DATABASE_CALL_TIMEOUT_SECONDS, connect=DATABASE_CONNECT_TIMEOUT_SECONDS
+        ),
+        follow_redirects=True,
+        http2=True,
+    )
+    return await create_async_client(
+        url, key, options=AsyncClientOptions(httpx_client=http_client)
+    )
+
+
+class CircuitBreaker:
+    """Runs database calls with a deadline and stops calling a database that is down.
+
+    ``failure_threshold`` consecutive connection failures open the circuit, and calls
+    then raise ``CircuitOpenError`` at once so services answer from their caches.
+    After ``reset_seconds`` a single trial call is let through: success closes the
+    circuit, failure keeps it open for another period. Errors the database itself
+    returns (constraint violations, bad input) prove it is reachable and never count.
+    """
+
+    def __init__(
+        self,
+        failure_threshold=DATABASE_BREAKER_FAILURE_THRESHOLD,
+        reset_seconds=DATABASE_BREAKER_RESET_SECONDS,
+        call_timeout=DATABASE_CALL_TIMEOUT_SECONDS,
+        read_retries=DATABASE_READ_RETRIES,
+        retry_base_seconds=DATABASE_RETRY_BASE_SECONDS,
+        clock=time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.call_timeout = call_timeout
+        self.read_retries = read_retries
+        self.retry_base_seconds = retry_base_seconds
+        self.clock = clock
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+
+    @property
+    def is_open(self):
+        """Return whether calls are currently being refused or trialled."""
+        return self.opened_at is not None
+
+    def _allow(self):
+        """Return whether a call may go to the database now."""
+        if self.opened_at is None:
+            return True
+        if self._trial_running or self.clock() - self.opened_at < self.reset_seconds:
+            return False
+        self._trial_running = True
+        return True
+
+    def _record(self, reachable):
+        """Update the circuit after a call that did or did not reach the database."""
+        self._trial_running = False
+        if reachable:
+            if self.opened_at is not None:
+                logger.info("Database reachable again; circuit closed.")
+            self.failures = 0
+            self.opened_at = None
+            return
+
+        self.failures += 1
+        if self.opened_at is None and self.failures >= self.failure_threshold:
+            logger.warning(
+                f"Database unreachable after {self.failures} attempts; "
+                f"failing fast for {self.reset_seconds}s."
+            )
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = self.clock()
+
+    async def call(self, operation, idempotent=False):
+        """Await ``operation()`` under the per-call timeout and return its result.
+
+        ``operation`` is a zero-argument callable returning a fresh awaitable, so
+        idempotent reads can be retried with full-jitter exponential backoff. Writes
+        are never retried: a timed-out write may still have committed.
+        """
+        attempts = 1 + (self.read_retries if idempotent else 0)
+        for attempt in range(attempts):
+            if not self._allow():
+                raise CircuitOpenError("Database circuit is open")
+            try:
+                result = await asyncio.wait_for(operation(), self.call_timeout)
+            except TRANSIENT_ERRORS:
+                self._record(False)
+                if attempt == attempts - 1:
+                    raise
+            except asyncio.CancelledError:
+                self._trial_running = False
+                raise
+            except Exception:
+                self._record(True)
+                raise
+            else:
+                self._record(True)
+                return result
+            await asyncio.sleep(random.uniform(0, self.retry_base_seconds * 2**attempt))
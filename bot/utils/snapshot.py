@@ -0,0 +1,93 @@
+"""Local SQLite snapshots of the service caches, for read-only restarts without a database."""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+
+from bot.config import SNAPSHOT_PATH
+
+logger = logging.getLogger(__name__)
+
+# Shown on read responses served from a snapshot before the first successful sync
+STALE_NOTICE = "⚠️ Possibly stale: showing saved data until the database answers."
+
+CREATE_SNAPSHOTS_TABLE = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    name TEXT PRIMARY KEY,
+    saved_at REAL NOT NULL,
+    data TEXT NOT NULL
+)
+"""
+
+UPSERT_SNAPSHOT = """
+INSERT INTO snapshots (name, saved_at, data) VALUES (?, ?, ?)
+ON CONFLICT (name) DO UPDATE SET saved_at = excluded.saved_at, data = excluded.data
+"""
+
+
+class SnapshotStore:
+    """The last known contents of each cache, as JSON documents keyed by name.
+
+    Services queue a snapshot whenever their cache changes. One background task
+    writes them from a worker thread, and a name queued again before it is written
+    is only serialized once, so a burst of changes costs one write. Snapshots are
+    only a fallback: SQLite errors are logged and never reach the caller.
+    """
+
+    def __init__(self, path=SNAPSHOT_PATH):
+        self.path = Path(path)
+        self._pending = {}
+        self._writer = None
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute(CREATE_SNAPSHOTS_TABLE)
+        return conn
+
+    def load(self, name):
+        """Return the saved document for ``name``, or None when there is none."""
+        try:
+            with closing(self._connect()) as conn:
+                row = conn.execute(
+                    "SELECT data FROM snapshots WHERE name = ?", (name,)
+                ).fetchone()
+            return json.loads(row[0]) if row else None
+        except (sqlite3.Error, ValueError):
+            logger.exception(f"Failed to load the {name} snapshot")
+            return None
+
+    def save(self, name, document):
+        """Write one document now, replacing the previous snapshot of ``name``."""
+        try:
+            self._write(name, json.dumps(document))
+        except (TypeError, ValueError):
+            logger.exception(f"Failed to serialize the {name} snapshot")
+
+    def _write(self, name, data):
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(UPSERT_SNAPSHOT, (name, time.time(), data))
+        except sqlite3.Error:
+            logger.exception(f"Failed to save the {name} snapshot")
+
+    def save_later(self, name, build):
+        """Queue ``build()`` to be saved as ``name`` from a background task."""
+        self._pending[name] = build
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._write_pending())
+
+    async def _write_pending(self):
+        """Write queued snapshots until none are left."""
+        while self._pending:
+            name, build = self._pending.popitem()
+            # Serialize on the event loop, where the cache can't change underneath
+            try:
+                data = json.dumps(build())
+            except Exception:
+                logger.exception(f"Failed to build the {name} snapshot")
+                continue
+            await asyncio.to_thread(self._write, name, data)
@@ -15,9 +15,58 @@ CREATE TABLE IF NOT EXISTS parking_offers (
     end_time TIMESTAMPTZ,
     owner_id TEXT,
     owner_discord_username TEXT,
+    weeks INT NOT NULL DEFAULT 1,
+    skipped_weeks INT[] NOT NULL DEFAULT '{}',
+    repeat_until TIMESTAMPTZ,
     FOREIGN KEY (spot_number) REFERENCES parking_spots(spot_number)
 );
 
+-- Recurring offers are one weekly rule: the first window repeats for `weeks`
+-- consecutive weeks, minus the 0-based `skipped_weeks`, until `repeat_until`.
+ALTER TABLE parking_offers ADD COLUMN IF NOT EXISTS weeks INT NOT NULL DEFAULT 1;
+ALTER TABLE parking_offers ADD COLUMN IF NOT EXISTS skipped_weeks INT[] NOT NULL DEFAULT '{}';
+ALTER TABLE parking_offers ADD COLUMN IF NOT EXISTS repeat_until TIMESTAMPTZ;
+
+-- Offers written without `repeat_until` (the dashboard, or an older bot during a
+-- rollout) get it from their rule: the end of the last week that isn't skipped,
+-- in whole 168-hour weeks, as the bot computes it.
+CREATE OR REPLACE FUNCTION parking_offer_repeat_until(
+    p_end_time TIMESTAMPTZ,
+    p_weeks INT,
+    p_skipped_weeks INT[]
+) RETURNS TIMESTAMPTZ AS $$
+    SELECT p_end_time + make_interval(hours => 168 * COALESCE(
+        (SELECT max(week)
+         FROM generate_series(0, COALESCE(p_weeks, 1) - 1) AS week
+         WHERE week <> ALL(COALESCE(p_skipped_weeks, '{}'))),
+        0
+    ))
+$$ LANGUAGE sql IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION fill_parking_offer_repeat_until() RETURNS trigger AS $$
+BEGIN
+    IF NEW.repeat_until IS NULL THEN
+        NEW.repeat_until := parking_offer_repeat_until(
+            NEW.end_time, NEW.weeks, NEW.skipped_weeks
+        );
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS parking_offers_fill_repeat_until ON parking_offers;
+CREATE TRIGGER parking_offers_fill_repeat_until
+    BEFORE INSERT OR UPDATE ON parking_offers
+    FOR EACH ROW EXECUTE FUNCTION fill_parking_offer_repeat_until();
+
+UPDATE parking_offers
+SET repeat_until = parking_offer_repeat_until(end_time, weeks, skipped_weeks)
+WHERE repeat_until IS NULL;
+
+-- The cache refresh, the overlap query and the claim range all read
+-- `repeat_until`, so it must never be NULL
+ALTER TABLE parking_offers ALTER COLUMN repeat_until SET NOT NULL;
+
 -- Create the parking_reservations table
 CREATE TABLE IF NOT EXISTS parking_reservations (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -0,0 +1,35 @@
+-- Broadcast row-level changes so every bot instance can keep its caches fresh.
+-- Payload: {"table": ..., "op": "INSERT" | "UPDATE" | "DELETE", "row": {...}}
+CREATE OR REPLACE FUNCTION notify_table_change() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify(
+        'felipe_changes',
+        json_build_object(
+            'table', TG_TABLE_NAME,
+            'op', TG_OP,
+            'row', CASE WHEN TG_OP = 'DELETE' THEN row_to_json(OLD) ELSE row_to_json(NEW) END
+        )::text
+    );
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS parking_offers_change_feed ON parking_offers;
+CREATE TRIGGER parking_offers_change_feed
+    AFTER INSERT OR UPDATE OR DELETE ON parking_offers
+    FOR EACH ROW EXECUTE FUNCTION notify_table_change();
+
+DROP TRIGGER IF EXISTS parking_reservations_change_feed ON parking_reservations;
+CREATE TRIGGER parking_reservations_change_feed
+    AFTER INSERT OR UPDATE OR DELETE ON parking_reservations
+    FOR EACH ROW EXECUTE FUNCTION notify_table_change();
+
+DROP TRIGGER IF EXISTS lates_change_feed ON lates;
+CREATE TRIGGER lates_change_feed
+    AFTER INSERT OR UPDATE OR DELETE ON lates
+    FOR EACH ROW EXECUTE FUNCTION notify_table_change();
+
+DROP TRIGGER IF EXISTS meals_change_feed ON meals;
+CREATE TRIGGER meals_change_feed
+    AFTER INSERT OR UPDATE OR DELETE ON meals
+    FOR EACH ROW EXECUTE FUNCTION notify_table_change();
@@ -0,0 +1,72 @@
+-- Atomic, single-round-trip parking claims.
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+-- Two reservations for the same spot may never overlap, even across bot processes.
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conname = 'parking_reservations_no_overlap'
+    ) THEN
+        ALTER TABLE parking_reservations
+            ADD CONSTRAINT parking_reservations_no_overlap
+            EXCLUDE USING gist (spot_number WITH =, tstzrange(start_time, end_time) WITH &&);
+    END IF;
+END;
+$$;
+
+-- Reserve one spot for a window.
+-- Returns {"status": "reserved", "reservation": {...}}
+--      or {"status": "conflict", "reason": "already_reserved" | "not_offered"}.
+-- Guest and staff spots need no offer; every other spot must be covered by one
+-- occurrence of an offer rule. The reservation points at the rule.
+CREATE OR REPLACE FUNCTION claim_parking_spot(
+    p_spot_number INT,
+    p_claimer_id TEXT,
+    p_claimer_username TEXT,
+    p_start TIMESTAMPTZ,
+    p_end TIMESTAMPTZ
+) RETURNS JSONB AS $$
+DECLARE
+    v_spot parking_spots;
+    v_offer_id UUID;
+    v_reservation parking_reservations;
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM parking_reservations
+        WHERE spot_number = p_spot_number
+          AND tstzrange(start_time, end_time) && tstzrange(p_start, p_end)
+    ) THEN
+        RETURN jsonb_build_object('status', 'conflict', 'reason', 'already_reserved');
+    END IF;
+
+    SELECT * INTO v_spot FROM parking_spots WHERE spot_number = p_spot_number;
+
+    IF NOT COALESCE(v_spot.is_guest, FALSE) AND v_spot.spot_type IS DISTINCT FROM 'staff' THEN
+        SELECT o.id INTO v_offer_id
+        FROM parking_offers o
+        CROSS JOIN LATERAL generate_series(0, o.weeks - 1) AS w(week)
+        WHERE o.spot_number = p_spot_number
+          AND tstzrange(o.start_time, o.repeat_until) @> tstzrange(p_start, p_end)
+          AND NOT (w.week = ANY(o.skipped_weeks))
+          AND o.start_time + w.week * INTERVAL '168 hours' <= p_start
+          AND o.end_time + w.week * INTERVAL '168 hours' >= p_end
+        LIMIT 1;
+
+        IF v_offer_id IS NULL THEN
+            RETURN jsonb_build_object('status', 'conflict', 'reason', 'not_offered');
+        END IF;
+    END IF;
+
+    INSERT INTO parking_reservations (
+        spot_number, claimer_id, claimer_discord_username, start_time, end_time, offer_id
+    )
+    VALUES (p_spot_number, p_claimer_id, p_claimer_username, p_start, p_end, v_offer_id)
+    RETURNING * INTO v_reservation;
+
+    RETURN jsonb_build_object('status', 'reserved', 'reservation', to_jsonb(v_reservation));
+EXCEPTION
+    -- A concurrent claim won the race between the check above and the insert
+    WHEN exclusion_violation THEN
+        RETURN jsonb_build_object('status', 'conflict', 'reason', 'already_reserved');
+END;
+$$ LANGUAGE plpgsql;
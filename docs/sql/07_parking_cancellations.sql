@@ -0,0 +1,142 @@
+-- Single-round-trip offer withdrawal.
+-- Withdraw one active offer rule owned by p_owner_id, every remaining week included,
+-- together with the reservations made against it that haven't ended yet.
+-- Reservations that already ended are kept, detached from the deleted offer.
+-- Returns {"status": "withdrawn", "offer": {...}, "reservations": [{...}, ...]}
+--      or {"status": "not_found"}.
+CREATE OR REPLACE FUNCTION withdraw_parking_offer(
+    p_offer_id UUID,
+    p_owner_id TEXT
+) RETURNS JSONB AS $$
+DECLARE
+    v_offer parking_offers;
+    v_reservations JSONB;
+BEGIN
+    SELECT * INTO v_offer
+    FROM parking_offers
+    WHERE id = p_offer_id
+      AND owner_id = p_owner_id
+      AND repeat_until > NOW()
+    FOR UPDATE;
+
+    IF NOT FOUND THEN
+        RETURN jsonb_build_object('status', 'not_found');
+    END IF;
+
+    -- Reservations reference the offer, so they go first
+    WITH deleted AS (
+        DELETE FROM parking_reservations
+        WHERE offer_id = p_offer_id
+          AND end_time > NOW()
+        RETURNING *
+    )
+    SELECT COALESCE(jsonb_agg(to_jsonb(deleted)), '[]'::jsonb) INTO v_reservations
+    FROM deleted;
+
+    UPDATE parking_reservations SET offer_id = NULL WHERE offer_id = p_offer_id;
+
+    DELETE FROM parking_offers WHERE id = p_offer_id;
+
+    RETURN jsonb_build_object(
+        'status', 'withdrawn',
+        'offer', to_jsonb(v_offer),
+        'reservations', v_reservations
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+-- Single-round-trip withdrawal of one week of a recurring offer.
+-- Add zero-based week p_week to the rule's skipped_weeks, provided that week is
+-- still to come, and cancel the reservations made against that week.
+-- Skipping the last remaining week withdraws the whole rule instead.
+-- Returns {"status": "skipped", "offer": {...}, "reservations": [{...}, ...]},
+--         {"status": "withdrawn", ...} as withdraw_parking_offer does,
+--      or {"status": "not_found"}.
+CREATE OR REPLACE FUNCTION skip_parking_offer_week(
+    p_offer_id UUID,
+    p_owner_id TEXT,
+    p_week INT
+) RETURNS JSONB AS $$
+DECLARE
+    v_offer parking_offers;
+    v_skipped INT[];
+    v_start TIMESTAMPTZ;
+    v_end TIMESTAMPTZ;
+    v_reservations JSONB;
+BEGIN
+    SELECT * INTO v_offer
+    FROM parking_offers
+    WHERE id = p_offer_id
+      AND owner_id = p_owner_id
+      AND p_week BETWEEN 0 AND weeks - 1
+      AND NOT (p_week = ANY(skipped_weeks))
+      AND end_time + p_week * INTERVAL '168 hours' > NOW()
+    FOR UPDATE;
+
+    IF NOT FOUND THEN
+        RETURN jsonb_build_object('status', 'not_found');
+    END IF;
+
+    v_skipped := array_append(v_offer.skipped_weeks, p_week);
+    IF NOT EXISTS (
+        SELECT 1 FROM generate_series(0, v_offer.weeks - 1) AS w(week)
+        WHERE NOT (w.week = ANY(v_skipped))
+          AND v_offer.end_time + w.week * INTERVAL '168 hours' > NOW()
+    ) THEN
+        RETURN withdraw_parking_offer(p_offer_id, p_owner_id);
+    END IF;
+
+    v_start := v_offer.start_time + p_week * INTERVAL '168 hours';
+    v_end := v_offer.end_time + p_week * INTERVAL '168 hours';
+
+    -- A reservation sits inside one week's window, so overlapping it is enough
+    WITH deleted AS (
+        DELETE FROM parking_reservations
+        WHERE offer_id = p_offer_id
+          AND tstzrange(start_time, end_time) && tstzrange(v_start, v_end)
+          AND end_time > NOW()
+        RETURNING *
+    )
+    SELECT COALESCE(jsonb_agg(to_jsonb(deleted)), '[]'::jsonb) INTO v_reservations
+    FROM deleted;
+
+    UPDATE parking_offers
+    SET skipped_weeks = v_skipped,
+        repeat_until = parking_offer_repeat_until(end_time, weeks, v_skipped)
+    WHERE id = p_offer_id
+    RETURNING * INTO v_offer;
+
+    RETURN jsonb_build_object(
+        'status', 'skipped',
+        'offer', to_jsonb(v_offer),
+        'reservations', v_reservations
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+-- Single-round-trip reservation cancellation.
+-- Cancel one reservation held by p_claimer_id that hasn't ended yet.
+-- Returns {"status": "cancelled", "reservation": {...}} or {"status": "not_found"}.
+CREATE OR REPLACE FUNCTION cancel_parking_reservation(
+    p_reservation_id UUID,
+    p_claimer_id TEXT
+) RETURNS JSONB AS $$
+DECLARE
+    v_reservation parking_reservations;
+BEGIN
+    DELETE FROM parking_reservations
+    WHERE id = p_reservation_id
+      AND claimer_id = p_claimer_id
+      AND end_time > NOW()
+    RETURNING * INTO v_reservation;
+
+    IF NOT FOUND THEN
+        RETURN jsonb_build_object('status', 'not_found');
+    END IF;
+
+    RETURN jsonb_build_object(
+        'status', 'cancelled',
+        'reservation', to_jsonb(v_reservation)
+    );
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,13 @@
+-- Remember which spot a resident last offered, in one statement.
+-- Clears the user from any spot they held before and assigns them p_spot_number.
+CREATE OR REPLACE FUNCTION set_parking_spot_owner(
+    p_spot_number INT,
+    p_discord_userid TEXT,
+    p_discord_nickname TEXT
+) RETURNS VOID AS $$
+    UPDATE parking_spots
+    SET discord_userid = CASE WHEN spot_number = p_spot_number THEN p_discord_userid END,
+        discord_nickname = CASE WHEN spot_number = p_spot_number THEN p_discord_nickname END
+    WHERE spot_number = p_spot_number
+       OR discord_userid = p_discord_userid;
+$$ LANGUAGE sql;
@@ -0,0 +1,17 @@
+-- Windows residents want a spot for, registered with /watch_parking.
+-- A watch is deleted once it has been matched and its owner messaged.
+CREATE TABLE IF NOT EXISTS parking_watches (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    watcher_id TEXT NOT NULL,
+    watcher_discord_username TEXT,
+    start_time TIMESTAMPTZ NOT NULL,
+    end_time TIMESTAMPTZ NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS parking_watches_end_time_idx ON parking_watches (end_time);
+
+DROP TRIGGER IF EXISTS parking_watches_change_feed ON parking_watches;
+CREATE TRIGGER parking_watches_change_feed
+    AFTER INSERT OR UPDATE OR DELETE ON parking_watches
+    FOR EACH ROW EXECUTE FUNCTION notify_table_change();
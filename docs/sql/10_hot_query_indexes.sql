@@ -0,0 +1,8 @@
+-- Indexes for the filters the bot runs on every cache load and daily cleanup.
+
+-- refresh_parking_cache: active offers (repeat_until > now) and reservations (end_time > now)
+CREATE INDEX IF NOT EXISTS parking_offers_repeat_until_idx ON parking_offers (repeat_until);
+CREATE INDEX IF NOT EXISTS parking_reservations_end_time_idx ON parking_reservations (end_time);
+
+-- Daily lates cleanup: DELETE ... WHERE is_permanent = FALSE [AND day_of_week = ...]
+CREATE INDEX IF NOT EXISTS lates_temporary_day_idx ON lates (day_of_week) WHERE NOT is_permanent;
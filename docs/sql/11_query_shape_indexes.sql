@@ -0,0 +1,66 @@
+-- Indexes shaped after the exact filters the bot sends. Each comment names the query.
+-- The plans have not been captured against a seeded database yet;
+-- scripts/benchmark_indexes.py prints them before and after this file.
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+-- claim_parking_spot: spot_number = $1 AND tstzrange(start_time, repeat_until) @> tstzrange($2, $3)
+-- create_offers:      spot_number = $1 AND start_time < $2 AND repeat_until > $3
+CREATE INDEX IF NOT EXISTS parking_offers_spot_span_gist
+    ON parking_offers USING gist (spot_number, tstzrange(start_time, repeat_until));
+CREATE INDEX IF NOT EXISTS parking_offers_spot_start_idx
+    ON parking_offers (spot_number, start_time) INCLUDE (repeat_until);
+
+-- The reservation overlap check should be served by the GiST index behind
+-- parking_reservations_no_overlap (06_parking_claims.sql).
+
+-- withdraw_parking_offer: owner_id = $2 AND id = $1, then DELETE reservations
+--                         WHERE offer_id = $1 AND end_time > now()
+CREATE INDEX IF NOT EXISTS parking_offers_owner_idx ON parking_offers (owner_id, repeat_until);
+CREATE INDEX IF NOT EXISTS parking_reservations_offer_idx ON parking_reservations (offer_id);
+
+-- cancel_action (claims): claimer_id = $1 AND id = $2 AND end_time > now()
+CREATE INDEX IF NOT EXISTS parking_reservations_claimer_idx
+    ON parking_reservations (claimer_id, end_time);
+
+-- One late per user, day and meal; the index is meant to serve clear_late's
+-- three-column delete as well.
+-- Before the constraint is added, duplicates are resolved by keeping the newest
+-- late: the latest created_at (a missing one counts as oldest), ties broken by
+-- the highest id. Every other copy is moved to lates_duplicates_archive rather
+-- than discarded. Once the constraint exists no duplicates remain, so running
+-- this again moves nothing.
+CREATE TABLE IF NOT EXISTS lates_duplicates_archive (
+    LIKE lates INCLUDING DEFAULTS,
+    archived_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+WITH ranked AS (
+    SELECT
+        id,
+        row_number() OVER (
+            PARTITION BY user_id, day_of_week, meal
+            ORDER BY created_at DESC NULLS LAST, id DESC
+        ) AS position
+    FROM lates
+),
+removed AS (
+    DELETE FROM lates
+    WHERE id IN (SELECT id FROM ranked WHERE position > 1)
+    RETURNING *
+)
+INSERT INTO lates_duplicates_archive (
+    id, user_id, nickname, role, meal, day_of_week, is_permanent, created_at
+)
+SELECT id, user_id, nickname, role, meal, day_of_week, is_permanent, created_at
+FROM removed;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conname = 'lates_user_day_meal_key'
+    ) THEN
+        ALTER TABLE lates
+            ADD CONSTRAINT lates_user_day_meal_key UNIQUE (user_id, day_of_week, meal);
+    END IF;
+END;
+$$;
@@ -0,0 +1,104 @@
+import json
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from bot.utils import change_feed as change_feed_module
+from bot.utils.change_feed import CHANGE_FEED_CHANNEL, ChangeFeed
+
+
+def make_payload(table, op, row):
+    """Encode a change notification the way the database trigger does."""
+    return json.dumps({"table": table, "op": op, "row": row})
+
+
+class ChangeFeedTests(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for change-feed dispatch and connection handling."""
+
+    def test_dispatch_routes_changes_to_table_handlers(self):
+        feed = ChangeFeed("postgresql://unused")
+        lates_handler = MagicMock()
+        meals_handler = MagicMock()
+        feed.subscribe("lates", lates_handler)
+        feed.subscribe("meals", meals_handler)
+
+        feed.dispatch(make_payload("lates", "INSERT", {"id": "late-1"}))
+
+        lates_handler.assert_called_once_with("lates", "INSERT", {"id": "late-1"})
+        meals_handler.assert_not_called()
+
+    def test_dispatch_ignores_malformed_payloads_and_handler_errors(self):
+        feed = ChangeFeed("postgresql://unused")
+        failing = MagicMock(side_effect=RuntimeError("boom"))
+        healthy = MagicMock()
+        feed.subscribe("lates", failing)
+        feed.subscribe("lates", healthy)
+
+        feed.dispatch("not json")
+        feed.dispatch(make_payload("lates", "DELETE", {"id": "late-1"}))
+
+        healthy.assert_called_once_with("lates", "DELETE", {"id": "late-1"})
+
+    async def test_start_listens_on_the_change_channel(self):
+        conn = MagicMock()
+        conn.add_listener = AsyncMock()
+        conn.is_closed.return_value = False
+        conn.close = AsyncMock()
+
+        with patch.object(
+            change_feed_module.asyncpg, "connect", AsyncMock(return_value=conn)
+        ):
+            feed = ChangeFeed("postgresql://unused")
+            await feed.start()
+            # The first connect happens in the background
+            await change_feed_module.asyncio.sleep(0)
+
+        self.assertTrue(feed.connected)
+        conn.add_listener.assert_awaited_once_with(
+            CHANGE_FEED_CHANNEL, feed._on_notification
+        )
+        await feed.stop()
+        conn.close.assert_awaited_once()
+
+    async def test_reconnect_runs_resync_callbacks(self):
+        conn = MagicMock()
+        conn.add_listener = AsyncMock()
+        conn.is_closed.return_value = False
+        resync = AsyncMock()
+
+        feed = ChangeFeed("postgresql://unused", reconnect_delay=0)
+        feed.add_resync_callback(resync)
+        with patch.object(
+            change_feed_module.asyncpg,
+            "connect",
+            AsyncMock(side_effect=[OSError("down"), conn]),
+        ):
+            await feed.start()
+            await change_feed_module.asyncio.sleep(0)
+            self.assertFalse(feed.connected)
+            # Let the background task retry
+            for _ in range(5):
+                await change_feed_module.asyncio.sleep(0)
+
+        self.assertTrue(feed.connected)
+        resync.assert_awaited_once()
+        feed._task.cancel()
+
+    async def test_start_does_not_wait_for_the_database(self):
+        connected = change_feed_module.asyncio.Event()
+
+        async def hang(*_args, **_kwargs):
+            await connected.wait()
+
+        with patch.object(
+            change_feed_module.asyncpg, "connect", AsyncMock(side_effect=hang)
+        ) as connect:
+            feed = ChangeFeed("postgresql://unused")
+            await change_feed_module.asyncio.wait_for(feed.start(), timeout=1)
+            await change_feed_module.asyncio.sleep(0)
+
+        self.assertFalse(feed.connected)
+        connect.assert_awaited_once_with(
+            "postgresql://unused",
+            timeout=change_feed_module.DATABASE_CONNECT_TIMEOUT_SECONDS,
+        )
+        await feed.stop()
@@ -0,0 +1,119 @@
+import hashlib
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, call, patch
+
+import asyncpg
+
+from bot.utils import database
+from bot.utils.database import (
+    MIGRATION_LOCK_KEY,
+    RECORD_APPLIED,
+    apply_migrations,
+    ensure_tables_exist,
+    load_migrations,
+    pending_migrations,
+)
+
+
+def make_connection(applied_rows):
+    """Build an asyncpg connection double whose schema_migrations holds ``applied_rows``."""
+    conn = MagicMock()
+    conn.fetch = AsyncMock(return_value=applied_rows)
+    conn.execute = AsyncMock()
+    conn.close = AsyncMock()
+    conn.transaction.return_value.__aenter__ = AsyncMock()
+    conn.transaction.return_value.__aexit__ = AsyncMock(return_value=False)
+    return conn
+
+
+def checksum(sql_text):
+    return hashlib.sha256(sql_text.encode("utf-8")).hexdigest()
+
+
+class MigrationRunnerTests(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for the versioned schema migration runner."""
+
+    def test_load_migrations_orders_files_and_checksums_contents(self):
+        with tempfile.TemporaryDirectory() as sql_dir:
+            Path(sql_dir, "02_meals.sql").write_text("SELECT 2;", encoding="utf-8")
+            Path(sql_dir, "01_parking.sql").write_text("SELECT 1;", encoding="utf-8")
+
+            migrations = load_migrations(sql_dir)
+
+        self.assertEqual(
+            migrations,
+            [
+                ("01_parking.sql", checksum("SELECT 1;"), "SELECT 1;"),
+                ("02_meals.sql", checksum("SELECT 2;"), "SELECT 2;"),
+            ],
+        )
+
+    async def test_up_to_date_schema_costs_one_lookup(self):
+        migrations = [("01_parking.sql", checksum("SELECT 1;"), "SELECT 1;")]
+        conn = make_connection(
+            [{"filename": "01_parking.sql", "checksum": checksum("SELECT 1;")}]
+        )
+
+        with patch.object(
+            database, "load_migrations", return_value=migrations
+        ), patch.object(database.asyncpg, "connect", AsyncMock(return_value=conn)):
+            await ensure_tables_exist("postgresql://unused")
+
+        conn.fetch.assert_awaited_once()
+        conn.execute.assert_not_awaited()
+        conn.close.assert_awaited_once()
+
+    async def test_new_and_edited_files_are_applied_and_recorded(self):
+        migrations = [
+            ("01_parking.sql", checksum("SELECT 1;"), "SELECT 1;"),
+            ("02_meals.sql", checksum("SELECT 22;"), "SELECT 22;"),
+            ("03_lates.sql", checksum("SELECT 3;"), "SELECT 3;"),
+        ]
+        conn = make_connection(
+            [
+                {"filename": "01_parking.sql", "checksum": checksum("SELECT 1;")},
+                {"filename": "02_meals.sql", "checksum": checksum("SELECT 2;")},
+            ]
+        )
+
+        applied = await apply_migrations(conn, migrations)
+
+        self.assertEqual(applied, ["02_meals.sql", "03_lates.sql"])
+        self.assertEqual(conn.transaction.call_count, 2)
+        conn.execute.assert_has_awaits(
+            [
+                call("SELECT pg_advisory_lock($1)", MIGRATION_LOCK_KEY),
+                call("SELECT 22;"),
+                call(RECORD_APPLIED, "02_meals.sql", checksum("SELECT 22;")),
+                call("SELECT 3;"),
+                call(RECORD_APPLIED, "03_lates.sql", checksum("SELECT 3;")),
+                call("SELECT pg_advisory_unlock($1)", MIGRATION_LOCK_KEY),
+            ]
+        )
+
+    async def test_missing_migrations_table_means_everything_is_pending(self):
+        migrations = [("01_parking.sql", checksum("SELECT 1;"), "SELECT 1;")]
+        conn = make_connection([])
+        conn.fetch.side_effect = asyncpg.UndefinedTableError("missing")
+
+        self.assertEqual(await pending_migrations(conn, migrations), migrations)
+
+    async def test_failed_migration_releases_the_lock(self):
+        migrations = [("01_parking.sql", checksum("SELECT 1;"), "SELECT 1;")]
+        conn = make_connection([])
+
+        async def fail_on_migration(statement, *args):
+            if statement == "SELECT 1;":
+                raise asyncpg.PostgresError("syntax error")
+
+        conn.execute.side_effect = fail_on_migration
+
+        with self.assertRaises(asyncpg.PostgresError):
+            await apply_migrations(conn, migrations)
+
+        self.assertEqual(
+            conn.execute.await_args_list[-1],
+            call("SELECT pg_advisory_unlock($1)", MIGRATION_LOCK_KEY),
+        )
@@ -2,6 +2,8 @@ import unittest
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from postgrest.exceptions import APIError
+
 from bot.cogs import lates as lates_module
 from bot.services.lates_service import LatesService
 
@@ -217,6 +219,22 @@ class LatesServiceTests(unittest.IsolatedAsyncioTestCase):
         # Verify the service triggered a cache refresh after the successful write
         self.service.refresh_lates_cache.assert_awaited_once()
 
+    async def test_create_late_reports_duplicate_rejected_by_database(self):
+        insert_query = make_query([])
+        insert_query.execute.side_effect = APIError(
+            {"code": "23505", "message": "duplicate key value"}
+        )
+        self.supabase.table.return_value = insert_query
+        self.service.refresh_lates_cache = AsyncMock()
+
+        success, reason = await self.service.create_late(
+            77, "Casey", "suttonite", "Tuesday", "Dinner", True
+        )
+
+        self.assertFalse(success)
+        self.assertEqual(reason, "duplicate")
+        self.service.refresh_lates_cache.assert_not_awaited()
+
     async def test_get_visible_lates_uses_house_grouping(self):
         # Pre-populate the memory cache with test data
         self.service.lates_cache = [
@@ -250,3 +268,36 @@ class LatesServiceTests(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(len(rows), 1)
         self.assertEqual(rows[0]["nickname"], "Alice")
         self.assertTrue(rows[0]["is_permanent"])
+
+    async def test_snapshot_is_served_until_the_first_refresh(self):
+        snapshots = MagicMock()
+        snapshots.load.return_value = [{"id": "late-1", "meal": "Lunch"}]
+        service = LatesService(self.supabase, snapshots=snapshots)
+
+        self.assertTrue(service.load_snapshot())
+        self.assertEqual(service.lates_cache, [{"id": "late-1", "meal": "Lunch"}])
+        self.assertFalse(service.synced)
+
+        self.supabase.table.return_value = make_query([{"id": "late-2"}])
+        await service.refresh_lates_cache()
+
+        self.assertTrue(service.synced)
+        self.assertEqual(service.lates_cache, [{"id": "late-2"}])
+        snapshots.save_later.assert_called_once()
+        self.assertEqual(snapshots.save_later.call_args.args[1](), [{"id": "late-2"}])
+
+    def test_apply_change_replaces_and_removes_cached_rows(self):
+        self.service.lates_cache = [
+            {"id": "late-1", "user_id": "1234", "meal": "Lunch"},
+            {"id": "late-2", "user_id": "5678", "meal": "Lunch"},
+        ]
+
+        self.service.apply_change(
+            "lates", "UPDATE", {"id": "late-1", "user_id": "1234", "meal": "Dinner"}
+        )
+        self.service.apply_change("lates", "DELETE", {"id": "late-2"})
+
+        self.assertEqual(
+            self.service.lates_cache,
+            [{"id": "late-1", "user_id": "1234", "meal": "Dinner"}],
+        )
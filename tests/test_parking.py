@@ -1,15 +1,26 @@
 import asyncio
+import tempfile
 import unittest
 import time
 from datetime import datetime, timedelta
+from pathlib import Path
 from types import SimpleNamespace
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, call, patch
 
 import discord
 
 from bot.cogs import parking as parking_module
-from bot.config import LOCAL_TZ, MAXIMUM_RESERVATION_DAYS, MINIMUM_RESERVATION_HOURS
+from bot.config import (
+    LOCAL_TZ,
+    MAXIMUM_RESERVATION_DAYS,
+    MINIMUM_RESERVATION_HOURS,
+    STAFF_SPOTS,
+)
+from bot.services.parking_index import CachedClaim, CachedOffer
 from bot.services.parking_service import ParkingService
+from bot.utils.parking_status_pages import ParkingStatusPages, StatusSection
+from bot.utils.resilience import CircuitOpenError
+from bot.utils.snapshot import STALE_NOTICE, SnapshotStore
 
 
 def make_interaction(user_id=1234, username="TestUser"):
@@ -27,6 +38,36 @@ def make_interaction(user_id=1234, username="TestUser"):
     )
 
 
+def same_availability(summary):
+    """Return a get_lot_availability stand-in giving every spot the same summary."""
+    return lambda now, cutoff, spots, *args, **kwargs: {spot: summary for spot in spots}
+
+
+def status_section(spot, text, weekdays=(), is_guest=False, staff=False):
+    """Build one prebuilt /parking_status section."""
+    return StatusSection(
+        staff=staff,
+        spot=spot,
+        is_guest=is_guest,
+        weekdays=frozenset(weekdays),
+        text=text,
+    )
+
+
+def offer_records(rows):
+    """Convert Supabase-shaped offer rows into the cached records the service returns."""
+    return [
+        CachedOffer.from_row({"id": f"offer-{i}", **row}) for i, row in enumerate(rows)
+    ]
+
+
+def claim_records(rows):
+    """Convert Supabase-shaped reservation rows into cached claim records."""
+    return [
+        CachedClaim.from_row({"id": f"claim-{i}", **row}) for i, row in enumerate(rows)
+    ]
+
+
 def make_query(result):
     """Create a fluent Supabase query mock returning the supplied data."""
     query = MagicMock()
@@ -38,6 +79,8 @@ def make_query(result):
     query.gt.return_value = query
     query.gte.return_value = query
     query.insert.return_value = query
+    query.upsert.return_value = query
+    query.limit.return_value = query
     query.execute = AsyncMock(return_value=SimpleNamespace(data=result))
     return query
 
@@ -60,9 +103,10 @@ class ParkingCogTests(unittest.IsolatedAsyncioTestCase):
         self.service.get_guest_spot_list = AsyncMock()
         self.service.get_cancel_autocomplete_data = AsyncMock(return_value=([], []))
         self.service.get_claim_autocomplete_data = AsyncMock(return_value=([], [], []))
-        self.service.save_offer_spot_preference = AsyncMock(return_value=True)
+        self.service.queue_offer_spot_preference = MagicMock()
         self.service.parse_range = MagicMock()
-        self.service.get_merged_availability = MagicMock()
+        self.service.get_lot_availability = MagicMock()
+        self.service.cache_version = 0
         self.service_cls.return_value = self.service
         self.cog = parking_module.Parking(bot=SimpleNamespace(supabase=MagicMock()))
 
@@ -70,6 +114,20 @@ class ParkingCogTests(unittest.IsolatedAsyncioTestCase):
         await self.cog.initialize_parking_spots()
         self.service.initialize_spots.assert_awaited_once()
 
+    async def test_matched_watches_are_sent_a_dm(self):
+        user = MagicMock(send=AsyncMock())
+        self.cog.bot = SimpleNamespace(get_user=MagicMock(return_value=user))
+        self.service._format_datetime_label = MagicMock(
+            side_effect=["Mon 5 PM", "Mon 8 PM"]
+        )
+        watch = SimpleNamespace(user_id="42")
+
+        await self.cog._send_watch_dms([(watch, 27, object(), object())])
+
+        self.cog.bot.get_user.assert_called_once_with(42)
+        message = user.send.await_args.args[0]
+        self.assertIn("**Spot 27** just opened up Mon 5 PM - Mon 8 PM", message)
+
     async def test_offer_spot_rejects_invalid_spot(self):
         interaction = make_interaction()
 
@@ -107,7 +165,7 @@ class ParkingCogTests(unittest.IsolatedAsyncioTestCase):
         )
 
         interaction.response.defer.assert_awaited_once_with(ephemeral=True)
-        self.service.save_offer_spot_preference.assert_awaited_once_with(
+        self.service.queue_offer_spot_preference.assert_called_once_with(
             1234, "TestUser", 10
         )
         interaction.channel.send.assert_awaited_once_with(
@@ -146,19 +204,16 @@ class ParkingCogTests(unittest.IsolatedAsyncioTestCase):
         )
         self.service.get_claim_autocomplete_data.return_value = (
             [{"spot_number": 46}],
-            [
-                {
-                    "spot_number": 27,
-                    "start_time": "2026-04-02T16:00:00-05:00",
-                    "end_time": "2026-04-05T12:00:00-05:00",
-                },
-                {
-                    "spot_number": 31,
-                    "start_time": "2026-04-02T18:00:00-05:00",
-                    "end_time": "2026-04-05T12:00:00-05:00",
-                },
-            ],
-            [],
+            offer_records(
+                [
+                    {
+                        "spot_number": 27,
+                        "start_time": "2026-04-02T16:00:00-05:00",
+                        "end_time": "2026-04-05T12:00:00-05:00",
+                    },
+                ]
+            ),
+            claim_records([]),
         )
         interaction = make_interaction()
         interaction.namespace = SimpleNamespace(
@@ -188,20 +243,24 @@ class ParkingCogTests(unittest.IsolatedAsyncioTestCase):
         )
         self.service.get_claim_autocomplete_data.return_value = (
             [{"spot_number": 46}],
-            [
-                {
-                    "spot_number": 27,
-                    "start_time": "2026-04-02T16:00:00-05:00",
-                    "end_time": "2026-04-05T12:00:00-05:00",
-                }
-            ],
-            [
-                {
-                    "spot_number": 27,
-                    "start_time": "2026-04-03T10:00:00-05:00",
-                    "end_time": "2026-04-03T12:00:00-05:00",
-                }
-            ],
+            offer_records(
+                [
+                    {
+                        "spot_number": 27,
+                        "start_time": "2026-04-02T16:00:00-05:00",
+                        "end_time": "2026-04-05T12:00:00-05:00",
+                    }
+                ]
+            ),
+            claim_records(
+                [
+                    {
+                        "spot_number": 27,
+                        "start_time": "2026-04-03T10:00:00-05:00",
+                        "end_time": "2026-04-03T12:00:00-05:00",
+                    }
+                ]
+            ),
         )
         interaction = make_interaction()
         interaction.namespace = SimpleNamespace(
@@ -216,23 +275,64 @@ class ParkingCogTests(unittest.IsolatedAsyncioTestCase):
         self.assertEqual([choice.value for choice in choices], [46])
         self.assertEqual([choice.name for choice in choices], ["Spot 46 (Guest)"])
 
+    async def test_claim_spot_autocomplete_reuses_answer_until_cache_changes(self):
+        start = datetime.fromisoformat("2026-04-02T16:00:00-05:00")
+        end = datetime.fromisoformat("2026-04-05T12:00:00-05:00")
+        self.service.parse_range.return_value = (
+            start,
+            end,
+            timedelta(days=2, hours=20),
+        )
+        self.service.get_claim_autocomplete_data.return_value = (
+            [{"spot_number": 46}],
+            [],
+            [],
+        )
+        interaction = make_interaction()
+        interaction.namespace = SimpleNamespace(
+            start_day=SimpleNamespace(value=3),
+            start_time=SimpleNamespace(value="4 PM"),
+            end_day=SimpleNamespace(value=6),
+            end_time=SimpleNamespace(value="12 PM"),
+        )
+
+        first = await self.cog.claim_spot_autocomplete(interaction, "")
+        filtered = await self.cog.claim_spot_autocomplete(interaction, "47")
+
+        self.assertEqual([choice.value for choice in first], [46])
+        self.assertEqual(filtered, [])
+        self.service.parse_range.assert_called_once()
+        self.service.get_claim_autocomplete_data.assert_awaited_once()
+
+        self.service.cache_version += 1
+        self.service.get_claim_autocomplete_data.return_value = ([], [], [])
+
+        refreshed = await self.cog.claim_spot_autocomplete(interaction, "")
+
+        self.assertEqual(refreshed, [])
+        self.assertEqual(self.service.get_claim_autocomplete_data.await_count, 2)
+
     async def test_my_parking_formats_offers_and_claims(self):
         interaction = make_interaction()
         self.service.get_user_activity.return_value = (
-            [
-                {
-                    "spot_number": 10,
-                    "start_time": "2026-04-06T13:00:00-05:00",
-                    "end_time": "2026-04-06T15:00:00-05:00",
-                }
-            ],
-            [
-                {
-                    "spot_number": 998,
-                    "start_time": "2026-04-07T10:00:00-05:00",
-                    "end_time": "2026-04-07T12:00:00-05:00",
-                }
-            ],
+            offer_records(
+                [
+                    {
+                        "spot_number": 10,
+                        "start_time": "2026-04-06T13:00:00-05:00",
+                        "end_time": "2026-04-06T15:00:00-05:00",
+                    }
+                ]
+            ),
+            claim_records(
+                [
+                    {
+                        "spot_number": 998,
+                        "start_time": "2026-04-07T10:00:00-05:00",
+                        "end_time": "2026-04-07T12:00:00-05:00",
+                    }
+                ]
+            ),
         )
 
         await parking_module.Parking.my_parking.callback(self.cog, interaction)
@@ -251,22 +351,26 @@ class ParkingCogTests(unittest.IsolatedAsyncioTestCase):
             datetime_mock.now.return_value = now
 
             self.service.get_parking_data.return_value = (
-                [
-                    {
-                        "spot_number": 10,
-                        "start_time": "2026-04-06T08:00:00-05:00",
-                        "end_time": "2026-04-06T18:00:00-05:00",
-                        "owner_discord_username": "Owner1",
-                    }
-                ],
-                [
-                    {
-                        "spot_number": 998,
-                        "start_time": "2026-04-06T10:00:00-05:00",
-                        "end_time": "2026-04-06T12:00:00-05:00",
-                        "claimer_discord_username": "Claimer1",
-                    }
-                ],
+                offer_records(
+                    [
+                        {
+                            "spot_number": 10,
+                            "start_time": "2026-04-06T08:00:00-05:00",
+                            "end_time": "2026-04-06T18:00:00-05:00",
+                            "owner_discord_username": "Owner1",
+                        }
+                    ]
+                ),
+                claim_records(
+                    [
+                        {
+                            "spot_number": 998,
+                            "start_time": "2026-04-06T10:00:00-05:00",
+                            "end_time": "2026-04-06T12:00:00-05:00",
+                            "claimer_discord_username": "Claimer1",
+                        }
+                    ]
+                ),
                 [46],
             )
 
@@ -275,40 +379,47 @@ class ParkingCogTests(unittest.IsolatedAsyncioTestCase):
                 {"start": now.replace(hour=17), "end": now.replace(hour=23, minute=59)},
             ]
 
-            self.service.get_merged_availability.side_effect = [
-                (
-                    "🟢 Available Now (until Mon 06PM)",
-                    [
-                        (
-                            datetime(2026, 4, 6, 8, 0, tzinfo=tz),
-                            datetime(2026, 4, 6, 18, 0, tzinfo=tz),
-                        )
-                    ],
-                ),
-                (
-                    "🟢 Available Now (until Thu 12PM)",
-                    [
-                        (
-                            datetime(2026, 4, 6, 8, 0, tzinfo=tz),
-                            datetime(2026, 4, 9, 12, 0, tzinfo=tz),
-                        )
-                    ],
-                ),
-                (
-                    "🔴 Busy (Next: Mon 12PM)",
-                    [(now.replace(hour=12), now.replace(hour=17))],
-                ),
-                (
-                    "🟢 Available Now (until Mon 05PM)",
-                    [(now, now.replace(hour=17))],
-                ),
+            self.service.get_lot_availability.side_effect = [
+                {
+                    10: (
+                        "🟢 Available Now (until Mon 06PM)",
+                        [
+                            (
+                                datetime(2026, 4, 6, 8, 0, tzinfo=tz),
+                                datetime(2026, 4, 6, 18, 0, tzinfo=tz),
+                            )
+                        ],
+                    ),
+                    46: (
+                        "🟢 Available Now (until Thu 12PM)",
+                        [
+                            (
+                                datetime(2026, 4, 6, 8, 0, tzinfo=tz),
+                                datetime(2026, 4, 9, 12, 0, tzinfo=tz),
+                            )
+                        ],
+                    ),
+                },
+                {
+                    998: (
+                        "🔴 Busy (Next: Mon 12PM)",
+                        [(now.replace(hour=12), now.replace(hour=17))],
+                    ),
+                    999: (
+                        "🟢 Available Now (until Mon 05PM)",
+                        [(now, now.replace(hour=17))],
+                    ),
+                },
             ]
 
-            # UPDATE: Pass None for detail_level
-            await parking_module.Parking.parking_status.callback(
-                self.cog, interaction, None
+            self.cog._parking_status_pages["default"] = (
+                await self.cog._build_parking_status_pages("default")
             )
 
+        await parking_module.Parking.parking_status.callback(
+            self.cog, interaction, None
+        )
+
         embed = interaction.response.send_message.await_args.kwargs["embed"]
         self.assertIsInstance(embed, discord.Embed)
         self.assertEqual(embed.title, "Parking Status")
@@ -337,13 +448,16 @@ class ParkingCogTests(unittest.IsolatedAsyncioTestCase):
 
             self.service.get_parking_data.return_value = ([], [], [])
             self.service.get_staff_availability_windows.return_value = []
-            self.service.get_merged_availability.return_value = ("❌ Fully Booked", [])
-
-            # UPDATE: Pass None for detail_level
-            await parking_module.Parking.parking_status.callback(
-                self.cog, interaction, None
+            self.service.get_lot_availability.side_effect = same_availability(
+                ("❌ Fully Booked", [])
             )
 
+            await self.cog.refresh_parking_status_pages()
+
+        await parking_module.Parking.parking_status.callback(
+            self.cog, interaction, None
+        )
+
         embed = interaction.response.send_message.await_args.kwargs["embed"]
 
         self.assertEqual(embed.fields[1].name, "Staff Parking (Today)")
@@ -360,28 +474,180 @@ class ParkingCogTests(unittest.IsolatedAsyncioTestCase):
             datetime_mock.now.return_value = now
 
             self.service.get_parking_data.return_value = (
-                [
-                    {
-                        "spot_number": 10,
-                        "start_time": "2026-04-06T08:00:00-05:00",
-                        "end_time": "2026-04-06T18:00:00-05:00",
-                        "owner_discord_username": "Owner1",
-                    }
-                ],
-                [],
+                offer_records(
+                    [
+                        {
+                            "spot_number": 10,
+                            "start_time": "2026-04-06T08:00:00-05:00",
+                            "end_time": "2026-04-06T18:00:00-05:00",
+                            "owner_discord_username": "Owner1",
+                        }
+                    ]
+                ),
+                claim_records([]),
                 [],
             )
-            self.service.get_merged_availability.return_value = ("❌ Not Offered", [])
-
-            # UPDATE: Pass None for detail_level
-            await parking_module.Parking.parking_status.callback(
-                self.cog, interaction, None
+            self.service.get_lot_availability.side_effect = same_availability(
+                ("❌ Not Offered", [])
             )
 
+            await self.cog.refresh_parking_status_pages()
+
+        await parking_module.Parking.parking_status.callback(
+            self.cog, interaction, None
+        )
+
         embed = interaction.response.send_message.await_args.kwargs["embed"]
 
         self.assertNotIn("Spot 10", embed.fields[0].value)
 
+    async def test_parking_status_serves_prebuilt_pages_without_rendering(self):
+        interaction = make_interaction()
+        status = ParkingStatusPages(
+            [status_section(10, "**Spot 10**: 🟢 Available")], "Staff Parking", None
+        )
+        self.cog._parking_status_pages["high"] = status
+
+        await parking_module.Parking.parking_status.callback(
+            self.cog, interaction, SimpleNamespace(value="high")
+        )
+
+        interaction.response.send_message.assert_awaited_once_with(
+            embed=status.pages()[0], ephemeral=True
+        )
+        self.service.get_parking_data.assert_not_awaited()
+
+    async def test_parking_status_paginates_instead_of_truncating(self):
+        interaction = make_interaction()
+        sections = [
+            status_section(spot, f"**Spot {spot}**: 🟢 Available " + "x" * 200)
+            for spot in range(1, 21)
+        ]
+        self.cog._parking_status_pages["default"] = ParkingStatusPages(
+            sections, "Staff Parking (Today)", None
+        )
+
+        await parking_module.Parking.parking_status.callback(
+            self.cog, interaction, None
+        )
+
+        kwargs = interaction.response.send_message.await_args.kwargs
+        view = kwargs["view"]
+        self.assertGreater(len(view.pages), 1)
+        self.assertIs(kwargs["embed"], view.pages[0])
+        shown = "\n".join(page.fields[0].value for page in view.pages)
+        for spot in range(1, 21):
+            self.assertIn(f"**Spot {spot}**:", shown)
+        for page in view.pages:
+            self.assertLessEqual(len(page.fields[0].value), 1024)
+        self.assertNotIn("...", shown)
+
+    async def test_parking_status_filters_reuse_the_prebuilt_sections(self):
+        interaction = make_interaction()
+        self.cog._parking_status_pages["default"] = ParkingStatusPages(
+            [
+                status_section(10, "**Spot 10**: resident", weekdays={0}),
+                status_section(46, "**Spot 46**: guest", weekdays={1}, is_guest=True),
+                status_section(998, "**Spot 1**: staff", weekdays={0}, staff=True),
+            ],
+            "Staff Parking (Today)",
+            None,
+        )
+
+        await parking_module.Parking.parking_status.callback(
+            self.cog, interaction, None, None, SimpleNamespace(value=0)
+        )
+        by_day = interaction.response.send_message.await_args.kwargs["embed"]
+        self.assertEqual(by_day.fields[0].value, "**Spot 10**: resident")
+        self.assertEqual(by_day.fields[1].value, "**Spot 1**: staff")
+
+        await parking_module.Parking.parking_status.callback(
+            self.cog, interaction, None, None, None, True
+        )
+        guests = interaction.response.send_message.await_args.kwargs["embed"]
+        self.assertEqual(guests.fields[0].value, "**Spot 46**: guest")
+        self.assertEqual(guests.fields[1].value, "No staff spots match those filters.")
+
+        await parking_module.Parking.parking_status.callback(
+            self.cog, interaction, None, 27
+        )
+        missing = interaction.response.send_message.await_args.kwargs["embed"]
+        self.assertEqual(missing.fields[0].value, "No spots match those filters.")
+        self.service.get_parking_data.assert_not_awaited()
+
+    async def test_parking_status_reports_loading_before_first_build(self):
+        interaction = make_interaction()
+
+        await parking_module.Parking.parking_status.callback(
+            self.cog, interaction, None
+        )
+
+        self.assertIn(
+            "still loading", interaction.response.send_message.await_args.args[0]
+        )
+        self.service.get_parking_data.assert_not_awaited()
+
+    async def test_parking_status_refresher_rebuilds_after_cache_change(self):
+        rebuilt = asyncio.Event()
+        self.cog.refresh_parking_status_pages = AsyncMock(side_effect=rebuilt.set)
+        task = asyncio.create_task(self.cog._run_parking_status_refresher())
+        self.addCleanup(task.cancel)
+
+        self.cog._parking_status_stale.set()
+        await asyncio.wait_for(rebuilt.wait(), timeout=1)
+
+        self.cog.refresh_parking_status_pages.assert_awaited_once()
+        self.assertFalse(self.cog._parking_status_stale.is_set())
+
+    @patch("bot.cogs.parking.PARKING_BOARD_CHANNEL_ID", 555)
+    async def test_parking_board_posts_once_then_edits_only_on_change(self):
+        board = SimpleNamespace(edit=AsyncMock())
+
+        async def no_history(limit):
+            return
+            yield
+
+        channel = SimpleNamespace(
+            send=AsyncMock(return_value=board), history=no_history
+        )
+        self.cog.bot = SimpleNamespace(
+            get_channel=MagicMock(return_value=channel), user=object()
+        )
+        self.cog._parking_status_pages["default"] = ParkingStatusPages(
+            [status_section(10, "**Spot 10**: 🟢 Available")], "Staff Parking", None
+        )
+
+        await self.cog.update_parking_board()
+        await self.cog.update_parking_board()
+
+        self.cog.bot.get_channel.assert_called_with(555)
+        channel.send.assert_awaited_once()
+        board.edit.assert_not_awaited()
+
+        self.cog._parking_status_pages["default"] = ParkingStatusPages(
+            [status_section(10, "**Spot 10**: 🔴 Busy")], "Staff Parking", None
+        )
+        await self.cog.update_parking_board()
+
+        channel.send.assert_awaited_once()
+        edited = board.edit.await_args.kwargs["embeds"]
+        self.assertEqual(edited[0].fields[0].value, "**Spot 10**: 🔴 Busy")
+
+    @patch("bot.cogs.parking.PARKING_BOARD_DEBOUNCE_SECONDS", 0.05)
+    async def test_parking_board_updater_debounces_bursts(self):
+        updated = asyncio.Event()
+        self.cog.update_parking_board = AsyncMock(side_effect=updated.set)
+        task = asyncio.create_task(self.cog._run_parking_board_updater())
+        self.addCleanup(task.cancel)
+
+        for _ in range(5):
+            self.cog._parking_board_stale.set()
+            await asyncio.sleep(0.005)
+        await asyncio.wait_for(updated.wait(), timeout=1)
+        await asyncio.sleep(0.1)
+
+        self.cog.update_parking_board.assert_awaited_once()
+
     def test_get_merged_availability_shows_all_week(self):
         from datetime import datetime, timedelta
         from unittest.mock import MagicMock
@@ -435,25 +701,82 @@ class ParkingCogTests(unittest.IsolatedAsyncioTestCase):
         )
         interaction.followup.send.assert_awaited_once_with("withdrawn", ephemeral=True)
 
-    async def test_cancel_spot_autocomplete_formats_results(self):
+    async def test_cancel_passes_a_selected_week_to_the_service(self):
+        interaction = make_interaction()
+        self.service.cancel_action.return_value = (True, "withdrawn", None)
+
+        await parking_module.Parking.cancel.callback(
+            self.cog, interaction, "sig_week_offer-1_2"
+        )
+
+        self.service.cancel_action.assert_awaited_once_with(
+            interaction.user.id, "offer", "offer-1", week="2"
+        )
+
+    async def test_cancel_spot_autocomplete_lists_upcoming_weeks_last(self):
+        now = datetime.now(parking_module.LOCAL_TZ)
+        start = (now + timedelta(days=1)).replace(minute=0, second=0, microsecond=0)
         self.service.get_cancel_autocomplete_data.return_value = (
+            offer_records(
+                [
+                    {
+                        "id": "offer-1",
+                        "spot_number": 27,
+                        "start_time": start.isoformat(),
+                        "end_time": (start + timedelta(hours=4)).isoformat(),
+                        "weeks": 3,
+                    }
+                ]
+            ),
+            claim_records(
+                [
+                    {
+                        "id": "claim-1",
+                        "spot_number": 998,
+                        "start_time": start.isoformat(),
+                        "end_time": (start + timedelta(hours=2)).isoformat(),
+                    }
+                ]
+            ),
+        )
+
+        choices = await self.cog.cancel_spot_autocomplete(make_interaction(), "")
+
+        self.assertEqual(
+            [choice.value for choice in choices],
             [
-                {
-                    "id": "offer-1",
-                    "spot_number": 27,
-                    "start_time": "2026-04-02T16:00:00-05:00",
-                    "end_time": "2026-04-05T12:00:00-05:00",
-                }
-            ],
-            [
-                {
-                    "id": "claim-1",
-                    "spot_number": 998,
-                    "start_time": "2026-04-03T10:00:00-05:00",
-                    "end_time": "2026-04-03T12:00:00-05:00",
-                }
+                "sig_offer_offer-1",
+                "sig_claim_claim-1",
+                "sig_week_offer-1_0",
+                "sig_week_offer-1_1",
+                "sig_week_offer-1_2",
             ],
         )
+        self.assertTrue(choices[0].name.endswith("(weekly ×3)"))
+
+    async def test_cancel_spot_autocomplete_formats_results(self):
+        self.service.get_cancel_autocomplete_data.return_value = (
+            offer_records(
+                [
+                    {
+                        "id": "offer-1",
+                        "spot_number": 27,
+                        "start_time": "2026-04-02T16:00:00-05:00",
+                        "end_time": "2026-04-05T12:00:00-05:00",
+                    }
+                ]
+            ),
+            claim_records(
+                [
+                    {
+                        "id": "claim-1",
+                        "spot_number": 998,
+                        "start_time": "2026-04-03T10:00:00-05:00",
+                        "end_time": "2026-04-03T12:00:00-05:00",
+                    }
+                ]
+            ),
+        )
         interaction = make_interaction()
 
         choices = await self.cog.cancel_spot_autocomplete(interaction, "")
@@ -462,6 +785,11 @@ class ParkingCogTests(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(choices[0].value, "sig_offer_offer-1")
         self.assertEqual(choices[1].value, "sig_claim_claim-1")
 
+        interaction = make_interaction()
+        choices = await self.cog.cancel_spot_autocomplete(interaction, "withdraw")
+
+        self.assertEqual([choice.value for choice in choices], ["sig_offer_offer-1"])
+
     async def test_parking_help_sends_guide_embed(self):
         interaction = make_interaction()
         self.service.get_guest_spot_list.return_value = "46"
@@ -476,22 +804,26 @@ class ParkingCogTests(unittest.IsolatedAsyncioTestCase):
         self.assertNotIn("Leave [spot] blank", embed.fields[0].value)
 
     def test_build_offers_claims_db_parses_data(self):
-        raw_offers = [
-            {
-                "spot_number": 5,
-                "start_time": "2026-05-07T15:00:00+00:00",
-                "end_time": "2026-05-07T17:00:00+00:00",
-                "owner_discord_username": "JohnDoe",
-            }
-        ]
-        raw_claims = [
-            {
-                "spot_number": 5,
-                "start_time": "2026-05-07T15:30:00+00:00",
-                "end_time": "2026-05-07T16:30:00+00:00",
-                "claimer_discord_username": "JaneSmith",
-            }
-        ]
+        raw_offers = offer_records(
+            [
+                {
+                    "spot_number": 5,
+                    "start_time": "2026-05-07T15:00:00+00:00",
+                    "end_time": "2026-05-07T17:00:00+00:00",
+                    "owner_discord_username": "JohnDoe",
+                }
+            ]
+        )
+        raw_claims = claim_records(
+            [
+                {
+                    "spot_number": 5,
+                    "start_time": "2026-05-07T15:30:00+00:00",
+                    "end_time": "2026-05-07T16:30:00+00:00",
+                    "claimer_discord_username": "JaneSmith",
+                }
+            ]
+        )
 
         offers_db, claims_db = self.cog._build_offers_claims_db(raw_offers, raw_claims)
 
@@ -509,10 +841,9 @@ class ParkingCogTests(unittest.IsolatedAsyncioTestCase):
         claim_start = now + timedelta(hours=6)
         claim_end = now + timedelta(hours=8)
 
-        self.service.get_merged_availability.return_value = (
-            "🟢 Available",
-            [(block_start, block_end)],
-        )
+        self.service.get_lot_availability.return_value = {
+            5: ("🟢 Available", [(block_start, block_end)])
+        }
 
         # UPDATE 1: Add the owner_id and claimer_id keys
         offers_db = {
@@ -536,11 +867,13 @@ class ParkingCogTests(unittest.IsolatedAsyncioTestCase):
             ]
         }
 
-        lines = self.cog._format_resident_guest_spots(
+        sections = self.cog._format_resident_guest_spots(
             now, resident_cutoff, [5], offers_db, claims_db, [], level="high"
         )
 
-        result_text = "\n".join(lines)
+        self.assertEqual([section.spot for section in sections], [5])
+        self.assertEqual(sections[0].weekdays, {3})
+        result_text = "\n".join(section.text for section in sections)
         self.assertIn("**Spot 5**", result_text)
         self.assertIn("**🟢 Available:**", result_text)
 
@@ -559,16 +892,16 @@ class ParkingCogTests(unittest.IsolatedAsyncioTestCase):
         self.service.get_staff_availability_windows.return_value = [
             {"start": block_start, "end": block_end}
         ]
-        self.service.get_merged_availability.return_value = (
-            "🟢 Available",
-            [(block_start, block_end)],
+        self.service.get_lot_availability.side_effect = same_availability(
+            ("🟢 Available", [(block_start, block_end)])
         )
 
-        lines = self.cog._format_staff_spots(
+        sections = self.cog._format_staff_spots(
             now, effective_staff_cutoff, {}, level="high"
         )
 
-        result_text = "\n".join(lines)
+        self.assertTrue(all(section.staff for section in sections))
+        result_text = "\n".join(section.text for section in sections)
         self.assertIn("**Spot 1 (Staff)**", result_text)
         self.assertIn("🟢 **Available:**", result_text)
         self.assertIn("(Staff Spot)", result_text)
@@ -629,13 +962,21 @@ class ParkingServiceTests(unittest.TestCase):
         table.lt.return_value = table
         table.gt.return_value = table
         table.insert.return_value = table
+
+        start = datetime(2037, 4, 2, 16, 0, tzinfo=parking_module.LOCAL_TZ)
+        end = datetime(2037, 4, 5, 12, 0, tzinfo=parking_module.LOCAL_TZ)
+        inserted_row = {
+            "id": "offer-1",
+            "spot_number": 27,
+            "owner_id": "1234",
+            "owner_discord_username": "TestUser",
+            "start_time": start.isoformat(),
+            "end_time": end.isoformat(),
+        }
         table.execute = AsyncMock(
-            side_effect=[SimpleNamespace(data=[]), SimpleNamespace(data=[{"id": 1}])]
+            side_effect=[SimpleNamespace(data=[]), SimpleNamespace(data=[inserted_row])]
         )
 
-        start = datetime(2026, 4, 2, 16, 0, tzinfo=parking_module.LOCAL_TZ)
-        end = datetime(2026, 4, 5, 12, 0, tzinfo=parking_module.LOCAL_TZ)
-
         success, message = asyncio.run(
             service.create_offers(1234, "TestUser", 27, start, end, 1)
         )
@@ -646,61 +987,160 @@ class ParkingServiceTests(unittest.TestCase):
             "📢 **Spot 27** listed\nStart: Thu Apr 2 at 4:00 PM\nEnd: Sun Apr 5 at 12:00 PM",
         )
 
-        service.refresh_parking_cache.assert_awaited_once()
-
-    def test_claim_staff_spot_rejects_blackout_window(self):
-        service = ParkingService(supabase=MagicMock())
-        service.supabase = MagicMock()
-        start = datetime(2026, 4, 6, 16, 0, tzinfo=parking_module.LOCAL_TZ)
-        end = datetime(2026, 4, 6, 18, 0, tzinfo=parking_module.LOCAL_TZ)
-
-        success, message = asyncio.run(
-            service.claim_staff_spot(1234, "TestUser", start, end)
+        # The inserted row is applied to the cache without a full reload
+        service.refresh_parking_cache.assert_not_awaited()
+        self.assertEqual(
+            service.offers_index.get("offer-1"), CachedOffer.from_row(inserted_row)
         )
 
-        self.assertFalse(success)
-        self.assertIn("Blackout", message)
-        service.supabase.table.assert_not_called()
-
-    def test_claim_staff_spot_uses_second_staff_spot_when_first_is_overlapping(self):
+    def test_create_offers_stores_weeks_as_one_rule_and_lists_skipped_weeks(self):
         service = ParkingService(supabase=MagicMock())
-        query = make_query([{"spot_number": 998}])
-        query.execute.side_effect = [
-            SimpleNamespace(data=[{"spot_number": 998}]),
-            SimpleNamespace(data=[{"id": 1}]),
-        ]
-        service.supabase = MagicMock()
-        service.supabase.table.return_value = query
-        start = datetime(2026, 4, 6, 18, 0, tzinfo=parking_module.LOCAL_TZ)
-        end = datetime(2026, 4, 6, 20, 0, tzinfo=parking_module.LOCAL_TZ)
+        start = LOCAL_TZ.localize(datetime(2037, 4, 2, 16, 0))
+        end = LOCAL_TZ.localize(datetime(2037, 4, 5, 12, 0))
+        # Week 2 is already offered
+        existing = make_query(
+            [
+                {
+                    "id": "offer-0",
+                    "spot_number": 27,
+                    "start_time": (start + timedelta(weeks=1, hours=2)).isoformat(),
+                    "end_time": (end + timedelta(weeks=1)).isoformat(),
+                }
+            ]
+        )
+        insert = make_query([])
+        service.supabase.table.side_effect = [existing, insert]
 
         success, message = asyncio.run(
-            service.claim_staff_spot(1234, "TestUser", start, end)
+            service.create_offers(1234, "TestUser", 27, start, end, 3)
         )
 
         self.assertTrue(success)
-        self.assertIn("Staff Spot reserved", message)
+        existing.execute.assert_awaited_once()
+        existing.lt.assert_called_once_with(
+            "start_time", (end + timedelta(weeks=2)).isoformat()
+        )
+        existing.gt.assert_called_once_with("repeat_until", start.isoformat())
+        insert.insert.assert_called_once_with(
+            {
+                "spot_number": 27,
+                "owner_id": "1234",
+                "owner_discord_username": "TestUser",
+                "start_time": start.isoformat(),
+                "end_time": end.isoformat(),
+                "weeks": 3,
+                "skipped_weeks": [1],
+                "repeat_until": (end + timedelta(weeks=2)).isoformat(),
+            }
+        )
+        self.assertTrue(message.endswith("Skipped (already offered): Thu Apr 9"))
 
-        # Updated to include the new column expectation
-        query.insert.assert_called_once_with(
+    def test_recurring_offer_is_expanded_only_inside_the_query_window(self):
+        service = ParkingService(supabase=MagicMock())
+        start = LOCAL_TZ.localize(datetime(2037, 4, 2, 16, 0))
+        service.offers_index.add(
             {
-                "spot_number": 999,
-                "claimer_id": "1234",
-                "claimer_discord_username": "TestUser",
+                "id": "offer-1",
+                "spot_number": 27,
+                "owner_id": "1234",
+                "start_time": start.isoformat(),
+                "end_time": (start + timedelta(hours=4)).isoformat(),
+                "weeks": 4,
+                "skipped_weeks": [2],
+            }
+        )
+        offer = service.offers_index.get("offer-1")
+
+        self.assertEqual(
+            [window_start.day for window_start, _ in offer.windows()], [2, 9, 23]
+        )
+        self.assertEqual(
+            list(offer.windows(start + timedelta(days=6), start + timedelta(days=8))),
+            [(offer._shift(offer.start, 1), offer._shift(offer.end, 1))],
+        )
+        self.assertEqual(offer.until, offer._shift(offer.end, 3))
+
+        skipped_week = LOCAL_TZ.localize(datetime(2037, 4, 16, 17, 0))
+        self.assertEqual(
+            service.offers_index.covering(
+                skipped_week, skipped_week + timedelta(hours=1), 27
+            ),
+            [],
+        )
+        third_week = LOCAL_TZ.localize(datetime(2037, 4, 23, 17, 0))
+        self.assertEqual(
+            service.offers_index.covering(
+                third_week, third_week + timedelta(hours=1), 27
+            ),
+            [offer],
+        )
+
+    def test_claim_staff_spot_rejects_blackout_window(self):
+        service = ParkingService(supabase=MagicMock())
+        service.supabase = MagicMock()
+        start = datetime(2026, 4, 6, 16, 0, tzinfo=parking_module.LOCAL_TZ)
+        end = datetime(2026, 4, 6, 18, 0, tzinfo=parking_module.LOCAL_TZ)
+
+        success, message = asyncio.run(
+            service.claim_staff_spot(1234, "TestUser", start, end)
+        )
+
+        self.assertFalse(success)
+        self.assertIn("Blackout", message)
+        service.supabase.table.assert_not_called()
+
+    def test_claim_staff_spot_uses_second_staff_spot_when_first_is_overlapping(self):
+        service = ParkingService(supabase=MagicMock())
+        start = datetime(2037, 4, 6, 18, 0, tzinfo=parking_module.LOCAL_TZ)
+        end = datetime(2037, 4, 6, 20, 0, tzinfo=parking_module.LOCAL_TZ)
+        service.claims_index.add(
+            {
+                "id": "claim-0",
+                "spot_number": 998,
+                "claimer_id": "5678",
                 "start_time": start.isoformat(),
                 "end_time": end.isoformat(),
             }
         )
+        reservation = {
+            "id": "claim-1",
+            "spot_number": 999,
+            "claimer_id": "1234",
+            "start_time": start.isoformat(),
+            "end_time": end.isoformat(),
+        }
+        service.supabase.rpc.return_value = make_query(
+            {"status": "reserved", "reservation": reservation}
+        )
+
+        success, message = asyncio.run(
+            service.claim_staff_spot(1234, "TestUser", start, end)
+        )
+
+        self.assertTrue(success)
+        self.assertIn("Staff Spot reserved", message)
+        service.supabase.rpc.assert_called_once_with(
+            "claim_parking_spot",
+            {
+                "p_spot_number": 999,
+                "p_claimer_id": "1234",
+                "p_claimer_username": "TestUser",
+                "p_start": start.isoformat(),
+                "p_end": end.isoformat(),
+            },
+        )
+        service.supabase.table.assert_not_called()
+        self.assertIn("claim-1", service.claims_index)
 
     def test_claim_staff_spot_rejects_overlapping_claim_when_both_staff_spots_are_taken(
         self,
     ):
         service = ParkingService(MagicMock())
-        query = make_query([{"spot_number": 998}, {"spot_number": 999}])
-        service.supabase = MagicMock()
-        service.supabase.table.return_value = query
-        start = datetime(2026, 4, 6, 18, 0, tzinfo=parking_module.LOCAL_TZ)
-        end = datetime(2026, 4, 6, 20, 0, tzinfo=parking_module.LOCAL_TZ)
+        service.supabase.rpc.return_value = make_query(
+            {"status": "conflict", "reason": "already_reserved"}
+        )
+        start = datetime(2037, 4, 6, 18, 0, tzinfo=parking_module.LOCAL_TZ)
+        end = datetime(2037, 4, 6, 20, 0, tzinfo=parking_module.LOCAL_TZ)
 
         success, message = asyncio.run(
             service.claim_staff_spot(1234, "TestUser", start, end)
@@ -708,7 +1148,255 @@ class ParkingServiceTests(unittest.TestCase):
 
         self.assertFalse(success)
         self.assertIn("full", message.lower())
-        query.insert.assert_not_called()
+        # Each staff spot was tried once before giving up
+        self.assertEqual(service.supabase.rpc.call_count, 2)
+
+    @patch("bot.services.parking_service.STAFF_SPOTS", [998, 999, 1000])
+    def test_newly_configured_staff_spot_is_seeded_and_claimable(self):
+        service = ParkingService(supabase=MagicMock())
+        spots = make_query([{"spot_number": 1}])
+        service.supabase.table.return_value = spots
+        start = datetime(2037, 4, 6, 18, 0, tzinfo=parking_module.LOCAL_TZ)
+        end = datetime(2037, 4, 6, 20, 0, tzinfo=parking_module.LOCAL_TZ)
+
+        asyncio.run(service.initialize_spots())
+
+        # A populated table still gets a row for the new staff spot, without
+        # touching the existing ones
+        spots.upsert.assert_called_once_with(
+            [
+                {"spot_number": spot, "spot_type": "staff", "is_guest": False}
+                for spot in (998, 999, 1000)
+            ],
+            ignore_duplicates=True,
+        )
+        spots.insert.assert_not_called()
+
+        for index, spot in enumerate((998, 999)):
+            service.claims_index.add(
+                {
+                    "id": f"claim-{index}",
+                    "spot_number": spot,
+                    "claimer_id": "5678",
+                    "start_time": start.isoformat(),
+                    "end_time": end.isoformat(),
+                }
+            )
+        service.supabase.rpc.return_value = make_query(
+            {
+                "status": "reserved",
+                "reservation": {
+                    "id": "claim-2",
+                    "spot_number": 1000,
+                    "claimer_id": "1234",
+                    "start_time": start.isoformat(),
+                    "end_time": end.isoformat(),
+                },
+            }
+        )
+
+        success, _ = asyncio.run(service.claim_staff_spot(1234, "TestUser", start, end))
+
+        self.assertTrue(success)
+        self.assertEqual(service.supabase.rpc.call_args.args[1]["p_spot_number"], 1000)
+
+    @patch("bot.services.parking_service.STAFF_SPOTS", [997, 998, 999])
+    def test_rank_staff_spots_prefers_tightest_gap(self):
+        service = ParkingService(supabase=MagicMock())
+        start = LOCAL_TZ.localize(datetime(2037, 4, 6, 18, 0))
+        end = start + timedelta(hours=2)
+
+        def claim(row_id, spot, start_offset, end_offset):
+            service.claims_index.add(
+                {
+                    "id": row_id,
+                    "spot_number": spot,
+                    "claimer_id": "5678",
+                    "start_time": (start + timedelta(hours=start_offset)).isoformat(),
+                    "end_time": (start + timedelta(hours=end_offset)).isoformat(),
+                }
+            )
+
+        claim("a", 998, -3, -2)  # 2 hours idle before, open after
+        claim("b", 999, -4, -1)  # 1 hour before and 1 hour after
+        claim("c", 999, 3, 5)
+        claim("d", 997, -6, -5)  # 5 hours before, 4 hours after
+        claim("e", 997, 6, 7)
+
+        self.assertEqual(service._rank_staff_spots(start, end), [999, 997, 998])
+
+        claim("f", 999, 1, 3)  # now overlaps the window
+        self.assertEqual(service._rank_staff_spots(start, end), [997, 998])
+
+    def test_claim_resident_spot_reserves_in_one_database_call(self):
+        service = ParkingService(supabase=MagicMock())
+        start = datetime(2037, 4, 6, 18, 0, tzinfo=parking_module.LOCAL_TZ)
+        end = datetime(2037, 4, 6, 20, 0, tzinfo=parking_module.LOCAL_TZ)
+        reservation = {
+            "id": "claim-1",
+            "spot_number": 27,
+            "claimer_id": "1234",
+            "start_time": start.isoformat(),
+            "end_time": end.isoformat(),
+            "offer_id": "offer-1",
+        }
+        service.offers_index.add(
+            {
+                "id": "offer-1",
+                "spot_number": 27,
+                "owner_id": "5678",
+                "start_time": start.isoformat(),
+                "end_time": end.isoformat(),
+            }
+        )
+        rpc = make_query({"status": "reserved", "reservation": reservation})
+        service.supabase.rpc.return_value = rpc
+
+        success, message = asyncio.run(
+            service.claim_resident_spot(1234, "TestUser", 27, start, end)
+        )
+
+        self.assertTrue(success)
+        self.assertIn("**Spot 27** reserved", message)
+        service.supabase.rpc.assert_called_once_with(
+            "claim_parking_spot",
+            {
+                "p_spot_number": 27,
+                "p_claimer_id": "1234",
+                "p_claimer_username": "TestUser",
+                "p_start": start.isoformat(),
+                "p_end": end.isoformat(),
+            },
+        )
+        rpc.execute.assert_awaited_once()
+        service.supabase.table.assert_not_called()
+        self.assertEqual(
+            service.claims_index.get("claim-1"), CachedClaim.from_row(reservation)
+        )
+
+    def test_claim_resident_spot_maps_conflict_reasons_to_messages(self):
+        service = ParkingService(supabase=MagicMock())
+        start = datetime(2037, 4, 6, 18, 0, tzinfo=parking_module.LOCAL_TZ)
+        end = datetime(2037, 4, 6, 20, 0, tzinfo=parking_module.LOCAL_TZ)
+        # The cache shows an open offer, so the database has the final say
+        service.offers_index.add(
+            {
+                "id": "offer-1",
+                "spot_number": 27,
+                "owner_id": "5678",
+                "start_time": start.isoformat(),
+                "end_time": end.isoformat(),
+            }
+        )
+
+        for reason, expected in [
+            ("already_reserved", "❌ Spot 27 is already reserved."),
+            ("not_offered", "❌ Spot 27 isn't offered for that window."),
+        ]:
+            service.supabase.rpc.return_value = make_query(
+                {"status": "conflict", "reason": reason}
+            )
+
+            success, message = asyncio.run(
+                service.claim_resident_spot(1234, "TestUser", 27, start, end)
+            )
+
+            self.assertFalse(success)
+            self.assertEqual(message, expected)
+        self.assertEqual(len(service.claims_index), 0)
+
+    def test_claim_resident_spot_fails_fast_while_database_circuit_is_open(self):
+        service = ParkingService(supabase=MagicMock())
+        start = datetime(2037, 4, 6, 18, 0, tzinfo=parking_module.LOCAL_TZ)
+        end = datetime(2037, 4, 6, 20, 0, tzinfo=parking_module.LOCAL_TZ)
+        service.guest_spots_cache = {46}
+        service.repository.breaker.opened_at = time.monotonic()
+
+        success, message = asyncio.run(
+            service.claim_resident_spot(1234, "TestUser", 46, start, end)
+        )
+
+        self.assertFalse(success)
+        self.assertIn("temporarily unavailable", message)
+        service.supabase.rpc.assert_not_called()
+
+    def test_claim_resident_spot_rejects_cached_conflicts_without_database_call(self):
+        service = ParkingService(supabase=MagicMock())
+        service.synced = True
+        start = datetime(2037, 4, 6, 18, 0, tzinfo=parking_module.LOCAL_TZ)
+        end = datetime(2037, 4, 6, 20, 0, tzinfo=parking_module.LOCAL_TZ)
+        service.guest_spots_cache = {46}
+        service.claims_index.add(
+            {
+                "id": "claim-1",
+                "spot_number": 46,
+                "claimer_id": "5678",
+                "start_time": start.isoformat(),
+                "end_time": end.isoformat(),
+            }
+        )
+
+        not_offered = asyncio.run(
+            service.claim_resident_spot(1234, "TestUser", 27, start, end)
+        )
+        reserved = asyncio.run(
+            service.claim_resident_spot(1234, "TestUser", 46, start, end)
+        )
+
+        self.assertEqual(
+            not_offered, (False, "❌ Spot 27 isn't offered for that window.")
+        )
+        self.assertEqual(reserved, (False, "❌ Spot 46 is already reserved."))
+        service.supabase.rpc.assert_not_called()
+
+    def test_claim_staff_spot_rejects_when_cache_shows_all_spots_taken(self):
+        from bot.config import STAFF_SPOTS
+
+        service = ParkingService(supabase=MagicMock())
+        start = datetime(2037, 4, 6, 18, 0, tzinfo=parking_module.LOCAL_TZ)
+        end = datetime(2037, 4, 6, 20, 0, tzinfo=parking_module.LOCAL_TZ)
+        for staff_spot in STAFF_SPOTS:
+            service.claims_index.add(
+                {
+                    "id": f"claim-{staff_spot}",
+                    "spot_number": staff_spot,
+                    "claimer_id": "5678",
+                    "start_time": start.isoformat(),
+                    "end_time": end.isoformat(),
+                }
+            )
+
+        service.synced = True
+
+        result = asyncio.run(service.claim_staff_spot(1234, "TestUser", start, end))
+
+        self.assertEqual(result, (False, "❌ Staff spots are full."))
+        service.supabase.table.assert_not_called()
+        service.supabase.rpc.assert_not_called()
+
+    def test_claim_resident_spot_asks_the_database_until_the_cache_is_synced(self):
+        service = ParkingService(supabase=MagicMock())
+        start = datetime(2037, 4, 6, 18, 0, tzinfo=parking_module.LOCAL_TZ)
+        end = datetime(2037, 4, 6, 20, 0, tzinfo=parking_module.LOCAL_TZ)
+        reservation = {
+            "id": "claim-1",
+            "spot_number": 27,
+            "claimer_id": "1234",
+            "start_time": start.isoformat(),
+            "end_time": end.isoformat(),
+        }
+        # The snapshot predates the offer for spot 27, which the database has
+        service.supabase.rpc.return_value = make_query(
+            {"status": "reserved", "reservation": reservation}
+        )
+
+        success, _message = asyncio.run(
+            service.claim_resident_spot(1234, "TestUser", 27, start, end)
+        )
+
+        self.assertTrue(success)
+        self.assertEqual(service.supabase.rpc.call_args.args[0], "claim_parking_spot")
+        self.assertIn("claim-1", service.claims_index)
 
     def test_claim_autocomplete_returns_empty_lists_on_database_error(self):
         """Verify that autocomplete fails gracefully if the database goes down."""
@@ -723,11 +1411,48 @@ class ParkingServiceTests(unittest.TestCase):
         now = datetime(2026, 4, 6, 18, 0, tzinfo=parking_module.LOCAL_TZ)
 
         # 2. Use asyncio.run() since this is a standard synchronous TestCase class
-        payload = asyncio.run(service.get_claim_autocomplete_data(now))
+        payload = asyncio.run(
+            service.get_claim_autocomplete_data(now, now + timedelta(hours=2), now)
+        )
 
         # 3. Verify it caught the error and returned the safe empty fallback
         self.assertEqual(payload, ([], [], []))
 
+    def test_claim_autocomplete_data_only_returns_rows_around_the_window(self):
+        service = ParkingService(supabase=MagicMock())
+        start = datetime(2037, 4, 6, 18, 0, tzinfo=parking_module.LOCAL_TZ)
+        end = start + timedelta(hours=2)
+
+        def window(hours_from_start, length):
+            window_start = start + timedelta(hours=hours_from_start)
+            return {
+                "start_time": window_start.isoformat(),
+                "end_time": (window_start + timedelta(hours=length)).isoformat(),
+            }
+
+        service.offers_index.load(
+            [
+                {"id": "covers", "spot_number": 27, **window(-1, 4)},
+                {"id": "partial", "spot_number": 31, **window(1, 4)},
+                {"id": "later", "spot_number": 33, **window(24, 4)},
+            ]
+        )
+        service.claims_index.load(
+            [
+                {"id": "overlaps", "spot_number": 46, **window(1, 2)},
+                {"id": "earlier", "spot_number": 27, **window(-5, 2)},
+            ]
+        )
+        service.guest_spots_cache = {46}
+
+        guest_spots, offers, claims = asyncio.run(
+            service.get_claim_autocomplete_data(start, end, start)
+        )
+
+        self.assertEqual(guest_spots, [{"spot_number": 46}])
+        self.assertEqual([offer.id for offer in offers], ["covers"])
+        self.assertEqual([claim.id for claim in claims], ["overlaps"])
+
     def test_is_blackout_detects_sunday_morning_blackout_hours(self):
         service = ParkingService(supabase=MagicMock())
         start = datetime(2026, 4, 5, 9, 0, tzinfo=parking_module.LOCAL_TZ)
@@ -735,6 +1460,92 @@ class ParkingServiceTests(unittest.TestCase):
 
         self.assertTrue(service.is_blackout(start, end))
 
+    def test_blackout_bitmap_matches_hourly_scan(self):
+        from bot.config import STAFF_PARKING_BLACKOUTS
+
+        def scan_is_blackout(start, end):
+            curr = start
+            while curr < end:
+                for day, blackout_start, blackout_end in STAFF_PARKING_BLACKOUTS:
+                    in_hours = blackout_start <= curr.hour < blackout_end
+                    if curr.weekday() == day and in_hours:
+                        return True
+                curr += timedelta(hours=1)
+            return False
+
+        def scan_windows(start, end):
+            windows, window_start, curr = [], None, start
+            while curr < end:
+                blocked = scan_is_blackout(curr, curr + timedelta(hours=1))
+                if not blocked and window_start is None:
+                    window_start = curr
+                elif blocked and window_start is not None:
+                    windows.append({"start": window_start, "end": curr})
+                    window_start = None
+                curr += timedelta(hours=1)
+            if window_start is not None:
+                windows.append({"start": window_start, "end": end})
+            return windows
+
+        service = ParkingService(supabase=MagicMock())
+        base = datetime(2026, 4, 5, 0, 0, tzinfo=parking_module.LOCAL_TZ)
+        for start_hour in range(0, 8 * 24, 5):
+            start = base + timedelta(hours=start_hour)
+            for length in (1, 2, 7, 30, 170, 400):
+                for extra_minutes in (0, 30):
+                    end = start + timedelta(hours=length, minutes=extra_minutes)
+                    self.assertEqual(
+                        service.is_blackout(start, end), scan_is_blackout(start, end)
+                    )
+                    self.assertEqual(
+                        service.get_staff_availability_windows(start, end),
+                        scan_windows(start, end),
+                    )
+
+    def test_lot_availability_matches_per_spot_merge(self):
+        import random
+
+        rng = random.Random(7)
+        service = ParkingService(supabase=MagicMock())
+        now = LOCAL_TZ.localize(datetime(2026, 4, 6, 10, 0))
+
+        def window(start_hour, length):
+            start = (now + timedelta(hours=start_hour)).astimezone(LOCAL_TZ)
+            return {"start": start, "end": start + timedelta(hours=length)}
+
+        for cutoff_hours, is_resident in ((168, True), (14, False)):
+            cutoff = now + timedelta(hours=cutoff_hours)
+            spots = list(range(1, 25))
+            guest_spots = [23, 24]
+            offers_db, claims_db = {}, {}
+            for spot in spots:
+                offers_db[spot] = [
+                    window(rng.randint(-30, 170), rng.randint(1, 60))
+                    for _ in range(rng.randint(0, 4))
+                ]
+                claims_db[spot] = sorted(
+                    (
+                        window(rng.randint(-10, 170), rng.randint(1, 20))
+                        for _ in range(rng.randint(0, 3))
+                    ),
+                    key=lambda claim: claim["start"],
+                )
+
+            lot = service.get_lot_availability(
+                now, cutoff, spots, offers_db, claims_db, guest_spots, is_resident
+            )
+
+            for spot in spots:
+                expected = service.get_merged_availability(
+                    now,
+                    cutoff,
+                    offers_db[spot],
+                    claims_db[spot],
+                    is_guest=spot in guest_spots,
+                    is_resident=is_resident,
+                )
+                self.assertEqual(lot[spot], expected, spot)
+
     def test_get_staff_cutoff_calculates_correct_window(self):
         """Verify get_staff_cutoff returns the correct end-of-window datetime."""
         service = ParkingService(supabase=MagicMock())
@@ -767,146 +1578,590 @@ class ParkingServiceTests(unittest.TestCase):
 
     def test_save_offer_spot_preference_updates_user_spot(self):
         service = ParkingService(supabase=MagicMock())
-        query = MagicMock()
-        query.update.return_value = query
-        query.eq.return_value = query
-        query.execute = AsyncMock(
-            return_value=SimpleNamespace(data=[{"spot_number": 27}])
-        )
-        service.supabase = MagicMock()
-        service.supabase.table.return_value = query
+        rpc = make_query(None)
+        service.supabase.rpc.return_value = rpc
 
         saved = asyncio.run(service.save_offer_spot_preference(1234, "TestUser", 27))
 
         self.assertTrue(saved)
-        # Should be called twice for parking_spots
-        self.assertEqual(service.supabase.table.call_count, 2)
-        service.supabase.table.assert_called_with("parking_spots")
+        service.supabase.rpc.assert_called_once_with(
+            "set_parking_spot_owner",
+            {
+                "p_spot_number": 27,
+                "p_discord_userid": "1234",
+                "p_discord_nickname": "TestUser",
+            },
+        )
+        rpc.execute.assert_awaited_once()
+        service.supabase.table.assert_not_called()
+
+    def test_queued_spot_preferences_coalesce_per_user(self):
+        service = ParkingService(supabase=MagicMock())
+        service.save_offer_spot_preference = AsyncMock(return_value=True)
+
+        async def offer_twice():
+            service.queue_offer_spot_preference(1234, "TestUser", 27)
+            service.queue_offer_spot_preference(1234, "TestUser", 28)
+            service.queue_offer_spot_preference(5678, "Other", 30)
+            await service._spot_preference_writer
+
+        asyncio.run(offer_twice())
 
-        # Check first update (clearing old spot)
         self.assertEqual(
-            query.update.call_args_list[0][0][0],
-            {"discord_userid": None, "discord_nickname": None},
+            service.save_offer_spot_preference.await_args_list,
+            [
+                call("1234", "TestUser", 28),
+                call("5678", "Other", 30),
+            ],
         )
-        self.assertEqual(query.eq.call_args_list[0][0], ("discord_userid", "1234"))
 
-        # Check second update (setting new spot)
+    @patch("bot.services.parking_service.SPOT_PREFERENCE_RETRY_SECONDS", 0)
+    def test_queued_spot_preference_is_retried_after_failure(self):
+        service = ParkingService(supabase=MagicMock())
+        service.save_offer_spot_preference = AsyncMock(side_effect=[False, True])
+
+        async def offer():
+            service.queue_offer_spot_preference(1234, "TestUser", 27)
+            await service._spot_preference_writer
+            # Let the retry timer fire, then wait for the write it queues
+            await asyncio.sleep(0)
+            await service._spot_preference_writer
+
+        asyncio.run(offer())
+
+        self.assertEqual(service.save_offer_spot_preference.await_count, 2)
+        self.assertEqual(service._pending_spot_preferences, {})
+        self.assertEqual(service._spot_preference_retries, {})
+
+    def test_failing_spot_preference_does_not_delay_other_users(self):
+        service = ParkingService(supabase=MagicMock())
+        service.save_offer_spot_preference = AsyncMock(side_effect=[False, True])
+
+        async def offer():
+            service.queue_offer_spot_preference(1234, "TestUser", 27)
+            service.queue_offer_spot_preference(5678, "Other", 30)
+            await asyncio.wait_for(service._spot_preference_writer, timeout=1)
+
+        asyncio.run(offer())
+
+        # The second user is written straight away; the first waits on its own timer
         self.assertEqual(
-            query.update.call_args_list[1][0][0],
-            {"discord_userid": "1234", "discord_nickname": "TestUser"},
+            service.save_offer_spot_preference.await_args_list,
+            [call("1234", "TestUser", 27), call("5678", "Other", 30)],
         )
-        self.assertEqual(query.eq.call_args_list[1][0], ("spot_number", 27))
+        self.assertIn("1234", service._spot_preference_retries)
 
-    @patch("bot.services.parking_service.datetime")
-    def test_cancel_action_removes_only_selected_offer_window(self, datetime_mock):
-        real_datetime = datetime
-        current_time = real_datetime(2026, 4, 1, 12, 0, tzinfo=parking_module.LOCAL_TZ)
-        datetime_mock.now.return_value = current_time
-        datetime_mock.strptime.side_effect = lambda *args, **kwargs: (
-            real_datetime.strptime(*args, **kwargs)
+    def test_new_offer_replaces_a_pending_spot_preference_retry(self):
+        service = ParkingService(supabase=MagicMock())
+        service.save_offer_spot_preference = AsyncMock(side_effect=[False, True])
+
+        async def offer_again_after_failure():
+            service.queue_offer_spot_preference(1234, "TestUser", 27)
+            await service._spot_preference_writer
+            retry = service._spot_preference_retries["1234"]
+            service.queue_offer_spot_preference(1234, "TestUser", 28)
+            await service._spot_preference_writer
+            return retry
+
+        retry = asyncio.run(offer_again_after_failure())
+
+        self.assertTrue(retry.cancelled())
+        service.save_offer_spot_preference.assert_awaited_with("1234", "TestUser", 28)
+
+    def test_cancel_action_withdraws_offer_and_its_claims_in_one_call(self):
+        offers = [
+            {
+                "id": "offer-1",
+                "spot_number": 27,
+                "owner_id": "1234",
+                "owner_discord_username": "TestUser",
+                "start_time": "2037-04-02T16:00:00-05:00",
+                "end_time": "2037-04-05T12:00:00-05:00",
+            },
+            {
+                "id": "offer-2",
+                "spot_number": 27,
+                "owner_id": "1234",
+                "owner_discord_username": "TestUser",
+                "start_time": "2037-04-09T16:00:00-05:00",
+                "end_time": "2037-04-12T12:00:00-05:00",
+            },
+        ]
+        claims = [
+            {
+                "id": "claim-1",
+                "spot_number": 27,
+                "claimer_id": "5678",
+                "offer_id": "offer-1",
+                "start_time": "2037-04-03T10:00:00-05:00",
+                "end_time": "2037-04-03T12:00:00-05:00",
+            }
+        ]
+        service = ParkingService(supabase=MagicMock())
+        service.offers_index.load(offers)
+        service.claims_index.load(claims)
+        rpc = make_query(
+            {"status": "withdrawn", "offer": offers[0], "reservations": claims}
         )
-        datetime_mock.fromisoformat.side_effect = lambda *args, **kwargs: (
-            real_datetime.fromisoformat(*args, **kwargs)
-        )
-
-        class FakeResponse:
-            def __init__(self, data):
-                self.data = data
-
-        class FakeTable:
-            def __init__(self, name, store):
-                self.name = name
-                self.store = store
-                self.mode = "select"
-                self.filters = []
-                self.in_filters = []
-
-            def select(self, *_args):
-                self.mode = "select"
-                return self
-
-            def delete(self):
-                self.mode = "delete"
-                return self
-
-            def eq(self, field, value):
-                self.filters.append((field, value))
-                return self
-
-            def gt(self, field, value):
-                self.filters.append((field, ("gt", value)))
-                return self
-
-            async def execute(self):
-                rows = list(self.store[self.name])
-                for field, value in self.filters:
-                    if isinstance(value, tuple) and value[0] == "gt":
-                        rows = [row for row in rows if row[field] > value[1]]
-                    else:
-                        rows = [row for row in rows if row[field] == value]
-
-                if self.mode == "delete":
-                    ids_to_remove = {row["id"] for row in rows}
-                    self.store[self.name] = [
-                        row
-                        for row in self.store[self.name]
-                        if row["id"] not in ids_to_remove
-                    ]
+        service.supabase.rpc.return_value = rpc
 
-                response = FakeResponse(rows)
-                self.mode = "select"
-                self.filters = []
-                self.in_filters = []
-                return response
+        success, message, pings = asyncio.run(
+            service.cancel_action(1234, "offer", "offer-1")
+        )
 
-        class FakeSupabase:
-            def __init__(self, store):
-                self.store = store
+        self.assertTrue(success)
+        self.assertEqual(message, "🔄 Spot 27 offer withdrawn.")
+        self.assertEqual(pings, ["<@5678>"])
+        service.supabase.rpc.assert_called_once_with(
+            "withdraw_parking_offer", {"p_offer_id": "offer-1", "p_owner_id": "1234"}
+        )
+        rpc.execute.assert_awaited_once()
+        service.supabase.table.assert_not_called()
+        self.assertEqual([row.id for row in service.offers_index], ["offer-2"])
+        self.assertEqual(len(service.claims_index), 0)
+
+    def test_cancel_action_withdraws_one_week_of_a_recurring_offer(self):
+        offer = {
+            "id": "offer-1",
+            "spot_number": 27,
+            "owner_id": "1234",
+            "owner_discord_username": "TestUser",
+            "start_time": "2037-04-02T16:00:00-05:00",
+            "end_time": "2037-04-05T12:00:00-05:00",
+            "weeks": 3,
+        }
+        claims = [
+            {
+                "id": "claim-1",
+                "spot_number": 27,
+                "claimer_id": "5678",
+                "offer_id": "offer-1",
+                "start_time": "2037-04-03T10:00:00-05:00",
+                "end_time": "2037-04-03T12:00:00-05:00",
+            },
+            {
+                "id": "claim-2",
+                "spot_number": 27,
+                "claimer_id": "9012",
+                "offer_id": "offer-1",
+                "start_time": "2037-04-10T10:00:00-05:00",
+                "end_time": "2037-04-10T12:00:00-05:00",
+            },
+        ]
+        service = ParkingService(supabase=MagicMock())
+        service.offers_index.add(offer)
+        service.claims_index.load(claims)
+        service.supabase.rpc.return_value = make_query(
+            {
+                "status": "skipped",
+                "offer": {**offer, "skipped_weeks": [1]},
+                "reservations": [claims[1]],
+            }
+        )
 
-            def table(self, name):
-                return FakeTable(name, self.store)
+        success, message, pings = asyncio.run(
+            service.cancel_action(1234, "offer", "offer-1", week="1")
+        )
 
-        store = {
-            "parking_offers": [
-                {
-                    "id": "offer-1",
-                    "spot_number": 27,
-                    "owner_id": "1234",
-                    "owner_discord_username": "TestUser",
-                    "start_time": "2026-04-02T16:00:00-05:00",
-                    "end_time": "2026-04-05T12:00:00-05:00",
-                },
-                {
-                    "id": "offer-2",
-                    "spot_number": 27,
-                    "owner_id": "1234",
-                    "owner_discord_username": "TestUser",
-                    "start_time": "2026-04-02T18:00:00-05:00",
-                    "end_time": "2026-04-05T12:00:00-05:00",
-                },
-                {
-                    "id": "offer-3",
-                    "spot_number": 27,
-                    "owner_id": "1234",
-                    "owner_discord_username": "TestUser",
-                    "start_time": "2026-04-09T16:00:00-05:00",
-                    "end_time": "2026-04-12T12:00:00-05:00",
-                },
-            ],
-            "parking_reservations": [],
+        self.assertTrue(success)
+        self.assertEqual(message, "🔄 Spot 27 offer withdrawn for Thu Apr 9.")
+        self.assertEqual(pings, ["<@9012>"])
+        service.supabase.rpc.assert_called_once_with(
+            "skip_parking_offer_week",
+            {"p_offer_id": "offer-1", "p_owner_id": "1234", "p_week": 1},
+        )
+        # The rule stays cached with the week skipped, and so does the other claim
+        cached = service.offers_index.get("offer-1")
+        self.assertEqual(cached.skipped_weeks, {1})
+        self.assertEqual([row.id for row in service.claims_index], ["claim-1"])
+
+    def test_cancel_action_reports_missing_offer(self):
+        service = ParkingService(supabase=MagicMock())
+        service.supabase.rpc.return_value = make_query({"status": "not_found"})
+
+        result = asyncio.run(service.cancel_action(1234, "offer", "offer-9"))
+
+        self.assertEqual(result, (False, "No matching offers.", None))
+
+    def test_cancel_action_cancels_reservation_in_one_database_call(self):
+        claim = {
+            "id": "claim-1",
+            "spot_number": 27,
+            "claimer_id": "1234",
+            "start_time": "2037-04-03T10:00:00-05:00",
+            "end_time": "2037-04-03T12:00:00-05:00",
         }
+        service = ParkingService(supabase=MagicMock())
+        service.claims_index.add(claim)
+        service.supabase.rpc.return_value = make_query(
+            {"status": "cancelled", "reservation": claim}
+        )
 
-        service = ParkingService(MagicMock())
-        service.supabase = FakeSupabase(store)
+        success, message, pings = asyncio.run(
+            service.cancel_action(1234, "claim", "claim-1")
+        )
 
-        success, _message, pings = asyncio.run(
-            service.cancel_action(1234, "offer", "offer-1")
+        self.assertTrue(success)
+        self.assertEqual(message, "🔄 Reservation for Spot 27 cancelled.")
+        self.assertIsNone(pings)
+        service.supabase.rpc.assert_called_once_with(
+            "cancel_parking_reservation",
+            {"p_reservation_id": "claim-1", "p_claimer_id": "1234"},
+        )
+        service.supabase.table.assert_not_called()
+        self.assertNotIn("claim-1", service.claims_index)
+
+    def test_parking_writes_fail_fast_while_database_circuit_is_open(self):
+        service = ParkingService(supabase=MagicMock())
+        service.repository.breaker.opened_at = time.monotonic()
+        start = datetime(2037, 4, 6, 18, 0, tzinfo=parking_module.LOCAL_TZ)
+        end = start + timedelta(hours=2)
+
+        for success, message in (
+            asyncio.run(service.create_offers(1234, "Owner", 27, start, end, 1)),
+            asyncio.run(service.create_watch(1234, "Owner", start, end)),
+        ):
+            self.assertFalse(success)
+            self.assertIn("temporarily unavailable", message)
+        with self.assertRaises(CircuitOpenError):
+            asyncio.run(service.cancel_action(1234, "claim", "claim-1"))
+        service.supabase.table.assert_not_called()
+        service.supabase.rpc.assert_not_called()
+
+
+class ParkingChangeFeedTests(unittest.TestCase):
+    """Unit tests for applying database change notifications to the parking cache."""
+
+    def setUp(self):
+        self.service = ParkingService(supabase=MagicMock())
+        start = datetime.now(LOCAL_TZ) + timedelta(hours=1)
+        self.row = {
+            "id": "offer-1",
+            "spot_number": 27,
+            "owner_id": "1234",
+            "start_time": start.isoformat(),
+            "end_time": (start + timedelta(hours=2)).isoformat(),
+        }
+
+    def test_insert_and_delete_update_offer_index(self):
+        self.service.apply_change("parking_offers", "INSERT", self.row)
+        self.assertIn("offer-1", self.service.offers_index)
+
+        self.service.apply_change("parking_offers", "DELETE", self.row)
+        self.assertNotIn("offer-1", self.service.offers_index)
+
+    def test_update_to_past_window_drops_cached_claim(self):
+        self.row["claimer_id"] = self.row.pop("owner_id")
+        self.service.apply_change("parking_reservations", "INSERT", self.row)
+
+        expired = dict(self.row, end_time="2020-01-01T00:00:00+00:00")
+        self.service.apply_change("parking_reservations", "UPDATE", expired)
+
+        self.assertNotIn("offer-1", self.service.claims_index)
+
+    def test_every_change_bumps_cache_version(self):
+        self.service.apply_change("parking_offers", "INSERT", self.row)
+        self.service.apply_change("parking_offers", "DELETE", self.row)
+
+        self.assertEqual(self.service.cache_version, 2)
+
+    def test_change_listeners_run_after_each_change(self):
+        listener = MagicMock()
+        self.service.add_change_listener(listener)
+
+        self.service.apply_change("parking_offers", "INSERT", self.row)
+
+        listener.assert_called_once_with()
+
+
+class ParkingCacheExpiryTests(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for evicting parking rows from memory as soon as they lapse."""
+
+    async def test_rows_are_evicted_when_they_end(self):
+        service = ParkingService(supabase=MagicMock())
+        now = datetime.now(LOCAL_TZ)
+        service.apply_change(
+            "parking_offers",
+            "INSERT",
+            {
+                "id": "offer-1",
+                "spot_number": 27,
+                "owner_id": "1234",
+                "start_time": (now - timedelta(hours=1)).isoformat(),
+                "end_time": (now + timedelta(milliseconds=50)).isoformat(),
+            },
+        )
+        version = service.cache_version
+
+        await asyncio.sleep(0.1)
+
+        self.assertNotIn("offer-1", service.offers_index)
+        self.assertEqual(service.cache_version, version + 1)
+
+    async def test_readers_keep_the_armed_timer_until_an_earlier_row_arrives(self):
+        service = ParkingService(supabase=MagicMock())
+        now = datetime.now(LOCAL_TZ)
+
+        def claim(row_id, minutes):
+            return {
+                "id": row_id,
+                "spot_number": 27,
+                "claimer_id": "1234",
+                "start_time": (now - timedelta(hours=1)).isoformat(),
+                "end_time": (now + timedelta(minutes=minutes)).isoformat(),
+            }
+
+        service.apply_change("parking_reservations", "INSERT", claim("claim-1", 60))
+        timer = service._eviction_timer
+
+        for _ in range(3):
+            await service.get_cancel_autocomplete_data("1234", now)
+        service.apply_change("parking_reservations", "INSERT", claim("claim-2", 90))
+
+        self.assertIs(service._eviction_timer, timer)
+
+        service.apply_change("parking_reservations", "INSERT", claim("claim-3", 30))
+
+        self.assertIsNot(service._eviction_timer, timer)
+        self.assertTrue(timer.cancelled())
+        self.assertEqual(
+            service._eviction_deadline, (now + timedelta(minutes=30)).timestamp()
+        )
+        service._eviction_timer.cancel()
+
+    async def test_readers_evict_rows_that_already_ended(self):
+        service = ParkingService(supabase=MagicMock())
+        service.claims_index.add(
+            {
+                "id": "claim-1",
+                "spot_number": 27,
+                "claimer_id": "1234",
+                "start_time": "2020-01-01T10:00:00+00:00",
+                "end_time": "2020-01-01T12:00:00+00:00",
+            }
+        )
+
+        _offers, claims = await service.get_cancel_autocomplete_data(
+            "1234", datetime.now(LOCAL_TZ)
+        )
+
+        self.assertEqual(claims, [])
+        self.assertEqual(len(service.claims_index), 0)
+
+
+class ParkingSnapshotTests(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for restarting from a local snapshot of the parking cache."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.snapshots = SnapshotStore(Path(directory.name) / "snapshot.sqlite3")
+
+    async def test_restart_serves_the_snapshot_until_the_first_sync(self):
+        service = ParkingService(supabase=MagicMock(), snapshots=self.snapshots)
+        service.guest_spots_cache = {46}
+        service.offers_index.add(
+            {
+                "id": "offer-1",
+                "spot_number": 27,
+                "owner_id": "5678",
+                "owner_discord_username": "Owner",
+                "start_time": "2037-04-02T09:00:00-05:00",
+                "end_time": "2037-04-02T17:00:00-05:00",
+                "weeks": 3,
+                "skipped_weeks": [1],
+            }
+        )
+        service.apply_change(
+            "parking_reservations",
+            "INSERT",
+            {
+                "id": "claim-1",
+                "spot_number": 27,
+                "claimer_id": "1234",
+                "start_time": "2037-04-02T10:00:00-05:00",
+                "end_time": "2037-04-02T12:00:00-05:00",
+            },
+        )
+        await asyncio.wait_for(self.snapshots._writer, timeout=5)
+
+        restarted = ParkingService(supabase=MagicMock(), snapshots=self.snapshots)
+        listener = MagicMock()
+        restarted.add_change_listener(listener)
+        with patch.object(self.snapshots, "save_later") as save_later:
+            self.assertTrue(restarted.load_snapshot())
+
+        # Listeners hear about the loaded cache, but it isn't written straight back
+        listener.assert_called_once()
+        save_later.assert_not_called()
+        self.assertFalse(restarted.synced)
+        self.assertEqual(restarted.guest_spots_cache, {46})
+        self.assertEqual(list(restarted.offers_index), list(service.offers_index))
+        self.assertEqual(list(restarted.claims_index), list(service.claims_index))
+
+        restarted.supabase.table.return_value = make_query([])
+        await restarted.refresh_parking_cache()
+        self.assertTrue(restarted.synced)
+        await asyncio.wait_for(self.snapshots._writer, timeout=5)
+        self.assertEqual(self.snapshots.load("parking")["offers"], [])
+
+    def test_stale_pages_say_so_in_their_footer(self):
+        status = ParkingStatusPages(
+            [status_section(27, "**Spot 27**")],
+            staff_field_name="Staff Parking (Today)",
+            timestamp=datetime(2037, 4, 2, 9, tzinfo=LOCAL_TZ),
+            stale=True,
+        )
+
+        self.assertIn(STALE_NOTICE, status.pages()[0].footer.text)
+
+
+class ParkingStartupTests(unittest.IsolatedAsyncioTestCase):
+    """Loading the cog must not wait on the database."""
+
+    async def test_cog_load_returns_while_the_database_hangs(self):
+        hung = asyncio.Event()
+
+        async def hang(*_args, **_kwargs):
+            await hung.wait()
+
+        repository = MagicMock()
+        repository.select_all = AsyncMock(side_effect=hang)
+        repository.select_active = AsyncMock(side_effect=hang)
+        repository.insert = AsyncMock(side_effect=hang)
+        bot = SimpleNamespace(
+            supabase=MagicMock(),
+            repository=repository,
+            schema_ready=asyncio.Event(),
+        )
+        cog = parking_module.Parking(bot=bot)
+
+        await asyncio.wait_for(cog.cog_load(), timeout=1)
+
+        # The first sync waits for migrations, then for the database, in the background
+        self.assertFalse(cog.service.synced)
+        repository.select_all.assert_not_awaited()
+        bot.schema_ready.set()
+        await asyncio.sleep(0)
+        repository.select_all.assert_awaited_once_with("parking_spots")
+        self.assertFalse(cog._initial_sync_task.done())
+        await cog.cog_unload()
+
+
+class ParkingWatchTests(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for matching /watch_parking windows against freed capacity."""
+
+    def setUp(self):
+        self.service = ParkingService(supabase=MagicMock())
+        self.start = datetime.now(LOCAL_TZ).replace(
+            minute=0, second=0, microsecond=0
+        ) + timedelta(days=1)
+        self.matches = []
+        self.service.add_watch_listener(self.matches.extend)
+
+    def add_watch(self, watch_id, watcher_id, start, end):
+        self.service.watches_index.add(
+            {
+                "id": watch_id,
+                "watcher_id": watcher_id,
+                "watcher_discord_username": f"user{watcher_id}",
+                "start_time": start.isoformat(),
+                "end_time": end.isoformat(),
+            }
+        )
+
+    async def test_new_offer_fires_overlapping_watches_once(self):
+        self.add_watch(
+            "hit", "1", self.start + timedelta(hours=2), self.start + timedelta(hours=6)
+        )
+        self.add_watch(
+            "miss",
+            "2",
+            self.start + timedelta(days=2),
+            self.start + timedelta(days=2, hours=2),
+        )
+        self.add_watch("owner", "1234", self.start, self.start + timedelta(hours=2))
+        delete = make_query([])
+        delete.delete.return_value = delete
+        self.service.supabase.table.side_effect = [
+            make_query([]),
+            make_query(
+                [
+                    {
+                        "id": "offer-1",
+                        "spot_number": 27,
+                        "owner_id": "1234",
+                        "start_time": self.start.isoformat(),
+                        "end_time": (self.start + timedelta(hours=4)).isoformat(),
+                    }
+                ]
+            ),
+            delete,
+        ]
+
+        success, _msg = await self.service.create_offers(
+            1234, "Owner", 27, self.start, self.start + timedelta(hours=4), 1
+        )
+
+        self.assertTrue(success)
+        self.assertEqual(
+            [(watch.id, spot) for watch, spot, _start, _end in self.matches],
+            [("hit", 27)],
+        )
+        # The watch delete runs in the background, after the spot lock is released
+        self.assertFalse(self.service._get_mutation_lock_for_spot(27).locked())
+        await asyncio.wait_for(self.service._watch_delete_writer, timeout=5)
+        delete.in_.assert_called_once_with("id", ["hit"])
+        self.assertNotIn("hit", self.service.watches_index)
+        self.assertIn("miss", self.service.watches_index)
+        self.assertIn("owner", self.service.watches_index)
+
+    async def test_cancelled_claim_fires_watches_but_staff_spots_do_not(self):
+        end = self.start + timedelta(hours=3)
+        self.add_watch("watch-1", "1", self.start, end)
+        freed = {
+            "id": "claim-1",
+            "spot_number": 27,
+            "claimer_id": "1234",
+            "start_time": self.start.isoformat(),
+            "end_time": end.isoformat(),
+        }
+
+        self.service._release_capacity(STAFF_SPOTS[0], [(self.start, end)], "1234")
+        self.assertEqual(self.matches, [])
+
+        self.service.supabase.rpc.return_value = make_query(
+            {"status": "cancelled", "reservation": freed}
+        )
+        watch_delete = make_query([])
+        watch_delete.delete.return_value = watch_delete
+        self.service.supabase.table.return_value = watch_delete
+
+        success, _msg, _pings = await self.service.cancel_action(
+            1234, "claim", "claim-1"
         )
 
         self.assertTrue(success)
-        self.assertEqual(pings, [])
-        remaining_ids = [row["id"] for row in store["parking_offers"]]
-        self.assertEqual(remaining_ids, ["offer-2", "offer-3"])
+        self.assertEqual(len(self.matches), 1)
+        watch, spot, start, match_end = self.matches[0]
+        self.assertEqual(
+            (watch.id, spot, start, match_end), ("watch-1", 27, self.start, end)
+        )
+        await asyncio.wait_for(self.service._watch_delete_writer, timeout=5)
+        watch_delete.in_.assert_called_once_with("id", ["watch-1"])
+
+    async def test_windows_shorter_than_a_reservation_do_not_fire_watches(self):
+        now = datetime.now(LOCAL_TZ)
+        self.add_watch("watch-1", "1", now, now + timedelta(hours=3))
+
+        # Only a few minutes of this window are left, too little to claim
+        self.service._release_capacity(
+            27, [(now - timedelta(hours=2), now + timedelta(minutes=10))], "1234"
+        )
+
+        self.assertEqual(self.matches, [])
+        self.assertIn("watch-1", self.service.watches_index)
+        self.assertIsNone(self.service._watch_delete_writer)
 
 
 class FakeQueryBuilder:
@@ -933,6 +2188,9 @@ class FakeSupabaseClient:
     def table(self, _name):
         return FakeQueryBuilder(self.execute_callback)
 
+    def rpc(self, _name, _params):
+        return FakeQueryBuilder(self.execute_callback)
+
 
 class ParkingServiceLockingTests(unittest.IsolatedAsyncioTestCase):
     """Concurrency tests for parking write serialization."""
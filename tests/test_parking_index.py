@@ -0,0 +1,207 @@
+import unittest
+from datetime import datetime, timedelta
+
+from bot.config import LOCAL_TZ, STAFF_SPOTS
+from bot.services.parking_index import (
+    CachedClaim,
+    CachedOffer,
+    CachedWatch,
+    ParkingIndex,
+)
+
+BASE = LOCAL_TZ.localize(datetime(2026, 4, 6, 8, 0))
+
+
+def make_row(row_id, spot, start_hours, end_hours, user="1234"):
+    """Build a Supabase-shaped offer row relative to the shared base time."""
+    return {
+        "id": row_id,
+        "spot_number": spot,
+        "owner_id": user,
+        "start_time": (BASE + timedelta(hours=start_hours)).isoformat(),
+        "end_time": (BASE + timedelta(hours=end_hours)).isoformat(),
+    }
+
+
+def hours(value):
+    """Return the base time shifted by a number of hours."""
+    return BASE + timedelta(hours=value)
+
+
+class ParkingIndexTests(unittest.TestCase):
+    """Unit tests for the per-spot interval index behind the parking cache."""
+
+    def setUp(self):
+        self.index = ParkingIndex(CachedOffer)
+        self.index.load(
+            [
+                make_row("a", 10, 0, 4),
+                make_row("b", 10, 6, 10),
+                make_row("c", 10, 1, 30),
+                make_row("d", 12, 2, 3, user="5678"),
+            ]
+        )
+
+    def test_overlapping_matches_linear_scan(self):
+        rows = list(self.index)
+        for start in range(-2, 32):
+            for length in range(1, 6):
+                expected = sorted(
+                    row.id
+                    for row in rows
+                    if row.start < hours(start + length) and row.end > hours(start)
+                )
+                found = sorted(
+                    row.id
+                    for row in self.index.overlapping(
+                        hours(start), hours(start + length)
+                    )
+                )
+                self.assertEqual(found, expected, (start, length))
+
+    def test_overlapping_compares_instants_not_iso_strings(self):
+        utc_row = make_row("utc", 14, 0, 2)
+        utc_row["start_time"] = "2026-04-06T13:00:00+00:00"  # 8 AM Chicago
+        utc_row["end_time"] = "2026-04-06T15:00:00+00:00"  # 10 AM Chicago
+        self.index.add(utc_row)
+
+        self.assertEqual(
+            [row.id for row in self.index.overlapping(hours(1.5), None, spot=14)],
+            ["utc"],
+        )
+        self.assertEqual(self.index.overlapping(hours(2), None, spot=14), [])
+
+    def test_covering_returns_only_containing_offers(self):
+        self.assertEqual(
+            [row.id for row in self.index.covering(hours(7), hours(9), 10)],
+            ["c", "b"],
+        )
+        self.assertEqual(self.index.covering(hours(2), hours(4), 12), [])
+
+    def test_remove_and_replace_update_every_index(self):
+        self.index.add(make_row("b", 10, 20, 22))
+        self.assertEqual(self.index.remove("d").id, "d")
+        self.assertIsNone(self.index.remove("missing"))
+
+        self.assertEqual(self.index.for_user("5678"), [])
+        self.assertEqual(
+            [row.id for row in self.index.overlapping(hours(6), hours(10))], ["c"]
+        )
+        self.assertEqual(self.index.spots(), [10])
+
+    def test_for_user_orders_by_start_and_skips_finished_rows(self):
+        self.assertEqual(
+            [row.id for row in self.index.for_user("1234")], ["a", "c", "b"]
+        )
+        self.assertEqual(
+            [row.id for row in self.index.for_user(1234, after=hours(5))],
+            ["c", "b"],
+        )
+
+    def test_rows_are_parsed_once_into_local_records(self):
+        utc_row = make_row("utc", 14, 0, 2)
+        utc_row["start_time"] = "2026-04-06T13:00:00+00:00"
+        utc_row["owner_discord_username"] = "Owner1"
+
+        record = self.index.add(utc_row)
+
+        self.assertIsInstance(record, CachedOffer)
+        self.assertEqual(record.start, hours(0))
+        self.assertEqual(record.start.tzinfo.zone, LOCAL_TZ.zone)
+        self.assertEqual((record.spot_number, record.user_id), (14, "1234"))
+        self.assertEqual(record.username, "Owner1")
+        self.assertFalse(hasattr(record, "__dict__"))
+
+    def test_evict_expired_drops_rows_in_end_time_order(self):
+        self.index.add(
+            make_row("b", 10, 6, 40)
+        )  # replaced: stale heap entry for hour 10
+
+        evicted = self.index.evict_expired(hours(10))
+
+        self.assertEqual([row.id for row in evicted], ["d", "a"])
+        self.assertEqual(sorted(row.id for row in self.index), ["b", "c"])
+        self.assertEqual(self.index.next_expiry(), hours(30).timestamp())
+
+    def test_records_render_labels_once(self):
+        offer = self.index.get("a")
+        claim = CachedClaim.from_row(
+            {
+                "id": "claim-1",
+                "spot_number": STAFF_SPOTS[0],
+                "claimer_id": "1234",
+                "start_time": hours(0).isoformat(),
+                "end_time": hours(2).isoformat(),
+            }
+        )
+
+        now = hours(-1)
+
+        self.assertEqual(
+            offer.cancel_label(now),
+            "Withdraw: Spot 10 Mon Apr 6 08:00 AM - Mon Apr 6 12:00 PM",
+        )
+        self.assertIs(offer.cancel_label(now), offer.cancel_label(hours(1)))
+        self.assertEqual(offer.ledger_line(now), "**Spot 10**: Mon 08AM — Mon 12PM")
+        self.assertEqual(
+            claim.cancel_label(now),
+            "Cancel: Staff Mon Apr 6 08:00 AM - Mon Apr 6 10:00 AM",
+        )
+        self.assertEqual(claim.ledger_line(now), "**Staff Spot**: Mon 08AM — Mon 10AM")
+
+    def test_recurring_labels_show_the_next_week_and_the_weeks_left(self):
+        offer = CachedOffer.from_row(
+            {**make_row("r", 10, 0, 4), "weeks": 4, "skipped_weeks": [2]}
+        )
+
+        self.assertEqual(
+            offer.cancel_label(hours(-1)),
+            "Withdraw all weeks: Spot 10 Mon Apr 6 08:00 AM - Mon Apr 6 12:00 PM"
+            " (weekly ×3)",
+        )
+        # A week and a day later the first two weeks are over and week 2 is skipped
+        later = hours(7 * 24 + 24)
+        self.assertEqual(offer.upcoming_weeks(later), [3])
+        self.assertEqual(
+            offer.cancel_label(later),
+            "Withdraw: Spot 10 Mon Apr 27 08:00 AM - Mon Apr 27 12:00 PM",
+        )
+        self.assertEqual(offer.ledger_line(later), "**Spot 10**: Mon 08AM — Mon 12PM")
+        self.assertEqual(offer.occurrence_choices(later), [])
+
+    def test_recurring_offers_list_each_upcoming_week_to_withdraw(self):
+        offer = CachedOffer.from_row(
+            {**make_row("r", 10, 0, 4), "weeks": 3, "skipped_weeks": [1]}
+        )
+
+        # The first week is under way, so it can still be withdrawn
+        self.assertEqual(
+            offer.occurrence_choices(hours(2)),
+            [
+                (
+                    0,
+                    "Withdraw one week: Spot 10 Mon Apr 6 08:00 AM - Mon Apr 6 12:00 PM",
+                ),
+                (
+                    2,
+                    "Withdraw one week: Spot 10 Mon Apr 20 08:00 AM - Mon Apr 20 12:00 PM",
+                ),
+            ],
+        )
+        self.assertEqual(
+            offer.ledger_line(hours(2)),
+            "**Spot 10**: Mon 08AM — Mon 12PM (weekly ×2)",
+        )
+
+    def test_watches_have_no_ledger_labels(self):
+        watch = CachedWatch.from_row(
+            {
+                "id": "watch-1",
+                "watcher_id": "1234",
+                "start_time": hours(0).isoformat(),
+                "end_time": hours(2).isoformat(),
+            }
+        )
+
+        self.assertFalse(hasattr(watch, "cancel_label"))
+        self.assertFalse(hasattr(watch, "ledger_line"))
@@ -0,0 +1,224 @@
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+from uuid import UUID
+
+from bot.services.repository import AsyncpgRepository
+
+OFFER_ID = UUID("0b0f1c4e-8a57-4c55-9d2c-0f1a7a2c9e11")
+START = datetime(2037, 4, 2, 14, tzinfo=timezone.utc)
+
+
+def make_pool(conn=None):
+    """Build an asyncpg pool double; ``acquire()`` yields ``conn``."""
+    pool = MagicMock()
+    pool.fetch = AsyncMock(return_value=[])
+    pool.fetchrow = AsyncMock(return_value=None)
+    pool.fetchval = AsyncMock(return_value=None)
+    pool.acquire.return_value.__aenter__ = AsyncMock(return_value=conn)
+    pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+    return pool
+
+
+class AsyncpgRepositoryTests(unittest.IsolatedAsyncioTestCase):
+    """The asyncpg backend must return the same shapes PostgREST does."""
+
+    async def test_select_active_returns_postgrest_shaped_rows(self):
+        pool = make_pool()
+        pool.fetch.return_value = [
+            {"id": OFFER_ID, "spot_number": 7, "start_time": START}
+        ]
+        repository = AsyncpgRepository(pool)
+
+        rows = await repository.select_active(
+            "parking_offers", "repeat_until", "2037-04-02T09:00:00-05:00"
+        )
+
+        self.assertEqual(
+            rows,
+            [
+                {
+                    "id": str(OFFER_ID),
+                    "spot_number": 7,
+                    "start_time": "2037-04-02T14:00:00+00:00",
+                }
+            ],
+        )
+        pool.fetch.assert_awaited_once_with(
+            'SELECT * FROM "parking_offers" '
+            'WHERE "repeat_until" > $1::text::timestamptz',
+            "2037-04-02T09:00:00-05:00",
+        )
+
+    async def test_call_casts_text_arguments_and_decodes_json(self):
+        pool = make_pool()
+        pool.fetchrow.return_value = {
+            "overloads": 1,
+            "names": ["p_offer_id", "p_owner_id"],
+            "types": ["uuid", "text"],
+            "returns_json": True,
+        }
+        pool.fetchval.return_value = '{"status": "withdrawn"}'
+        repository = AsyncpgRepository(pool)
+
+        for _ in range(2):
+            result = await repository.call(
+                "withdraw_parking_offer",
+                {"p_offer_id": OFFER_ID, "p_owner_id": 42},
+            )
+
+        self.assertEqual(result, {"status": "withdrawn"})
+        pool.fetchval.assert_awaited_with(
+            'SELECT "withdraw_parking_offer"('
+            '"p_offer_id" => $1::text::uuid, "p_owner_id" => $2::text::text)',
+            str(OFFER_ID),
+            "42",
+        )
+        # The function signature is looked up once, in the public schema, then cached
+        pool.fetchrow.assert_awaited_once()
+        self.assertIn(
+            "pronamespace = 'public'::regnamespace", pool.fetchrow.await_args.args[0]
+        )
+
+    async def test_call_rejects_overloaded_functions(self):
+        pool = make_pool()
+        pool.fetchrow.return_value = {
+            "overloads": 2,
+            "names": ["p_spot", "p_spot"],
+            "types": ["integer", "text"],
+            "returns_json": False,
+        }
+        repository = AsyncpgRepository(pool)
+
+        with self.assertRaises(ValueError):
+            await repository.call("claim_parking_spot", {"p_spot": 7})
+
+        pool.fetchval.assert_not_awaited()
+
+    async def test_select_one_returns_none_when_nothing_matches(self):
+        repository = AsyncpgRepository(make_pool())
+
+        self.assertIsNone(
+            await repository.select_one(
+                "residents", "discord_id", 123, "last_role_update"
+            )
+        )
+        repository.pool.fetchrow.assert_awaited_once_with(
+            'SELECT "last_role_update" FROM "residents" '
+            'WHERE "discord_id"::text = $1 LIMIT 1',
+            "123",
+        )
+
+    async def test_upsert_updates_every_non_key_column(self):
+        conn = MagicMock()
+        conn.fetchval = AsyncMock(return_value=["discord_id"])
+        conn.fetch = AsyncMock(return_value=[{"discord_id": "1", "username": "A"}])
+        repository = AsyncpgRepository(make_pool(conn))
+
+        stored = await repository.upsert(
+            "residents", {"discord_id": "1", "username": "A"}
+        )
+
+        self.assertEqual(stored, [{"discord_id": "1", "username": "A"}])
+        statement, payload = conn.fetch.await_args.args
+        self.assertIn('ON CONFLICT ("discord_id") DO UPDATE SET', statement)
+        self.assertIn('"username" = EXCLUDED."username"', statement)
+        self.assertNotIn('"discord_id" = EXCLUDED', statement)
+        self.assertEqual(payload, '{"discord_id": "1", "username": "A"}')
+
+    async def test_upsert_selects_the_inserted_columns_in_order(self):
+        conn = MagicMock()
+        conn.fetchval = AsyncMock(return_value=["discord_id"])
+        conn.fetch = AsyncMock(return_value=[])
+        repository = AsyncpgRepository(make_pool(conn))
+
+        await repository.upsert(
+            "residents", {"username": "A", "discord_id": "1", "status": "active"}
+        )
+
+        statement = conn.fetch.await_args.args[0]
+        columns = '"username", "discord_id", "status"'
+        self.assertIn(
+            f'INSERT INTO "residents" ({columns}) SELECT {columns} FROM', statement
+        )
+        self.assertNotIn("SELECT *", statement)
+
+    async def test_upsert_of_key_columns_only_still_returns_the_row(self):
+        conn = MagicMock()
+        conn.fetchval = AsyncMock(return_value=["discord_id"])
+        conn.fetch = AsyncMock(return_value=[{"discord_id": "1"}])
+        repository = AsyncpgRepository(make_pool(conn))
+
+        stored = await repository.upsert("residents", {"discord_id": "1"})
+
+        self.assertEqual(stored, [{"discord_id": "1"}])
+        statement = conn.fetch.await_args.args[0]
+        self.assertIn(
+            'ON CONFLICT ("discord_id") '
+            'DO UPDATE SET "discord_id" = EXCLUDED."discord_id" RETURNING *',
+            statement,
+        )
+
+    async def test_upsert_requires_a_primary_key(self):
+        conn = MagicMock()
+        conn.fetchval = AsyncMock(return_value=None)
+        conn.fetch = AsyncMock()
+        repository = AsyncpgRepository(make_pool(conn))
+
+        with self.assertRaises(ValueError):
+            await repository.upsert("meal_feedback", {"rating": 5})
+
+        conn.fetch.assert_not_awaited()
+
+    async def test_insert_can_skip_existing_keys(self):
+        pool = make_pool()
+        pool.fetch.return_value = [{"spot_number": 1000, "spot_type": "staff"}]
+        repository = AsyncpgRepository(pool)
+
+        stored = await repository.insert(
+            "parking_spots",
+            [{"spot_number": 1000, "spot_type": "staff"}],
+            ignore_duplicates=True,
+        )
+
+        self.assertEqual(stored, [{"spot_number": 1000, "spot_type": "staff"}])
+        pool.fetch.assert_awaited_once_with(
+            'INSERT INTO "parking_spots" ("spot_number", "spot_type") '
+            'SELECT "spot_number", "spot_type" '
+            'FROM json_populate_recordset(NULL::"parking_spots", $1::json) '
+            "ON CONFLICT DO NOTHING RETURNING *",
+            '[{"spot_number": 1000, "spot_type": "staff"}]',
+        )
+
+    async def test_delete_in_matches_values_as_text(self):
+        pool = make_pool()
+        repository = AsyncpgRepository(pool)
+
+        await repository.delete_in("parking_watches", "id", [OFFER_ID])
+
+        pool.fetch.assert_awaited_once_with(
+            'DELETE FROM "parking_watches" '
+            'WHERE "id"::text = ANY($1::text[]) RETURNING *',
+            [str(OFFER_ID)],
+        )
+
+    async def test_active_meal_calendar_nests_its_breaks(self):
+        conn = MagicMock()
+        conn.fetchrow = AsyncMock(return_value={"id": 1, "term_name": "Spring"})
+        conn.fetch = AsyncMock(
+            return_value=[{"name": "Spring Break", "start_date": START}]
+        )
+        repository = AsyncpgRepository(make_pool(conn))
+
+        calendar = await repository.active_meal_calendar()
+
+        self.assertEqual(
+            calendar,
+            {
+                "id": 1,
+                "term_name": "Spring",
+                "academic_breaks": [
+                    {"name": "Spring Break", "start_date": "2037-04-02T14:00:00+00:00"}
+                ],
+            },
+        )
@@ -0,0 +1,114 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, patch
+
+import httpx
+
+from bot.utils import resilience
+from bot.utils.resilience import CircuitBreaker, CircuitOpenError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_breaker(clock=None, **overrides):
+    options = dict(
+        failure_threshold=2,
+        reset_seconds=30,
+        call_timeout=1,
+        read_retries=2,
+        retry_base_seconds=0.25,
+        clock=clock or FakeClock(),
+    )
+    options.update(overrides)
+    return CircuitBreaker(**options)
+
+
+class CircuitBreakerTests(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for database call deadlines, retries and the circuit breaker."""
+
+    async def test_idempotent_reads_are_retried_with_jittered_backoff(self):
+        breaker = make_breaker(failure_threshold=5)
+        operation = AsyncMock(side_effect=[httpx.ConnectError("down"), ["row"]])
+
+        with patch.object(
+            resilience.asyncio, "sleep", AsyncMock()
+        ) as sleep, patch.object(
+            resilience.random, "uniform", return_value=0.1
+        ) as uniform:
+            result = await breaker.call(operation, idempotent=True)
+
+        self.assertEqual(result, ["row"])
+        self.assertEqual(operation.await_count, 2)
+        uniform.assert_called_once_with(0, 0.25)
+        sleep.assert_awaited_once_with(0.1)
+        self.assertFalse(breaker.is_open)
+
+    async def test_writes_are_not_retried(self):
+        breaker = make_breaker(failure_threshold=5)
+        operation = AsyncMock(side_effect=httpx.ConnectError("down"))
+
+        with self.assertRaises(httpx.ConnectError):
+            await breaker.call(operation)
+
+        operation.assert_awaited_once()
+
+    async def test_slow_calls_time_out(self):
+        breaker = make_breaker(call_timeout=0.01, failure_threshold=5)
+
+        async def hang():
+            await asyncio.sleep(1)
+
+        with self.assertRaises(asyncio.TimeoutError):
+            await breaker.call(hang)
+        self.assertEqual(breaker.failures, 1)
+
+    async def test_open_circuit_fails_fast_until_a_trial_call_succeeds(self):
+        clock = FakeClock()
+        breaker = make_breaker(clock=clock)
+        failing = AsyncMock(side_effect=OSError("connection refused"))
+
+        for _ in range(2):
+            with self.assertRaises(OSError):
+                await breaker.call(failing)
+        self.assertTrue(breaker.is_open)
+
+        healthy = AsyncMock(return_value="ok")
+        with self.assertRaises(CircuitOpenError):
+            await breaker.call(healthy, idempotent=True)
+        healthy.assert_not_awaited()
+
+        clock.now += 30
+        self.assertEqual(await breaker.call(healthy), "ok")
+        self.assertFalse(breaker.is_open)
+
+    async def test_failed_trial_reopens_the_circuit(self):
+        clock = FakeClock()
+        breaker = make_breaker(clock=clock)
+        failing = AsyncMock(side_effect=OSError("connection refused"))
+        for _ in range(2):
+            with self.assertRaises(OSError):
+                await breaker.call(failing)
+
+        clock.now += 30
+        with self.assertRaises(OSError):
+            await breaker.call(failing)
+
+        clock.now += 10
+        with self.assertRaises(CircuitOpenError):
+            await breaker.call(failing)
+
+    async def test_query_errors_do_not_trip_the_circuit(self):
+        breaker = make_breaker(failure_threshold=1)
+        rejected = AsyncMock(side_effect=ValueError("duplicate key"))
+
+        with self.assertRaises(ValueError):
+            await breaker.call(rejected, idempotent=True)
+
+        rejected.assert_awaited_once()
+        self.assertFalse(breaker.is_open)
@@ -0,0 +1,42 @@
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from bot.utils.snapshot import SnapshotStore
+
+
+class SnapshotStoreTests(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for the local cache snapshot file."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "snapshot.sqlite3"
+
+    def test_saved_documents_survive_a_new_store(self):
+        SnapshotStore(self.path).save("lates", [{"id": 1, "meal": "Lunch"}])
+
+        self.assertEqual(
+            SnapshotStore(self.path).load("lates"), [{"id": 1, "meal": "Lunch"}]
+        )
+        self.assertIsNone(SnapshotStore(self.path).load("parking"))
+
+    def test_unreadable_file_loads_nothing(self):
+        self.path.write_bytes(b"not a database")
+
+        self.assertIsNone(SnapshotStore(self.path).load("lates"))
+
+    async def test_queued_snapshots_are_coalesced_into_one_write(self):
+        store = SnapshotStore(self.path)
+        first, latest = MagicMock(return_value=["old"]), MagicMock(return_value=["new"])
+
+        with patch.object(store, "_write", wraps=store._write) as write:
+            store.save_later("lates", first)
+            store.save_later("lates", latest)
+            await asyncio.wait_for(store._writer, timeout=5)
+
+        first.assert_not_called()
+        write.assert_called_once_with("lates", '["new"]')
+        self.assertEqual(store.load("lates"), ["new"])